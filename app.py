@@ -5,20 +5,22 @@ import tempfile
 import time
 import re
 import json
+import mimetypes
 import threading
 import queue
+import copy
 from pathlib import Path
 from datetime import datetime
-from typing import Optional, Dict, List, Tuple, Any
-from concurrent.futures import ThreadPoolExecutor, as_completed
-import concurrent.futures
+from typing import Optional, Dict, List, Tuple, Any, Iterator
+from contextlib import nullcontext
+from concurrent.futures import ThreadPoolExecutor, as_completed, wait, FIRST_COMPLETED
 import validators
 from pytube import YouTube
-from groq import Groq
-from pydub import AudioSegment
+from groq import Groq, APIStatusError, RateLimitError
 import hashlib
-import pickle
 import random
+import shutil
+import subprocess
 import zipfile
 import pandas as pd
 import signal
@@ -27,6 +29,20 @@ import atexit
 import warnings
 import locale
 
+# Shared with the v2 backend, so imported from backend/services: the artifact
+# cache (same on-disk layout), media probing, format selection and the audio
+# postprocessor, the Groq rate limiter, the strategy scheduler and the
+# YoutubeDL pool
+sys.path.insert(0, str(Path(__file__).resolve().parent / 'backend'))
+from services.cache import ArtifactStore, video_key
+from services.downloader import GroqAudioPP
+from services.format_selector import select_audio_format
+from services.media_probe import probe_media
+from services.rate_limiter import AIMDConcurrency, RateLimiter
+from services.strategy_scheduler import StrategyScheduler
+from services.ydl_pool import YoutubeDLPool
+from utils.constants import GROQ_RPM_BURST
+
 # Set UTF-8 encoding for console output
 if sys.stdout.encoding != 'utf-8':
     import codecs
@@ -126,6 +142,38 @@ CHUNK_LENGTH_MS = 600000  # 10 minutes
 OVERLAP_MS = 10000  # 10 seconds
 CACHE_DIR = Path.home() / '.media_transcriber_cache'
 CACHE_DIR.mkdir(exist_ok=True)
+CACHE_MAX_BYTES = 5 * 1024 ** 3  # 5 GB of audio + transcripts
+GROQ_MODEL = "whisper-large-v3-turbo"
+GROQ_PROMPT = "Transcribe this audio accurately, including any technical terms."
+GROQ_RPM = 400  # Requests per minute for whisper-large-v3-turbo
+GROQ_ASH = 200000  # Audio seconds per hour
+GROQ_CONCURRENCY_START = 4  # In-flight Groq requests, adapted (AIMD) up to the max
+GROQ_CONCURRENCY_MAX = 16
+
+# Whisper resamples everything to 16 kHz mono, so downloads are converted
+# straight to that (format -> (extension, ffmpeg codec args))
+AUDIO_FORMATS = {
+    'opus': ('ogg', ['-c:a', 'libopus', '-b:a', '32k', '-application', 'voip']),
+    'flac': ('flac', ['-c:a', 'flac', '-sample_fmt', 's16']),  # lossless
+    'mp3': ('mp3', ['-c:a', 'libmp3lame', '-b:a', '48k']),
+}
+AUDIO_FORMAT = os.getenv('AUDIO_FORMAT', 'opus')
+
+# Batch pipeline concurrency: downloads are capped per platform and feed a
+# shared transcription pool as they finish
+PLATFORM_DOWNLOAD_LIMITS = {
+    'youtube': 3,
+    'instagram': 2,  # Instagram rate-limits aggressive parallel downloads
+    'tiktok': 3,
+    'other': 3,
+}
+DOWNLOAD_TIMEOUT_SECONDS = 900  # per download, from when it starts
+TRANSCRIBE_WORKERS = 4
+PROGRESS_MIN_INTERVAL = 0.25  # seconds between progress updates per download
+PROGRESS_MIN_DELTA = 0.01  # and only once progress moved by 1%
+STRATEGY_WINDOW = 20  # recent attempts per YouTube strategy used to order them
+YDL_POOL_MAX_IDLE = 4  # idle YoutubeDL instances kept per option profile
+VIDEO_INFO_TTL = 600  # seconds extracted metadata is reused for the download (URLs expire)
 
 # Initialize session state
 if 'downloads' not in st.session_state:
@@ -191,7 +239,7 @@ def cleanup_temp_files():
                 pass
                 
         # Clean up temporary audio files
-        for file in Path(temp_dir).glob("*_groq_optimized.flac"):
+        for file in Path(temp_dir).glob("*_groq_optimized.*"):
             try:
                 file.unlink()
                 print(f"  ✓ Removed {file.name}")
@@ -249,7 +297,69 @@ def update_progress(url_key: str, progress: float, status: str):
         'progress': progress,
         'status': status
     }
+
+class ProgressThrottle:
+    """Let through progress updates at most every PROGRESS_MIN_INTERVAL and PROGRESS_MIN_DELTA"""
+    def __init__(self):
+        self.last_progress = None
+        self.last_time = 0.0
+
+    def ready(self, progress: float) -> bool:
+        now = time.monotonic()
+        if self.last_progress is not None and progress < 1.0 and (
+                now - self.last_time < PROGRESS_MIN_INTERVAL
+                or abs(progress - self.last_progress) < PROGRESS_MIN_DELTA):
+            return False
+        self.last_progress = progress
+        self.last_time = now
+        return True
+
 # Caching decorators
+@st.cache_resource
+def get_ydl_pool() -> YoutubeDLPool:
+    """YoutubeDL pool shared across reruns and sessions"""
+    return YoutubeDLPool(max_idle=YDL_POOL_MAX_IDLE)
+
+@st.cache_resource
+def get_video_info_cache() -> Dict[str, Tuple[float, Dict]]:
+    """Raw yt-dlp info per video, shared across reruns and sessions"""
+    return {}
+
+def extract_video_info(url: str) -> Dict[str, Any]:
+    """Extract yt-dlp metadata without downloading (unprocessed), reusing a recent extraction"""
+    platform, video_id = detect_platform(url)
+    key = f"{platform}:{video_id}" if platform and video_id else url
+    cache = get_video_info_cache()
+    entry = cache.get(key)
+    if entry and time.time() - entry[0] < VIDEO_INFO_TTL:
+        return copy.deepcopy(entry[1])
+
+    with get_ydl_pool().lease({'quiet': True, 'no_warnings': True}) as ydl:
+        info = ydl.extract_info(url, download=False, process=False)
+    if info is None:
+        raise RuntimeError("No info returned")
+    # Drop expired entries and the bulky fields a download doesn't need
+    for old_key, (stored, _) in list(cache.items()):
+        if time.time() - stored >= VIDEO_INFO_TTL:
+            cache.pop(old_key, None)
+    cache[key] = (time.time(), {k: v for k, v in info.items()
+                                if k not in ('automatic_captions', 'subtitles', 'thumbnails', 'heatmap')})
+    return copy.deepcopy(cache[key][1])
+
+def pop_video_info(url: str) -> Optional[Dict[str, Any]]:
+    """Take the recently extracted info for a URL (used once, then re-extracted)"""
+    platform, video_id = detect_platform(url)
+    key = f"{platform}:{video_id}" if platform and video_id else url
+    entry = get_video_info_cache().pop(key, None)
+    if entry and time.time() - entry[0] < VIDEO_INFO_TTL:
+        return entry[1]
+    return None
+
+@st.cache_resource
+def get_strategy_stats() -> StrategyScheduler:
+    """Strategy stats shared across reruns and sessions"""
+    return StrategyScheduler(window=STRATEGY_WINDOW)
+
 @st.cache_data(ttl=3600)
 def get_video_info(url: str) -> Dict[str, Any]:
     """Fetch video metadata with caching"""
@@ -258,13 +368,14 @@ def get_video_info(url: str) -> Dict[str, Any]:
         'no_warnings': True,
         'extract_flat': False
     }
-    with yt_dlp.YoutubeDL(ydl_opts) as ydl:
+    with get_ydl_pool().lease(ydl_opts) as ydl:
         return ydl.extract_info(url, download=False)
 
 @st.cache_resource
 def get_groq_client(api_key: str) -> Groq:
     """Cache Groq client instance"""
-    return Groq(api_key=api_key)
+    # transcribe_with_retry handles retries, so every 429 reaches the limiter
+    return Groq(api_key=api_key, max_retries=0)
 
 def debug_instagram_download(url: str, cookies_path: Optional[str] = None):
     """Debug Instagram download issues"""
@@ -312,7 +423,7 @@ def debug_instagram_download(url: str, cookies_path: Optional[str] = None):
     }
     
     try:
-        with yt_dlp.YoutubeDL(ydl_opts) as ydl:
+        with get_ydl_pool().lease(ydl_opts) as ydl:
             info = ydl.extract_info(url, download=False)
             print("✓ Successfully extracted info")
             print(f"Title: {info.get('title', 'Unknown')}")
@@ -372,7 +483,7 @@ def resolve_tiktok_short_url(url: str, cookies_path: Optional[str] = None) -> Tu
         ydl_opts['cookiefile'] = "cookies.txt"
 
     try:
-        with yt_dlp.YoutubeDL(ydl_opts) as ydl:
+        with get_ydl_pool().lease(ydl_opts) as ydl:
             info = ydl.extract_info(url, download=False)
             if info:
                 is_playlist = info.get('_type') == 'playlist' or 'entries' in info
@@ -398,35 +509,39 @@ def validate_url(url: str) -> bool:
         return True
     return False
 
-def get_cache_key(url: str, operation: str) -> str:
-    """Generate cache key for URL and operation"""
-    return hashlib.md5(f"{url}:{operation}".encode()).hexdigest()
+# Content-addressed artifact cache (replaces the old one-pickle-per-key cache),
+# see backend/services/cache.py
+artifact_store = ArtifactStore(CACHE_DIR, CACHE_MAX_BYTES)
 
-def load_from_cache(cache_key: str) -> Optional[Any]:
-    """Load data from disk cache"""
-    cache_file = CACHE_DIR / f"{cache_key}.pkl"
-    if cache_file.exists():
-        try:
-            with open(cache_file, 'rb') as f:
-                return pickle.load(f)
-        except:
-            pass
-    return None
-
-def save_to_cache(cache_key: str, data: Any):
-    """Save data to disk cache"""
-    cache_file = CACHE_DIR / f"{cache_key}.pkl"
+# Drop entries from the old pickle cache; they pointed at deleted temp dirs
+for _stale_pickle in CACHE_DIR.glob('*.pkl'):
     try:
-        with open(cache_file, 'wb') as f:
-            pickle.dump(data, f)
-    except:
+        _stale_pickle.unlink()
+    except OSError:
         pass
 
+def preprocess_audio(input_path: str, audio_format: str = AUDIO_FORMAT) -> str:
+    """Re-encode a download to 16 kHz mono '<name>_groq_optimized.<ext>' with ffmpeg"""
+    ext, codec_args = AUDIO_FORMATS[audio_format]
+    output_path = f"{os.path.splitext(input_path)[0]}_groq_optimized.{ext}"
+    result = subprocess.run(
+        ['ffmpeg', '-v', 'error', '-y', '-i', input_path, '-map', '0:a:0',
+         '-ar', '16000', '-ac', '1', *codec_args, output_path],
+        capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        if os.path.exists(output_path):
+            os.unlink(output_path)
+        raise RuntimeError(f"ffmpeg preprocessing failed: {result.stderr[-200:]}")
+    return output_path
+
 class DownloadProgressHook:
     """Handle download progress updates with thread safety"""
     def __init__(self, url_key: str, progress_callback=None):
         self.url_key = url_key
         self.progress_callback = progress_callback
+        # yt-dlp calls the hook for every fragment
+        self.throttle = ProgressThrottle()
         
     def __call__(self, d):
         if d['status'] == 'downloading':
@@ -436,6 +551,8 @@ class DownloadProgressHook:
             # Ensure values are not None before comparison
             if total is not None and downloaded is not None and total > 0:
                 progress = downloaded / total
+                if not self.throttle.ready(progress):
+                    return
                 speed = d.get('speed', 0)
                 eta = d.get('eta', 0)
                 
@@ -465,18 +582,33 @@ def download_audio_enhanced(url: str, cookies_path: Optional[str] = None,
     if ctx and threading.current_thread() != threading.main_thread():
         add_script_run_ctx(threading.current_thread(), ctx)
     
-    # Check cache first
-    cache_key = get_cache_key(url, 'download')
-    cached_data = load_from_cache(cache_key)
-    if cached_data and Path(cached_data['path']).exists():
-        return cached_data['path'], cached_data['title'], cached_data['info']
+    platform, video_id = detect_platform(url)
+    video_key = f"{platform}:{video_id}" if platform and video_id else None
+    audio_format = st.session_state.get('audio_format', AUDIO_FORMAT)
     
     temp_dir = tempfile.mkdtemp()
     
+    # Check the artifact cache first (by video ID, then URL)
+    cached = artifact_store.get_audio(url=url, video=video_key)
+    if cached:
+        # Link (or copy) the blob out so callers can delete their copy freely
+        cached_path = os.path.join(temp_dir, os.path.basename(cached['path']))
+        try:
+            os.link(cached['path'], cached_path)
+        except OSError:
+            shutil.copyfile(cached['path'], cached_path)
+        print(f"💾 Using cached audio for {url}")
+        return cached_path, cached['title'], cached['info']
+    
+    def cache_download(path: str, title: str, info: Dict):
+        try:
+            artifact_store.put_audio(path, url=url, video=video_key, title=title, info=info)
+        except OSError as e:
+            print(f"Could not cache audio: {e}")
+    
     # Register cleanup handler for this temp directory
     def cleanup_download():
         try:
-            import shutil
             if os.path.exists(temp_dir):
                 shutil.rmtree(temp_dir)
         except:
@@ -485,10 +617,9 @@ def download_audio_enhanced(url: str, cookies_path: Optional[str] = None,
     if hasattr(st.session_state, 'cleanup_handlers'):
         st.session_state.cleanup_handlers.append(cleanup_download)
     
-    platform, video_id = detect_platform(url)
-    
-    # Get video info first
+    # Get video info first (one extraction, reused by the first strategy below)
     video_info = get_video_info_yt(url) if platform == 'youtube' else {}
+    prefetched_info = pop_video_info(url) if platform == 'youtube' else None
     video_title = video_info.get('title', f'video_{video_id}')
     safe_title = sanitize_filename(video_title)
     
@@ -502,7 +633,7 @@ def download_audio_enhanced(url: str, cookies_path: Optional[str] = None,
     
     # Base options for all platforms
     base_opts = {
-        'format': 'bestaudio/best',
+        'format': select_audio_format,
         'outtmpl': os.path.join(temp_dir, '%(title)s.%(ext)s'),
         'quiet': True,
         'no_warnings': True,
@@ -518,6 +649,8 @@ def download_audio_enhanced(url: str, cookies_path: Optional[str] = None,
     # Track download progress
     download_info = {'downloaded_bytes': 0, 'total_bytes': 0, 'speed': 0, 'eta': 0}
     
+    throttle = ProgressThrottle()
+
     def progress_hook(d):
         if d['status'] == 'downloading':
             download_info['downloaded_bytes'] = d.get('downloaded_bytes', 0)
@@ -527,6 +660,8 @@ def download_audio_enhanced(url: str, cookies_path: Optional[str] = None,
             
             if progress_callback and download_info['total_bytes'] > 0:
                 progress = download_info['downloaded_bytes'] / download_info['total_bytes']
+                if not throttle.ready(progress):
+                    return
                 progress_callback(progress)
                 update_progress(url, progress, f"Downloading: {progress*100:.1f}%")
                 
@@ -573,18 +708,12 @@ def download_audio_enhanced(url: str, cookies_path: Optional[str] = None,
             'extractor_args': {'youtube': {'player_client': ['android']}},
             'user_agent': 'Mozilla/5.0 (Linux; Android 11; SM-G973F) AppleWebKit/537.36',
             'progress_hooks': [progress_hook],
-            'postprocessors': [{
-                'key': 'FFmpegExtractAudio',
-                'preferredcodec': 'mp3',
-                'preferredquality': '192',
-            }],
         })
         youtube_strategies.append(("Android Client", strategy1))
         
         # Strategy 2: iOS client with anti-bot headers
         strategy2 = {**base_opts}
         strategy2.update({
-            'format': 'bestaudio[ext=m4a]/bestaudio/best',
             'extractor_args': {
                 'youtube': {
                     'player_client': ['ios', 'android_creator'],
@@ -603,11 +732,6 @@ def download_audio_enhanced(url: str, cookies_path: Optional[str] = None,
                 'X-YouTube-Client-Version': '19.29.1',
             },
             'progress_hooks': [progress_hook],
-            'postprocessors': [{
-                'key': 'FFmpegExtractAudio',
-                'preferredcodec': 'mp3',
-                'preferredquality': '192',
-            }],
         })
         if cookie_file:
             strategy2['cookiefile'] = cookie_file
@@ -624,11 +748,6 @@ def download_audio_enhanced(url: str, cookies_path: Optional[str] = None,
             },
             'user_agent': 'Mozilla/5.0 (ChromiumStylePlatform) Cobalt/40.13031-qa (unlike Gecko) v8/8.8.278.8-jit gles Starboard/12',
             'progress_hooks': [progress_hook],
-            'postprocessors': [{
-                'key': 'FFmpegExtractAudio',
-                'preferredcodec': 'mp3',
-                'preferredquality': '192',
-            }],
         })
         if cookie_file:
             strategy3['cookiefile'] = cookie_file
@@ -641,11 +760,6 @@ def download_audio_enhanced(url: str, cookies_path: Optional[str] = None,
                 'cookiefile': cookie_file,
                 'user_agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/131.0.0.0 Safari/537.36',
                 'progress_hooks': [progress_hook],
-                'postprocessors': [{
-                    'key': 'FFmpegExtractAudio',
-                    'preferredcodec': 'mp3',
-                    'preferredquality': '192',
-                }],
             })
             youtube_strategies.append(("Cookie Authentication", strategy4))
         
@@ -659,11 +773,6 @@ def download_audio_enhanced(url: str, cookies_path: Optional[str] = None,
                 }
             },
             'progress_hooks': [progress_hook],
-            'postprocessors': [{
-                'key': 'FFmpegExtractAudio',
-                'preferredcodec': 'mp3',
-                'preferredquality': '192',
-            }],
         })
         if cookie_file:
             strategy5['cookiefile'] = cookie_file
@@ -673,16 +782,10 @@ def download_audio_enhanced(url: str, cookies_path: Optional[str] = None,
         if is_live or live_status == 'was_live':
             strategy6 = {**base_opts}
             strategy6.update({
-                'format': 'bestaudio[ext=m4a]/bestaudio/best',
-                'live_from_start': True,
+                    'live_from_start': True,
                 'hls_use_mpegts': True,
                 'wait_for_video': 5,
                 'progress_hooks': [progress_hook],
-                'postprocessors': [{
-                    'key': 'FFmpegExtractAudio',
-                    'preferredcodec': 'mp3',
-                    'preferredquality': '192',
-                }],
             })
             if is_live:
                 strategy6['fixup'] = 'never'
@@ -692,21 +795,28 @@ def download_audio_enhanced(url: str, cookies_path: Optional[str] = None,
     else:
         standard_strategy = {**base_opts}
         standard_strategy['progress_hooks'] = [progress_hook]
-        standard_strategy['postprocessors'] = [{
-            'key': 'FFmpegExtractAudio',
-            'preferredcodec': 'mp3',
-            'preferredquality': '192',
-        }]
         youtube_strategies = [("Standard", standard_strategy)]
     
-    # Try all strategies
+    # Try all strategies, the ones that worked recently first
+    strategy_stats = get_strategy_stats()
+    if platform == 'youtube':
+        youtube_strategies = strategy_stats.order(youtube_strategies)
     last_error = None
     for strategy_name, opts in youtube_strategies:
+        started = time.time()
+        succeeded = False
         try:
             print(f"🔄 Trying {strategy_name} strategy for {url}")
             
-            with yt_dlp.YoutubeDL(opts) as ydl:
-                info = ydl.extract_info(url, download=True)
+            with get_ydl_pool().lease(opts) as ydl:
+                # Extract + resample to 16 kHz mono in one ffmpeg pass
+                ydl.add_post_processor(GroqAudioPP(ydl, audio_format))
+                if prefetched_info:
+                    # Download from the info get_video_info_yt extracted
+                    info = ydl.process_ie_result(prefetched_info, download=True)
+                    prefetched_info = None
+                else:
+                    info = ydl.extract_info(url, download=True)
                 
                 if info is None:
                     print(f"Strategy {strategy_name}: No info returned")
@@ -717,29 +827,27 @@ def download_audio_enhanced(url: str, cookies_path: Optional[str] = None,
                 
                 # Find the audio file
                 for file in os.listdir(temp_dir):
-                    if file.endswith('.mp3'):
+                    if '_groq_optimized' in file:
                         file_path = os.path.join(temp_dir, file)
-                        cache_data = {'path': file_path, 'title': title, 'info': info}
-                        save_to_cache(cache_key, cache_data)
+                        cache_download(file_path, title, info)
                         print(f"✅ Downloaded with {strategy_name} strategy!")
                         file_size_mb = os.path.getsize(file_path) / (1024 * 1024)
                         print(f"📊 File size: {file_size_mb:.1f}MB")
+                        succeeded = True
                         return file_path, title, info
                 
-                # If no MP3, convert the downloaded file
+                # If the postprocessor didn't run, convert the downloaded file
                 for file in os.listdir(temp_dir):
-                    if file.endswith(('.mp4', '.webm', '.m4a', '.opus')):
-                        print(f"Converting {file} to MP3")
+                    if file.endswith(('.mp3', '.mp4', '.webm', '.m4a', '.opus')):
+                        print(f"Converting {file} to {audio_format}")
                         input_path = os.path.join(temp_dir, file)
-                        output_path = os.path.join(temp_dir, f"{Path(file).stem}.mp3")
                         
                         try:
-                            audio = AudioSegment.from_file(input_path)
-                            audio.export(output_path, format='mp3', bitrate='192k')
+                            output_path = preprocess_audio(input_path, audio_format)
                             
-                            cache_data = {'path': output_path, 'title': title, 'info': info}
-                            save_to_cache(cache_key, cache_data)
+                            cache_download(output_path, title, info)
                             print(f"✅ Downloaded and converted with {strategy_name} strategy!")
+                            succeeded = True
                             return output_path, title, info
                         except Exception as conv_error:
                             print(f"Conversion error: {conv_error}")
@@ -757,6 +865,9 @@ def download_audio_enhanced(url: str, cookies_path: Optional[str] = None,
                 time.sleep(2)
             
             continue
+        finally:
+            if platform == 'youtube':
+                strategy_stats.record(strategy_name, succeeded, time.time() - started)
     
     # If YouTube strategies failed and we have pytube, try it
     if platform == 'youtube':
@@ -768,18 +879,15 @@ def download_audio_enhanced(url: str, cookies_path: Optional[str] = None,
             audio_stream = yt.streams.filter(only_audio=True, file_extension='mp4').first()
             
             if audio_stream:
-                temp_path = audio_stream.download(output_path=temp_dir, filename=f"{safe_title}_temp.mp4")
+                temp_path = audio_stream.download(output_path=temp_dir, filename=f"{safe_title}.mp4")
                 
-                # Convert to MP3
-                audio = AudioSegment.from_file(temp_path, format="mp4")
-                output_path = os.path.join(temp_dir, f"{safe_title}.mp3")
-                audio.export(output_path, format="mp3", bitrate="192k")
+                # Convert to 16 kHz mono in the selected format
+                output_path = preprocess_audio(temp_path, audio_format)
                 
                 # Cleanup temp file
                 os.remove(temp_path)
                 
-                cache_data = {'path': output_path, 'title': video_title, 'info': video_info}
-                save_to_cache(cache_key, cache_data)
+                cache_download(output_path, video_title, video_info)
                 print("✅ Downloaded with pytube!")
                 return output_path, video_title, video_info
                 
@@ -851,7 +959,7 @@ def expand_tiktok_collection(
         if progress_callback:
             progress_callback(0.2, "Extracting video list from TikTok...")
 
-        with yt_dlp.YoutubeDL(ydl_opts) as ydl:
+        with get_ydl_pool().lease(ydl_opts) as ydl:
             info = ydl.extract_info(url, download=False)
 
             if not info:
@@ -924,28 +1032,21 @@ def expand_tiktok_collection(
 
 def get_video_info_yt(url: str) -> Dict[str, Any]:
     """Get YouTube video info including live status"""
-    ydl_opts = {
-        'quiet': True,
-        'no_warnings': True,
-        'extract_flat': False,
-    }
-    
     try:
-        with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-            info = ydl.extract_info(url, download=False)
-            
-            return {
-                'title': info.get('title', 'Unknown'),
-                'duration': info.get('duration', 0),
-                'is_live': info.get('is_live', False),
-                'live_status': info.get('live_status', 'none'),
-                'was_live': info.get('live_status') == 'was_live',
-                'description': info.get('description', ''),
-                'uploader': info.get('uploader', ''),
-                'view_count': info.get('view_count', 0),
-                'like_count': info.get('like_count', 0),
-                'upload_date': info.get('upload_date', ''),
-            }
+        # Raw info, kept so download_audio_enhanced can download from it
+        info = extract_video_info(url)
+        return {
+            'title': info.get('title', 'Unknown'),
+            'duration': info.get('duration', 0),
+            'is_live': info.get('is_live', False),
+            'live_status': info.get('live_status', 'none'),
+            'was_live': info.get('live_status') == 'was_live',
+            'description': info.get('description', ''),
+            'uploader': info.get('uploader', ''),
+            'view_count': info.get('view_count', 0),
+            'like_count': info.get('like_count', 0),
+            'upload_date': info.get('upload_date', ''),
+        }
     except Exception as e:
         print(f"Error getting video info: {e}")
         return {
@@ -1051,175 +1152,169 @@ def show_chunk_progress(progress_ui, current_chunk, total_chunks, chunk_info=Non
         
         return chunk_progress
 
-def chunk_audio(audio_path: str, max_chunk_size_mb: int = 24) -> List[Dict[str, Any]]:
-    """Split audio into chunks that fit within Groq's size limits"""
+def cut_audio_chunk(audio_path: str, chunk_path: str, start_ms: int, end_ms: int,
+                    bitrate: str) -> str:
+    """Cut [start_ms, end_ms) out of audio_path with ffmpeg, stream-copying when possible"""
+    window = ['-ss', f'{start_ms / 1000:.3f}', '-t', f'{(end_ms - start_ms) / 1000:.3f}']
+    # Stream copy keeps the source codec (no decode); re-encode to MP3 only as a fallback.
+    # Seeking before -i jumps straight to the window but can fail on broken
+    # timestamps, so the last resort seeks after -i (decodes up to the window)
+    mp3_path = os.path.splitext(chunk_path)[0] + '.mp3'
+    encode = ['-map', '0:a:0', '-c:a', 'libmp3lame', '-b:a', bitrate]
+    attempts = [
+        (chunk_path, window + ['-i', audio_path, '-map', '0:a:0', '-c:a', 'copy']),
+        (mp3_path, window + ['-i', audio_path] + encode),
+        (mp3_path, ['-i', audio_path] + window + encode),
+    ]
+    
+    error = ''
+    for path, args in attempts:
+        result = subprocess.run(['ffmpeg', '-v', 'error', '-y'] + args + [path], capture_output=True, text=True)
+        if result.returncode == 0 and os.path.getsize(path) > 0:
+            if path != chunk_path:
+                os.unlink(chunk_path)
+            return path
+        error = result.stderr.strip()[-200:]
+    
+    for path in {chunk_path, mp3_path}:
+        if os.path.exists(path):
+            os.unlink(path)
+    raise RuntimeError(f"ffmpeg could not cut {start_ms}-{end_ms}ms: {error}")
+
+def chunk_audio(audio_path: str, max_chunk_size_mb: int = 24) -> Iterator[Dict[str, Any]]:
+    """Split audio into chunks that fit within Groq's size limits.
+    
+    Each chunk is cut straight from the source by its own ffmpeg call (seek +
+    stream copy), so memory stays flat however long the input is, and chunks
+    are yielded as they are written so transcription can start on the first one
+    while the rest are still being cut.
+    """
+    file_size_mb = os.path.getsize(audio_path) / (1024 * 1024)
     try:
-        print(f"Loading audio file for chunking: {audio_path}")
-        audio = AudioSegment.from_mp3(audio_path)
-        
-        total_length_ms = len(audio)
-        total_length_min = total_length_ms / 1000 / 60
-        print(f"Audio length: {total_length_min:.1f} minutes")
-        
-        # Calculate chunk duration based on file size
-        file_size_mb = os.path.getsize(audio_path) / (1024 * 1024)
-        
-        # Use 50% of max size for safety margin with 192kbps files
-        # This accounts for potential overhead and ensures we stay well under limits
-        target_chunk_size_mb = max_chunk_size_mb * 0.5
-        
-        # Estimate chunk duration to stay under size limit
-        # Rough estimate: if full file is X MB for Y minutes, then chunk should be...
-        minutes_per_chunk = (target_chunk_size_mb / file_size_mb) * total_length_min
-        
-        # Convert to milliseconds
-        chunk_duration_ms = int(minutes_per_chunk * 60 * 1000)
-        
-        # For dev tier, we can use larger chunks but need to be conservative
-        if max_chunk_size_mb > 50:  # Dev tier
-            # For dev tier, aim for chunks that are safely under 25MB
-            # With 192k bitrate: ~1.44MB per minute
-            mb_per_minute = 1.44  # 192kbps
-            # Target 20MB chunks to be safe (well under 25MB limit)
-            safe_chunk_size_mb = 20.0
-            optimal_minutes = safe_chunk_size_mb / mb_per_minute
-            chunk_duration_ms = min(int(optimal_minutes * 60 * 1000), 900000)  # 15 min max
-            print(f"Using dev tier settings: target chunk size {safe_chunk_size_mb:.1f}MB, ~{optimal_minutes:.1f} minutes per chunk")
-        else:
-            chunk_duration_ms = min(chunk_duration_ms, 600000)  # 10 min max for free tier
-        
-        # Ensure minimum chunk duration of 30 seconds
-        chunk_duration_ms = max(chunk_duration_ms, 30000)
-        
-        # Reduced overlap from 5000ms to 500ms for better performance
-        overlap_ms = 500  # 0.5 seconds overlap
-        
-        print(f"File size: {file_size_mb:.1f}MB, chunking into ~{minutes_per_chunk:.1f} minute segments (target: {target_chunk_size_mb:.1f}MB per chunk)")
-        
-        chunks = []
-        start_ms = 0
-        chunk_index = 0
-        max_iterations = 1000  # Safety limit to prevent infinite loops
-        
-        while start_ms < total_length_ms and chunk_index < max_iterations:
-            end_ms = min(start_ms + chunk_duration_ms, total_length_ms)
-            
-            # Extract chunk
-            chunk = audio[start_ms:end_ms]
-            
-            # Create temporary file for chunk
-            chunk_file = tempfile.NamedTemporaryFile(
-                suffix='.mp3', 
-                delete=False,
-                prefix=f'chunk_{chunk_index}_'
-            )
-            
-            # Export chunk - use higher bitrate for dev tier
-            if max_chunk_size_mb > 50:  # Dev tier
-                # Use 192k bitrate for better quality and larger chunks
-                chunk.export(
-                    chunk_file.name, 
-                    format='mp3',
-                    parameters=["-b:a", "192k"]
-                )
-            else:
-                # Use lower bitrate for free tier to keep chunks small
-                chunk.export(
-                    chunk_file.name, 
-                    format='mp3',
-                    parameters=["-b:a", "64k"]
-                )
-            
-            chunk_size_mb = os.path.getsize(chunk_file.name) / (1024 * 1024)
-            print(f"Chunk {chunk_index}: {start_ms/1000:.1f}s - {end_ms/1000:.1f}s ({chunk_size_mb:.1f}MB) - Duration: {(end_ms-start_ms)/1000:.1f}s")
-            
-            # Register chunk file for cleanup
-            register_temp_file(chunk_file.name)
-            
-            chunks.append({
-                'path': chunk_file.name,
-                'start_ms': start_ms,
-                'end_ms': end_ms,
-                'index': chunk_index,
-                'duration_ms': end_ms - start_ms,
-                'size_mb': chunk_size_mb
-            })
-            
-            # Check if we've reached the end of the audio
-            if end_ms >= total_length_ms:
-                print(f"Reached end of audio at {end_ms}ms (total: {total_length_ms}ms)")
-                break
-                
-            # Move to next chunk (with overlap for all chunks except the last)
-            # Skip overlap if the next chunk would be the final chunk
-            if end_ms + chunk_duration_ms >= total_length_ms:
-                start_ms = end_ms  # No overlap for the final chunk
-            else:
-                start_ms = end_ms - overlap_ms
-                
-            chunk_index += 1
-            
-            # Safety check - if chunk is still too large, we need smaller chunks
-            if chunk_size_mb > max_chunk_size_mb:
-                print(f"WARNING: Chunk {chunk_index} is {chunk_size_mb:.1f}MB, still too large!")
-                # Could implement recursive splitting here if needed
-        
-        if chunk_index >= max_iterations:
-            print(f"WARNING: Reached maximum iterations ({max_iterations}), possible infinite loop detected!")
-        
-        print(f"Created {len(chunks)} chunks")
-        return chunks
-        
+        total_length_ms = int(probe_media(audio_path).duration * 1000)
     except Exception as e:
         print(f"Error in chunk_audio: {type(e).__name__}: {str(e)}")
-        import traceback
-        traceback.print_exc()
-        
         # Return the original file as a single chunk on error
-        return [{
+        yield {
             'path': audio_path,
             'start_ms': 0,
             'end_ms': 0,
             'index': 0,
-            'size_mb': os.path.getsize(audio_path) / (1024 * 1024)
-        }]
-
-class RateLimiter:
-    """Rate limiter for API requests"""
-    def __init__(self, rpm: int):
-        self.rpm = rpm
-        self.lock = threading.Lock()
-        self.requests = []
-        self.min_interval = 60.0 / rpm  # Minimum seconds between requests
-        
-    def wait_if_needed(self):
-        """Wait if necessary to maintain rate limit"""
-        with self.lock:
-            now = time.time()
-            # Remove requests older than 1 minute
-            self.requests = [t for t in self.requests if now - t < 60]
-            
-            if len(self.requests) >= self.rpm:
-                # Calculate wait time to next available slot
-                oldest_request = self.requests[0]
-                wait_time = 60.0 - (now - oldest_request) + 0.1  # Small buffer
-                if wait_time > 0:
-                    print(f"Rate limit wait: {wait_time:.2f}s")
-                    time.sleep(wait_time)
-                    return self.wait_if_needed()
-            
-            # Also enforce minimum interval between requests
-            if self.requests:
-                time_since_last = now - self.requests[-1]
-                if time_since_last < self.min_interval:
-                    wait_time = self.min_interval - time_since_last
-                    time.sleep(wait_time)
-                    
-            self.requests.append(time.time())
+            'count': 1,
+            'size_mb': file_size_mb
+        }
+        return
+    
+    total_length_min = total_length_ms / 1000 / 60
+    print(f"Audio length: {total_length_min:.1f} minutes")
+    
+    # Use 50% of max size for safety margin with 192kbps files
+    # This accounts for potential overhead and ensures we stay well under limits
+    target_chunk_size_mb = max_chunk_size_mb * 0.5
+    
+    # Estimate chunk duration to stay under size limit
+    # Rough estimate: if full file is X MB for Y minutes, then chunk should be...
+    minutes_per_chunk = (target_chunk_size_mb / file_size_mb) * total_length_min
+    
+    # Convert to milliseconds
+    chunk_duration_ms = int(minutes_per_chunk * 60 * 1000)
+    
+    # For dev tier, we can use larger chunks but need to be conservative
+    if max_chunk_size_mb > 50:  # Dev tier
+        # For dev tier, aim for chunks that are safely under 25MB
+        # With 192k bitrate: ~1.44MB per minute
+        mb_per_minute = 1.44  # 192kbps
+        # Target 20MB chunks to be safe (well under 25MB limit)
+        safe_chunk_size_mb = 20.0
+        optimal_minutes = safe_chunk_size_mb / mb_per_minute
+        chunk_duration_ms = min(int(optimal_minutes * 60 * 1000), 900000)  # 15 min max
+        print(f"Using dev tier settings: target chunk size {safe_chunk_size_mb:.1f}MB, ~{optimal_minutes:.1f} minutes per chunk")
+    else:
+        chunk_duration_ms = min(chunk_duration_ms, 600000)  # 10 min max for free tier
+    
+    # Ensure minimum chunk duration of 30 seconds
+    chunk_duration_ms = max(chunk_duration_ms, 30000)
+    
+    # Reduced overlap from 5000ms to 500ms for better performance
+    overlap_ms = 500  # 0.5 seconds overlap
+    
+    # Plan every window up front so each chunk can report the total count
+    windows = []
+    start_ms = 0
+    max_iterations = 1000  # Safety limit to prevent infinite loops
+    while start_ms < total_length_ms and len(windows) < max_iterations:
+        end_ms = min(start_ms + chunk_duration_ms, total_length_ms)
+        windows.append((start_ms, end_ms))
+        
+        # Check if we've reached the end of the audio
+        if end_ms >= total_length_ms:
+            break
+        
+        # Move to next chunk (with overlap for all chunks except the last)
+        # Skip overlap if the next chunk would be the final chunk
+        if end_ms + chunk_duration_ms >= total_length_ms:
+            start_ms = end_ms  # No overlap for the final chunk
+        else:
+            start_ms = end_ms - overlap_ms
+    
+    if len(windows) >= max_iterations:
+        print(f"WARNING: Reached maximum iterations ({max_iterations}), possible infinite loop detected!")
+    
+    print(f"File size: {file_size_mb:.1f}MB, chunking into {len(windows)} ~{minutes_per_chunk:.1f} minute segments (target: {target_chunk_size_mb:.1f}MB per chunk)")
+    
+    # Re-encode bitrate if the source can't be stream-copied
+    bitrate = '192k' if max_chunk_size_mb > 50 else '64k'
+    ext = os.path.splitext(audio_path)[1] or '.mp3'
+    
+    for chunk_index, (start_ms, end_ms) in enumerate(windows):
+        # Create temporary file for chunk
+        chunk_file = tempfile.NamedTemporaryFile(
+            suffix=ext,
+            delete=False,
+            prefix=f'chunk_{chunk_index}_'
+        )
+        chunk_file.close()
+        try:
+            chunk_path = cut_audio_chunk(audio_path, chunk_file.name, start_ms, end_ms, bitrate)
+        except (RuntimeError, OSError) as e:
+            # Fail the file rather than transcribe it with a window missing
+            # (or send the whole oversized file, if this is the first chunk)
+            print(f"Error cutting chunk {chunk_index}: {e}")
+            raise RuntimeError(f"Could not cut chunk {chunk_index + 1}/{len(windows)}: {e}") from e
+        
+        chunk_size_mb = os.path.getsize(chunk_path) / (1024 * 1024)
+        print(f"Chunk {chunk_index}: {start_ms/1000:.1f}s - {end_ms/1000:.1f}s ({chunk_size_mb:.1f}MB) - Duration: {(end_ms-start_ms)/1000:.1f}s")
+        
+        # Safety check - if chunk is still too large, we need smaller chunks
+        if chunk_size_mb > max_chunk_size_mb:
+            print(f"WARNING: Chunk {chunk_index} is {chunk_size_mb:.1f}MB, still too large!")
+        
+        # Register chunk file for cleanup
+        register_temp_file(chunk_path)
+        
+        yield {
+            'path': chunk_path,
+            'start_ms': start_ms,
+            'end_ms': end_ms,
+            'index': chunk_index,
+            'count': len(windows),
+            'duration_ms': end_ms - start_ms,
+            'size_mb': chunk_size_mb
+        }
+    
+    print(f"Created {len(windows)} chunks")
+
+# One limiter for the whole process, so concurrent batches share the quota.
+# Same limiter as the backend: a small request burst and at most a minute's
+# worth of the audio quota at once
+groq_rate_limiter = RateLimiter(rpm=GROQ_RPM, ash=GROQ_ASH, burst=GROQ_RPM_BURST)
+groq_concurrency = AIMDConcurrency(GROQ_CONCURRENCY_START, GROQ_CONCURRENCY_MAX)
 
 def transcribe_with_retry(client: Groq, audio_path: str, language: str = 'en', 
-                         max_retries: int = 5, rate_limiter: Optional['RateLimiter'] = None) -> Optional[str]:
-    """Transcribe with exponential backoff retry"""
+                         max_retries: int = 5, rate_limiter: Optional['RateLimiter'] = None,
+                         audio_seconds: Optional[float] = None,
+                         concurrency: Optional['AIMDConcurrency'] = None) -> Optional[str]:
+    """Transcribe with retries driven by Groq's rate-limit headers and retry-after"""
     
     # First check file size
     file_size_mb = os.path.getsize(audio_path) / (1024 * 1024)
@@ -1229,93 +1324,109 @@ def transcribe_with_retry(client: Groq, audio_path: str, language: str = 'en',
     if file_size_mb > max_allowed:
         raise Exception(f"File is {file_size_mb:.1f}MB, exceeds Groq's {'dev tier' if is_dev_tier else 'free tier'} maximum of {max_allowed}MB")
     
+    # Audio length counts against the audio-seconds-per-hour quota
+    if rate_limiter and audio_seconds is None:
+        try:
+            audio_seconds = probe_media(audio_path).duration
+        except Exception:
+            audio_seconds = 0.0
+    
     base_delay = 5
     max_delay = 120  # Cap at 2 minutes
     
     for attempt in range(max_retries):
-        # Apply rate limiting if provided
-        if rate_limiter:
-            rate_limiter.wait_if_needed()
-            
+        is_last_attempt = attempt >= max_retries - 1
+        backoff = min(base_delay * (2 ** attempt) + random.uniform(0, 5), max_delay)
+        epoch = 0
+        
         try:
-            with open(audio_path, 'rb') as audio_file:
-                # Validate against tier limits
-                if file_size_mb > max_allowed:
-                    error_msg = f"File size {file_size_mb:.1f}MB exceeds {'dev tier' if is_dev_tier else 'free tier'} limit of {max_allowed}MB"
-                    print(f"❌ {error_msg}")
-                    raise Exception(error_msg)
-                
-                print(f"Sending {file_size_mb:.1f}MB file to Groq API (attempt {attempt + 1}/{max_retries})...")
+            with concurrency.slot() if concurrency else nullcontext(0) as epoch:
+                # Apply rate limiting if provided
+                if rate_limiter:
+                    rate_limiter.acquire(audio_seconds)
                 
-                response = client.audio.transcriptions.create(
-                    file=audio_file,
-                    model="whisper-large-v3-turbo",
-                    response_format="text",
-                    language=language,
-                    temperature=0.0,
-                    prompt="Transcribe this audio accurately, including any technical terms."
-                )
-                return response.strip()
-                
-        except Exception as e:
-            error_str = str(e)
+                with open(audio_path, 'rb') as audio_file:
+                    print(f"Sending {file_size_mb:.1f}MB file to Groq API (attempt {attempt + 1}/{max_retries})...")
+                    
+                    response = client.audio.transcriptions.with_raw_response.create(
+                        file=audio_file,
+                        model=GROQ_MODEL,
+                        response_format="text",
+                        language=language,
+                        temperature=0.0,
+                        prompt=GROQ_PROMPT
+                    )
             
-            if '413' in error_str or 'too large' in error_str.lower():
+            if rate_limiter:
+                rate_limiter.observe(response.headers)
+            if concurrency:
+                concurrency.on_success()
+            return response.parse().strip()
+        
+        except RateLimitError as e:
+            if concurrency:
+                concurrency.on_throttle(epoch)
+            # The limiter pauses every caller until retry-after, so the next
+            # acquire() does the waiting
+            retry_after = rate_limiter.on_throttle(e.response.headers) if rate_limiter else None
+            if is_last_attempt:
+                raise
+            if retry_after is None:
+                print(f"Rate limited, waiting {backoff:.1f}s...")
+                time.sleep(backoff)
+            else:
+                print(f"Rate limited, retrying after {retry_after:.1f}s")
+        
+        except APIStatusError as e:
+            if e.status_code == 413:
                 # File too large, don't retry
                 tier_msg = "dev tier (100MB)" if is_dev_tier else "free tier (25MB)"
                 raise Exception(f"File too large for Groq API {tier_msg}: {file_size_mb:.1f}MB")
-            elif '503' in error_str or 'Service Unavailable' in error_str:
-                # 503 Service Unavailable - exponential backoff with jitter
-                wait_time = min(base_delay * (2 ** attempt) + random.uniform(0, 5), max_delay)
-                
-                if attempt < max_retries - 1:
-                    print(f"Service unavailable (503), waiting {wait_time:.1f}s before retry...")
-                    time.sleep(wait_time)
-                    
-                    # After multiple 503s, add cooldown
-                    if attempt >= 2:
-                        print("Adding cooldown period after multiple 503s...")
-                        time.sleep(30)
-                    continue
-                else:
-                    print(f"Failed after {max_retries} retries: {error_str}")
-            elif '429' in error_str or 'rate' in error_str.lower():
-                # Rate limit - exponential backoff
-                wait_time = min(base_delay * (2 ** attempt) + random.uniform(0, 1), max_delay)
-                if attempt < max_retries - 1:
-                    print(f"Rate limited, waiting {wait_time:.1f}s...")
-                    time.sleep(wait_time)
-                    continue
-            
-            # For other errors, retry with shorter wait
-            if attempt < max_retries - 1:
-                print(f"Attempt {attempt + 1} failed: {error_str[:100]}...")
-                time.sleep(base_delay)
-                continue
+            if is_last_attempt:
+                print(f"Failed after {max_retries} retries: {e}")
+                raise
+            if e.status_code >= 500:
+                # Overloaded - back off and shrink concurrency
+                if concurrency:
+                    concurrency.on_throttle(epoch)
+                print(f"Groq returned {e.status_code}, waiting {backoff:.1f}s before retry...")
+                time.sleep(backoff)
             else:
-                raise e
+                print(f"Attempt {attempt + 1} failed: {str(e)[:100]}...")
+                time.sleep(base_delay)
+        
+        except Exception as e:
+            # For other errors, retry with shorter wait
+            if is_last_attempt:
+                raise
+            print(f"Attempt {attempt + 1} failed: {str(e)[:100]}...")
+            time.sleep(base_delay)
     
     return None
 
 def transcribe_audio(audio_path: str, groq_client: Groq, 
-                    progress_callback=None, language: str = 'en') -> Optional[str]:
+                    progress_callback=None, language: str = 'en',
+                    url: Optional[str] = None, audio_hash: Optional[str] = None) -> Optional[str]:
     """Transcribe audio with chunking and parallel processing support for large files"""
     
-    # Check cache
-    cache_key = get_cache_key(audio_path, 'transcription')
-    cached_transcription = load_from_cache(cache_key)
-    if cached_transcription:
-        return cached_transcription
+    # Check cache by platform video ID / URL, then by audio content
+    # (callers passing audio_hash have already checked it)
+    if audio_hash is None:
+        platform, video_id = detect_platform(url) if url else (None, None)
+        cached_transcription, audio_hash = artifact_store.find_transcript(
+            GROQ_MODEL, language, GROQ_PROMPT, url=url,
+            video=video_key(platform, video_id), audio_path=audio_path
+        )
+        if cached_transcription:
+            return cached_transcription
     
     try:
         file_size = os.path.getsize(audio_path)
         file_size_mb = file_size / (1024 * 1024)
         print(f"Transcribing audio file: {file_size_mb:.1f}MB")
         
-        # Get audio duration
-        audio = AudioSegment.from_mp3(audio_path)
-        duration_ms = len(audio)
-        duration_minutes = duration_ms / 1000 / 60
+        # Get audio duration from the container headers (no decode)
+        duration_minutes = probe_media(audio_path).duration / 60
         print(f"Audio duration: {duration_minutes:.1f} minutes")
     except Exception as e:
         print(f"Error getting file info: {e}")
@@ -1338,9 +1449,10 @@ def transcribe_audio(audio_path: str, groq_client: Groq,
     if not should_chunk and file_size_mb <= max_direct_size_mb:
         # Direct transcription for small files
         print("File small enough for direct transcription")
-        transcription = transcribe_with_retry(groq_client, audio_path, language)
+        transcription = transcribe_with_retry(groq_client, audio_path, language, rate_limiter=groq_rate_limiter,
+                                              concurrency=groq_concurrency)
         if transcription:
-            save_to_cache(cache_key, transcription)
+            artifact_store.put_transcript(audio_hash, GROQ_MODEL, language, GROQ_PROMPT, transcription)
         return transcription
     
     else:
@@ -1348,10 +1460,19 @@ def transcribe_audio(audio_path: str, groq_client: Groq,
         print(f"File requires chunking (size: {file_size_mb:.1f}MB, duration: {duration_minutes:.1f}min)")
         # For chunking, always target 20MB chunks for reliability
         # This works well for both free and dev tiers
-        chunks = chunk_audio(audio_path, max_chunk_size_mb=20)
+        # Chunks are cut lazily; the first one tells us how many are coming
+        chunk_stream = chunk_audio(audio_path, max_chunk_size_mb=20)
+        first_chunk = next(chunk_stream, None)
+        if first_chunk is None:
+            return None
+        total_chunks = first_chunk['count']
+        
+        def all_chunks():
+            yield first_chunk
+            yield from chunk_stream
         
         # Check if chunking actually worked
-        if len(chunks) == 1 and chunks[0]['size_mb'] > 25:
+        if total_chunks == 1 and first_chunk['size_mb'] > 25:
             error_msg = (f"File is {file_size_mb:.1f}MB but chunking failed. "
                         "Unable to create chunks small enough for API limits.")
             print(f"ERROR: {error_msg}")
@@ -1364,29 +1485,21 @@ def transcribe_audio(audio_path: str, groq_client: Groq,
             # Parallel transcription for large files
             print(f"Using parallel transcription for {duration_minutes:.1f} minute video")
             
-            # Calculate optimal number of workers based on duration and tier
-            is_dev_tier = st.session_state.get('groq_dev_tier', False)
-            if duration_minutes < 30:
-                num_workers = 1  # Sequential
-            elif duration_minutes < 120:  # 30-120 minutes
-                if is_dev_tier:
-                    num_workers = min(10, max(5, len(chunks) // 5))  # More workers for dev tier
-                else:
-                    num_workers = min(5, max(3, len(chunks) // 10))
-            else:  # 120+ minutes
-                if is_dev_tier:
-                    num_workers = min(8, max(4, len(chunks) // 10))  # More workers for dev tier
-                else:
-                    num_workers = min(3, max(2, len(chunks) // 20))
+            # Enough workers for the concurrency ceiling; how many requests are
+            # actually in flight is decided by groq_concurrency from 429/503s
+            num_workers = min(GROQ_CONCURRENCY_MAX, total_chunks)
             
-            print(f"Using {num_workers} parallel workers for {len(chunks)} chunks")
+            print(f"Using up to {num_workers} parallel workers for {total_chunks} chunks "
+                  f"(adaptive cap {int(groq_concurrency.limit)})")
             
-            # Create rate limiter for Groq API (400 RPM for whisper-large-v3-turbo)
-            rate_limiter = RateLimiter(rpm=400)
+            # Shared Groq limiter, so parallel chunks and other batches draw
+            # from the same quota
+            rate_limiter = groq_rate_limiter
             
             # Parallel processing with ThreadPoolExecutor
             transcriptions = {}
             failed_chunks = []
+            chunks_by_index = {}
             
             def transcribe_chunk(chunk_info):
                 """Transcribe a single chunk with error handling"""
@@ -1406,7 +1519,9 @@ def transcribe_audio(audio_path: str, groq_client: Groq,
                         chunk_info['path'], 
                         language, 
                         max_retries=5,
-                        rate_limiter=rate_limiter
+                        rate_limiter=rate_limiter,
+                        concurrency=groq_concurrency,
+                        audio_seconds=chunk_info.get('duration_ms', 0) / 1000 or None
                     )
                     
                     # Clean up chunk file immediately after successful transcription
@@ -1426,11 +1541,14 @@ def transcribe_audio(audio_path: str, groq_client: Groq,
                     return chunk_info['index'], None
             
             with ThreadPoolExecutor(max_workers=num_workers) as executor:
-                # Submit all chunks
-                future_to_chunk = {
-                    executor.submit(transcribe_chunk, chunk): chunk 
-                    for chunk in chunks
-                }
+                # Submit each chunk as soon as it is cut, so early chunks
+                # transcribe while later ones are still being written
+                future_to_chunk = {}
+                for chunk in all_chunks():
+                    if shutdown_requested:
+                        break
+                    chunks_by_index[chunk['index']] = chunk
+                    future_to_chunk[executor.submit(transcribe_chunk, chunk)] = chunk
                 
                 # Process completed chunks
                 for i, future in enumerate(as_completed(future_to_chunk)):
@@ -1453,13 +1571,13 @@ def transcribe_audio(audio_path: str, groq_client: Groq,
                     # Send detailed progress info
                     if progress_callback:
                         progress_callback(
-                            (i + 1) / len(chunks),
-                            f"Processing chunk {i + 1}/{len(chunks)}",
+                            (i + 1) / total_chunks,
+                            f"Processing chunk {i + 1}/{total_chunks}",
                             {
                                 'chunk_info': {
                                     'current': i + 1,
-                                    'total': len(chunks),
-                                    'progress': (i + 1) / len(chunks)
+                                    'total': total_chunks,
+                                    'progress': (i + 1) / total_chunks
                                 }
                             }
                         )
@@ -1471,14 +1589,16 @@ def transcribe_audio(audio_path: str, groq_client: Groq,
                 time.sleep(30)
                 
                 for chunk_index in failed_chunks:
-                    chunk = next(c for c in chunks if c['index'] == chunk_index)
+                    chunk = chunks_by_index[chunk_index]
                     try:
                         chunk_text = transcribe_with_retry(
                             groq_client, 
                             chunk['path'], 
                             language,
                             max_retries=3,
-                            rate_limiter=rate_limiter
+                            rate_limiter=rate_limiter,
+                            concurrency=groq_concurrency,
+                            audio_seconds=chunk.get('duration_ms', 0) / 1000 or None
                         )
                         if chunk_text:
                             transcriptions[chunk_index] = chunk_text
@@ -1502,9 +1622,10 @@ def transcribe_audio(audio_path: str, groq_client: Groq,
                         except:
                             pass
             
+            transcribed = set(transcriptions)
             # Combine transcriptions in order
             full_text = ' '.join(
-                transcriptions.get(i, '') for i in range(len(chunks))
+                transcriptions.get(i, '') for i in range(total_chunks)
             ).strip()
             
         else:
@@ -1512,7 +1633,7 @@ def transcribe_audio(audio_path: str, groq_client: Groq,
             print("Using sequential transcription")
             transcriptions = []
             
-            for i, chunk in enumerate(chunks):
+            for i, chunk in enumerate(all_chunks()):
                 chunk_start_time = time.time()
                 # Check for shutdown
                 if shutdown_requested:
@@ -1522,23 +1643,27 @@ def transcribe_audio(audio_path: str, groq_client: Groq,
                 # Send detailed progress info
                 if progress_callback:
                     progress_callback(
-                        (i + 1) / len(chunks),
-                        f"Processing chunk {i + 1}/{len(chunks)}",
+                        (i + 1) / total_chunks,
+                        f"Processing chunk {i + 1}/{total_chunks}",
                         {
                             'chunk_info': {
                                 'current': i + 1,
-                                'total': len(chunks),
-                                'progress': (i + 1) / len(chunks)
+                                'total': total_chunks,
+                                'progress': (i + 1) / total_chunks
                             }
                         }
                     )
                 
-                print(f"Transcribing chunk {i+1}/{len(chunks)}...")
+                print(f"Transcribing chunk {i+1}/{total_chunks}...")
                 
                 try:
-                    chunk_text = transcribe_with_retry(groq_client, chunk['path'], language)
+                    chunk_text = transcribe_with_retry(
+                        groq_client, chunk['path'], language,
+                        rate_limiter=groq_rate_limiter, concurrency=groq_concurrency, audio_seconds=chunk.get('duration_ms', 0) / 1000 or None
+                    )
                     if chunk_text:
                         transcriptions.append({
+                            'index': chunk['index'],
                             'text': chunk_text,
                             'start_ms': chunk['start_ms'],
                             'end_ms': chunk['end_ms']
@@ -1560,14 +1685,19 @@ def transcribe_audio(audio_path: str, groq_client: Groq,
                     pass
             
             # Merge transcriptions
-            if not transcriptions:
-                return None
-                
+            transcribed = {t['index'] for t in transcriptions}
             full_text = ' '.join([t['text'] for t in transcriptions])
         
+        # A transcript with holes in it is worse than a clear failure, and
+        # once cached it would be served for this audio from then on
+        missing = [i for i in range(total_chunks) if i not in transcribed]
+        if missing:
+            raise Exception(f"Transcription failed for {len(missing)} of {total_chunks} chunks "
+                            f"(chunks {', '.join(str(i + 1) for i in missing)})")
+        
         # Save to cache
         if full_text:
-            save_to_cache(cache_key, full_text)
+            artifact_store.put_transcript(audio_hash, GROQ_MODEL, language, GROQ_PROMPT, full_text)
             print("Transcription complete and cached")
         
         return full_text
@@ -1769,8 +1899,8 @@ def process_url_batch_with_progress(urls: List[str], api_key: str, cookies_path:
                 
                 # Get audio duration for chunk estimation
                 try:
-                    audio = AudioSegment.from_mp3(audio_path)
-                    duration_minutes = len(audio) / 1000 / 60
+                    # Probe once with yt-dlp's duration; later probes of this file hit the cache
+                    duration_minutes = probe_media(audio_path, known_duration=(info or {}).get('duration')).duration / 60
                     
                     # If file needs chunking, update UI
                     max_size_mb = 95 if st.session_state.get('groq_dev_tier', False) else 24
@@ -1798,7 +1928,7 @@ def process_url_batch_with_progress(urls: List[str], api_key: str, cookies_path:
                 # Transcribe with progress tracking
                 transcription = transcribe_audio_with_progress(
                     audio_path, groq_client, language=language,
-                    progress_callback=transcription_progress_handler
+                    progress_callback=transcription_progress_handler, url=url
                 )
                 
                 if transcription:
@@ -1880,12 +2010,16 @@ Video ID: {video_id}
     return results
 
 def transcribe_audio_with_progress(audio_path: str, groq_client: Groq, 
-                                   language: str = 'en', progress_callback=None) -> Optional[str]:
+                                   language: str = 'en', progress_callback=None,
+                                   url: Optional[str] = None) -> Optional[str]:
     """Wrapper for transcribe_audio that provides progress updates"""
     
-    # Check cache first
-    cache_key = get_cache_key(audio_path, 'transcription')
-    cached_transcription = load_from_cache(cache_key)
+    # Check cache first, by platform video ID / URL, then by audio content
+    platform, video_id = detect_platform(url) if url else (None, None)
+    cached_transcription, audio_hash = artifact_store.find_transcript(
+        GROQ_MODEL, language, GROQ_PROMPT, url=url,
+        video=video_key(platform, video_id), audio_path=audio_path
+    )
     if cached_transcription:
         if progress_callback:
             progress_callback(1.0, "Using cached transcription", {'stage': 'transcription'})
@@ -1894,8 +2028,7 @@ def transcribe_audio_with_progress(audio_path: str, groq_client: Groq,
     # Get file info
     try:
         file_size_mb = os.path.getsize(audio_path) / (1024 * 1024)
-        audio = AudioSegment.from_mp3(audio_path)
-        duration_minutes = len(audio) / 1000 / 60
+        duration_minutes = probe_media(audio_path).duration / 60
     except:
         file_size_mb = 0
         duration_minutes = 0
@@ -1909,13 +2042,14 @@ def transcribe_audio_with_progress(audio_path: str, groq_client: Groq,
         if progress_callback:
             progress_callback(0.5, "Starting transcription...", {'stage': 'transcription'})
         
-        transcription = transcribe_with_retry(groq_client, audio_path, language)
+        transcription = transcribe_with_retry(groq_client, audio_path, language, rate_limiter=groq_rate_limiter,
+                                              concurrency=groq_concurrency)
         
         if progress_callback:
             progress_callback(1.0, "Transcription complete", {'stage': 'transcription'})
         
         if transcription:
-            save_to_cache(cache_key, transcription)
+            artifact_store.put_transcript(audio_hash, GROQ_MODEL, language, GROQ_PROMPT, transcription)
         return transcription
     else:
         # Use existing transcribe_audio with its own progress handling
@@ -1955,219 +2089,170 @@ def transcribe_audio_with_progress(audio_path: str, groq_client: Groq,
                         }
                     )
         
-        return transcribe_audio(audio_path, groq_client, wrapped_progress, language)
+        return transcribe_audio(audio_path, groq_client, wrapped_progress, language,
+                                url=url, audio_hash=audio_hash)
 
 def process_url_batch(urls: List[str], api_key: str, cookies_path: Optional[str] = None,
                      language: str = 'en') -> Dict[str, Dict]:
-    """Process multiple URLs with proper context handling"""
+    """Process multiple URLs as a streaming download → transcribe pipeline.
+    
+    Each platform gets its own capped download pool, and every finished download
+    is handed straight to a shared transcription pool, so a batch takes about as
+    long as its slowest stage instead of the sum of all of them.
+    """
     results = {}
     groq_client = get_groq_client(api_key)
     
     # Get current context (suppress warning for thread safety)
     ctx = get_script_run_ctx(suppress_warning=True)
     
-    # Separate URLs by platform
-    instagram_urls = [url for url in urls if 'instagram.com' in url]
-    youtube_urls = [url for url in urls if 'youtube.com' in url or 'youtu.be' in url]
-    other_urls = [url for url in urls if url not in instagram_urls and url not in youtube_urls]
-    
     # Check for YouTube cookies.txt file
     youtube_cookies = None
     if os.path.exists("cookies.txt"):
         youtube_cookies = "cookies.txt"
         print("🍪 Found cookies.txt for YouTube authentication")
     
-    # Process YouTube URLs with enhanced download
-    for url in youtube_urls:
-        try:
-            print(f"🎬 Processing YouTube URL: {url}")
-            
-            # Use enhanced download for YouTube
-            audio_path, title, info = download_audio_enhanced(
-                url, 
-                cookies_path=youtube_cookies or cookies_path
-            )
-            
-            if audio_path:
-                print(f"✅ YouTube download successful: {title}")
-                
-                # Check file size before transcription
-                file_size_mb = os.path.getsize(audio_path) / (1024 * 1024)
-                
-                if file_size_mb > 100:  # Warn for very large files
-                    print(f"⚠️ Large audio file: {file_size_mb:.1f}MB")
-                
-                try:
-                    transcription = transcribe_audio(audio_path, groq_client, language=language)
-                    
-                    results[url] = {
-                        'status': 'success',
-                        'audio_path': audio_path,
-                        'title': title,
-                        'info': info,
-                        'transcription': transcription
-                    }
-                except Exception as transcribe_error:
-                    print(f"Transcription error: {str(transcribe_error)}")
-                    results[url] = {
-                        'status': 'partial',
-                        'audio_path': audio_path,
-                        'title': title,
-                        'info': info,
-                        'transcription': None,
-                        'error': f"Transcription failed: {str(transcribe_error)}"
-                    }
-            else:
-                print(f"YouTube download failed: {info.get('error', 'Unknown error')}")
-                results[url] = {
-                    'status': 'error',
-                    'error': f"Download failed: {info.get('error', 'Unknown error')}",
-                    'info': info
-                }
-        except Exception as e:
-            print(f"Error processing YouTube URL {url}: {str(e)}")
-            results[url] = {
-                'status': 'error',
-                'error': str(e)
-            }
+    def run_with_context(fn, *args):
+        """Attach the Streamlit context to pool threads before running a stage"""
+        if ctx and threading.current_thread() != threading.main_thread():
+            try:
+                add_script_run_ctx(threading.current_thread(), ctx)
+            except Exception:
+                # Silently ignore context errors - they don't affect functionality
+                pass
+        return fn(*args)
+    
+    def download_stage(url: str, platform: str):
+        download_started[url] = time.monotonic()
+        print(f"⬇️ Downloading {platform} URL: {url}")
+        url_cookies = (youtube_cookies or cookies_path) if platform == 'youtube' else cookies_path
+        return download_audio_enhanced(url, cookies_path=url_cookies)
     
-    # Process Instagram URLs sequentially
-    for url in instagram_urls:
+    def transcribe_stage(url: str, audio_path: str, title: str, info: Dict) -> Dict:
+        file_size_mb = os.path.getsize(audio_path) / (1024 * 1024)
+        if file_size_mb > 100:  # Warn for very large files
+            print(f"⚠️ Large audio file: {file_size_mb:.1f}MB")
+        
         try:
-            print(f"📷 Processing Instagram URL: {url}")
-            audio_path, title, info = download_audio_enhanced(url, cookies_path)
-            
-            if audio_path:
-                print(f"Download successful: {title}")
-                
-                try:
-                    transcription = transcribe_audio(audio_path, groq_client, language=language)
-                    
-                    results[url] = {
-                        'status': 'success',
-                        'audio_path': audio_path,
-                        'title': title,
-                        'info': info,
-                        'transcription': transcription
-                    }
-                except Exception as transcribe_error:
-                    print(f"Transcription error: {str(transcribe_error)}")
-                    results[url] = {
-                        'status': 'partial',
-                        'audio_path': audio_path,
-                        'title': title,
-                        'info': info,
-                        'transcription': None,
-                        'error': f"Transcription failed: {str(transcribe_error)}"
-                    }
-            else:
-                print(f"Download failed: {info.get('error', 'Unknown error')}")
-                results[url] = {
-                    'status': 'error',
-                    'error': f"Download failed: {info.get('error', 'Unknown error')}",
-                    'info': info
-                }
-        except Exception as e:
-            print(f"General error processing {url}: {str(e)}")
-            results[url] = {
-                'status': 'error',
-                'error': str(e)
+            transcription = transcribe_audio(audio_path, groq_client, language=language, url=url)
+            return {
+                'status': 'success',
+                'audio_path': audio_path,
+                'title': title,
+                'info': info,
+                'transcription': transcription
             }
-        
-        # Brief delay between Instagram downloads
-        if len(instagram_urls) > 1:
-            time.sleep(2)
-    
-    # Process other URLs concurrently
-    if other_urls:
-        with ThreadPoolExecutor(max_workers=3) as executor:
-            # Create wrapper function that properly handles context
-            def download_with_context(url, cookies_path, ctx):
-                if ctx and threading.current_thread() != threading.main_thread():
-                    try:
-                        add_script_run_ctx(threading.current_thread(), ctx)
-                    except Exception:
-                        # Silently ignore context errors - they don't affect functionality
-                        pass
-                
-                return download_audio_enhanced(url, cookies_path)
-            
-            # Submit download tasks with context
-            download_futures = {
-                executor.submit(download_with_context, url, cookies_path, ctx): url 
-                for url in other_urls
+        except Exception as transcribe_error:
+            print(f"Transcription error for {url}: {str(transcribe_error)}")
+            return {
+                'status': 'partial',
+                'audio_path': audio_path,
+                'title': title,
+                'info': info,
+                'transcription': None,
+                'error': f"Transcription failed: {str(transcribe_error)}"
             }
+    
+    # One capped download pool per platform, all feeding one transcription pool
+    download_pools = {
+        platform: ThreadPoolExecutor(max_workers=limit, thread_name_prefix=f"download_{platform}")
+        for platform, limit in PLATFORM_DOWNLOAD_LIMITS.items()
+    }
+    transcribe_pool = ThreadPoolExecutor(max_workers=TRANSCRIBE_WORKERS, thread_name_prefix="transcribe")
+    download_started = {}  # url -> monotonic time its download began
+    timed_out = False
+    
+    try:
+        download_futures = {}
+        for url in urls:
+            platform, _ = detect_platform(url)
+            platform = platform if platform in download_pools else 'other'
+            future = download_pools[platform].submit(run_with_context, download_stage, url, platform)
+            download_futures[future] = url
+        
+        # Hand each download to transcription as soon as it finishes. A download
+        # still running DOWNLOAD_TIMEOUT_SECONDS after it started is given up on
+        # (its thread can't be stopped, but the rest of the batch carries on)
+        transcribe_futures = {}
+        pending = set(download_futures)
+        while pending:
+            if shutdown_requested:
+                print("\n⚠️ Shutdown requested - not queueing further transcriptions")
+                break
             
-            # Process downloads as they complete
-            for future in as_completed(download_futures, timeout=900):
+            done, pending = wait(pending, timeout=5, return_when=FIRST_COMPLETED)
+            for future in done:
                 url = download_futures[future]
                 try:
                     audio_path, title, info = future.result()
-                    
-                    if audio_path:
-                        try:
-                            transcription = transcribe_audio(audio_path, groq_client, language=language)
-                            
-                            results[url] = {
-                                'status': 'success',
-                                'audio_path': audio_path,
-                                'title': title,
-                                'info': info,
-                                'transcription': transcription
-                            }
-                        except Exception as transcribe_error:
-                            results[url] = {
-                                'status': 'partial',
-                                'audio_path': audio_path,
-                                'title': title,
-                                'info': info,
-                                'transcription': None,
-                                'error': f"Transcription failed: {str(transcribe_error)}"
-                            }
-                    else:
-                        results[url] = {
-                            'status': 'error',
-                            'error': info.get('error', 'Download failed'),
-                            'info': info
-                        }
-                        
-                except concurrent.futures.TimeoutError:
+                except Exception as e:
+                    print(f"Error downloading {url}: {str(e)}")
                     results[url] = {
                         'status': 'error',
-                        'error': 'Download timed out after 15 minutes.'
+                        'error': str(e)
                     }
-                except Exception as e:
+                    continue
+                
+                if audio_path:
+                    print(f"✅ Download successful: {title}")
+                    transcribe_future = transcribe_pool.submit(
+                        run_with_context, transcribe_stage, url, audio_path, title, info
+                    )
+                    transcribe_futures[transcribe_future] = url
+                else:
+                    print(f"Download failed: {info.get('error', 'Unknown error')}")
                     results[url] = {
                         'status': 'error',
-                        'error': str(e)
+                        'error': f"Download failed: {info.get('error', 'Unknown error')}",
+                        'info': info
+                    }
+            
+            now = time.monotonic()
+            for future in list(pending):
+                url = download_futures[future]
+                if now - download_started.get(url, now) > DOWNLOAD_TIMEOUT_SECONDS:
+                    print(f"⏱️ Download timed out: {url}")
+                    pending.discard(future)
+                    timed_out = True
+                    results[url] = {
+                        'status': 'error',
+                        'error': f"Download timed out after {DOWNLOAD_TIMEOUT_SECONDS // 60} minutes."
                     }
+        
+        for future in as_completed(transcribe_futures):
+            url = transcribe_futures[future]
+            try:
+                results[url] = future.result()
+            except Exception as e:
+                results[url] = {
+                    'status': 'error',
+                    'error': str(e)
+                }
+    finally:
+        # Don't wait on downloads that timed out; their threads finish on their own
+        for pool in download_pools.values():
+            pool.shutdown(wait=not (shutdown_requested or timed_out), cancel_futures=shutdown_requested)
+        transcribe_pool.shutdown(wait=not shutdown_requested, cancel_futures=shutdown_requested)
     
     return results
 
 def get_video_info_yt(url: str) -> Dict[str, Any]:
     """Get YouTube video info including live status"""
-    ydl_opts = {
-        'quiet': True,
-        'no_warnings': True,
-        'extract_flat': False,
-    }
-    
     try:
-        with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-            info = ydl.extract_info(url, download=False)
-            
-            return {
-                'title': info.get('title', 'Unknown'),
-                'duration': info.get('duration', 0),
-                'is_live': info.get('is_live', False),
-                'live_status': info.get('live_status', 'none'),
-                'was_live': info.get('live_status') == 'was_live',
-                'description': info.get('description', ''),
-                'uploader': info.get('uploader', ''),
-                'view_count': info.get('view_count', 0),
-                'like_count': info.get('like_count', 0),
-                'upload_date': info.get('upload_date', ''),
-            }
+        # Raw info, kept so download_audio_enhanced can download from it
+        info = extract_video_info(url)
+        return {
+            'title': info.get('title', 'Unknown'),
+            'duration': info.get('duration', 0),
+            'is_live': info.get('is_live', False),
+            'live_status': info.get('live_status', 'none'),
+            'was_live': info.get('live_status') == 'was_live',
+            'description': info.get('description', ''),
+            'uploader': info.get('uploader', ''),
+            'view_count': info.get('view_count', 0),
+            'like_count': info.get('like_count', 0),
+            'upload_date': info.get('upload_date', ''),
+        }
     except Exception as e:
         print(f"Error getting video info: {e}")
         return {
@@ -2606,6 +2691,19 @@ def main():
             }.get(x, x)
         )
         
+        audio_format = st.selectbox(
+            "Upload Audio Format",
+            options=list(AUDIO_FORMATS),
+            index=list(AUDIO_FORMATS).index(AUDIO_FORMAT),
+            format_func=lambda x: {
+                'opus': 'Opus 16 kHz mono (smallest)',
+                'flac': 'FLAC 16 kHz mono (lossless)',
+                'mp3': 'MP3 16 kHz mono'
+            }.get(x, x),
+            help="Downloads are converted to 16 kHz mono, all Whisper needs. Opus uploads are ~6x smaller than 192k MP3, so most hour-long videos skip chunking."
+        )
+        st.session_state.audio_format = audio_format
+        
         # Processing speed
         try:
             speed = st.segmented_control(
@@ -2630,16 +2728,19 @@ def main():
         
         # Cache management
         st.subheader("💾 Cache Management")
-        cache_files = list(CACHE_DIR.glob('*.pkl'))
-        cache_size = sum(f.stat().st_size for f in cache_files) / (1024 * 1024)
-        st.metric("Cache Size", f"{cache_size:.1f} MB")
-        st.metric("Cached Items", len(cache_files))
+        cache_stats = artifact_store.stats()
+        cache_size = cache_stats['size_bytes'] / (1024 * 1024)
+        cache_limit = cache_stats['max_bytes'] / (1024 * 1024 * 1024)
+        st.metric("Cache Size", f"{cache_size:.1f} MB", help=f"Oldest entries are evicted beyond {cache_limit:.0f} GB")
+        st.metric("Cached Items", cache_stats['audio_count'] + cache_stats['transcript_count'])
+        lookups = cache_stats['transcript_lookups']
+        hits = lookups['source_hits'] + lookups['audio_hits']
+        st.caption(f"Transcript cache: {hits} hits / {lookups['misses']} misses this session")
         
         col1, col2 = st.columns(2)
         with col1:
             if st.button("🗑️ Clear Cache", type="secondary", use_container_width=True):
-                for f in cache_files:
-                    f.unlink()
+                artifact_store.clear()
                 st.success("Cache cleared!")
                 st.rerun()
         
@@ -3013,7 +3114,7 @@ def main():
                                     zf.writestr(f"{safe_title}.txt", transcription)
                                     audio_path = st.session_state.downloads[url].get('audio_path')
                                     if audio_path and os.path.exists(audio_path):
-                                        zf.write(audio_path, f"{safe_title}.mp3")
+                                        zf.write(audio_path, f"{safe_title}{Path(audio_path).suffix}")
                         with open(tmp_zip.name, 'rb') as f:
                             st.download_button(
                                 "⬇️ Download ZIP",
@@ -3148,7 +3249,7 @@ def main():
                         if result.get('audio_path') and os.path.exists(result['audio_path']):
                             with open(result['audio_path'], 'rb') as f:
                                 audio_bytes = f.read()
-                            st.audio(audio_bytes, format='audio/mp3')
+                            st.audio(audio_bytes, format=mimetypes.guess_type(result['audio_path'])[0] or 'audio/mpeg')
                                 
                         # Transcription
                         if result.get('transcription'):
@@ -3195,14 +3296,15 @@ def main():
                         # Use containers to isolate download buttons
                         download_container = st.container()
                         with download_container:
-                            # Download MP3
+                            # Download audio (in the selected upload format)
                             if result.get('audio_path') and os.path.exists(result['audio_path']):
+                                audio_ext = Path(result['audio_path']).suffix
                                 with open(result['audio_path'], 'rb') as f:
                                     st.download_button(
-                                        "📥 Download MP3",
+                                        f"📥 Download {audio_ext.lstrip('.').upper()}",
                                         data=f,
-                                        file_name=f"{result['title'][:50]}.mp3",
-                                        mime="audio/mpeg",
+                                        file_name=f"{result['title'][:50]}{audio_ext}",
+                                        mime=mimetypes.guess_type(result['audio_path'])[0] or 'audio/mpeg',
                                         key=f"mp3_{url_hash}",
                                         use_container_width=True
                                     )
@@ -3258,7 +3360,7 @@ def main():
                                 zf.writestr(f"{safe_title}.txt", transcription)
                                 audio_path = st.session_state.downloads[url].get('audio_path')
                                 if audio_path and os.path.exists(audio_path):
-                                    zf.write(audio_path, f"{safe_title}.mp3")
+                                    zf.write(audio_path, f"{safe_title}{Path(audio_path).suffix}")
                     with open(tmp_zip.name, 'rb') as f:
                         st.download_button(
                             "⬇️ Download ZIP",
@@ -3,7 +3,8 @@ Configuration validation API endpoints for MultiFetch v2.
 """
 
 from flask import Blueprint, request, jsonify
-from groq import Groq
+
+from services.groq_client import groq_clients
 
 config_bp = Blueprint("config", __name__)
 
@@ -39,9 +40,11 @@ def validate_api_key(api_key: str, test_connection: bool = False) -> dict:
     # Optionally test the connection
     if test_connection:
         try:
-            client = Groq(api_key=api_key)
-            # Make a minimal API call to verify the key works
-            client.models.list()
+            # Pooled client, so a later job with this key starts on a warm
+            # connection
+            with groq_clients.lease(api_key) as client:
+                # Make a minimal API call to verify the key works
+                client.models.list()
             result["valid"] = True
         except Exception as e:
             error_msg = str(e)
@@ -0,0 +1,39 @@
+"""
+Download engine stats API endpoints for MultiFetch v2.
+"""
+
+from flask import Blueprint, jsonify
+
+from services.format_selector import format_stats
+from services.strategy_scheduler import strategy_scheduler
+
+downloads_bp = Blueprint("downloads", __name__)
+
+
+@downloads_bp.route("/strategies", methods=["GET"])
+def strategies():
+    """
+    YouTube download strategy stats (for the worker serving the request).
+
+    Response:
+        {"window", "max_age_seconds", "downloads", "median_attempts",
+         "mean_attempts", "strategies": [{"name", "attempts", "successes",
+         "success_rate", "median_seconds"}, ...],
+         "hedge": {"hedged", "hedge_wins", "delay_seconds"}}, strategies in
+        the order they are tried now
+    """
+    return jsonify(strategy_scheduler.stats())
+
+
+@downloads_bp.route("/formats", methods=["GET"])
+def formats():
+    """
+    Format selection and audio postprocessing stats (for this worker).
+
+    Response:
+        {"selections": {"audio", "combined", "best", "none"}, "downloads",
+         "passthrough", "transcoded", "bytes_downloaded", "bytes_uploaded",
+         "transcode_seconds", "mean_bytes_downloaded",
+         "mean_transcode_seconds"}
+    """
+    return jsonify(format_stats.stats())
@@ -2,9 +2,13 @@
 Job management API endpoints for MultiFetch v2.
 """
 
+import os
+
 from flask import Blueprint, request, jsonify
 
 from services.job_manager import job_manager, JobType, JobStatus
+from services.job_retention import job_retention
+from services.job_runner import job_runner
 from services.platform_detector import validate_urls_batch
 
 jobs_bp = Blueprint("jobs", __name__)
@@ -49,21 +53,27 @@ def create_job():
     for result in validation_results:
         if result["valid"]:
             valid_urls.append(result["url"])
-            platform_info.append({
-                "platform": result["platform"],
-                "video_id": result["video_id"],
-            })
+            platform_info.append(
+                {
+                    "platform": result["platform"],
+                    "video_id": result["video_id"],
+                }
+            )
         else:
-            invalid_urls.append({
-                "url": result["url"],
-                "error": result["error"],
-            })
+            invalid_urls.append(
+                {
+                    "url": result["url"],
+                    "error": result["error"],
+                }
+            )
 
     if not valid_urls:
-        return jsonify({
-            "error": "No valid URLs provided",
-            "invalid_urls": invalid_urls,
-        }), 400
+        return jsonify(
+            {
+                "error": "No valid URLs provided",
+                "invalid_urls": invalid_urls,
+            }
+        ), 400
 
     # Parse job type
     job_type_str = data.get("job_type", "full")
@@ -92,19 +102,43 @@ def create_job():
 @jobs_bp.route("", methods=["GET"])
 def list_jobs():
     """
-    List recent jobs.
+    List recent jobs, one page at a time.
 
     Query params:
-        limit: Maximum number of jobs to return (default 50)
+        limit: Maximum number of jobs to return (default 50, max 100)
+        cursor: next_cursor from the previous page
+        status: Comma-separated statuses to include (e.g. "running,pending")
+        view: "summary" (default, no items) or "full"
 
     Response:
-        {"jobs": [job objects]}
+        {"jobs": [job objects], "next_cursor": "..." or null}
     """
     limit = request.args.get("limit", 50, type=int)
-    limit = min(limit, 100)  # Cap at 100
+    limit = max(1, min(limit, 100))  # Cap at 100
+
+    statuses = None
+    status_param = request.args.get("status")
+    if status_param:
+        try:
+            statuses = {JobStatus(value.strip()) for value in status_param.split(",")}
+        except ValueError:
+            return jsonify({"error": f"Invalid status: {status_param}"}), 400
+
+    view = request.args.get("view", "summary")
+    if view not in ("summary", "full"):
+        return jsonify({"error": f"Invalid view: {view}"}), 400
 
-    jobs = job_manager.list_jobs(limit=limit)
-    return jsonify({"jobs": [job.to_dict() for job in jobs]})
+    try:
+        jobs, next_cursor = job_manager.list_job_page(
+            limit,
+            cursor=request.args.get("cursor") or None,
+            statuses=statuses,
+            full=view == "full",
+        )
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    return jsonify({"jobs": jobs, "next_cursor": next_cursor})
 
 
 @jobs_bp.route("/<job_id>", methods=["GET"])
@@ -122,15 +156,38 @@ def get_job(job_id: str):
     return jsonify(job.to_dict())
 
 
+@jobs_bp.route("/<job_id>/items/<int:index>/transcript", methods=["GET"])
+def get_item_transcript(job_id: str, index: int):
+    """
+    Get one item's transcript (SSE events only say has_transcript).
+
+    Response:
+        {"index": 0, "url": "...", "transcript": "..."} or 404
+    """
+    job = job_manager.get_job(job_id)
+    if not job:
+        return jsonify({"error": "Job not found"}), 404
+
+    item = job.item_at(index)
+    if not item:
+        return jsonify({"error": "Item not found"}), 404
+
+    transcript = item.read_transcript()
+    if transcript is None:
+        return jsonify({"error": "No transcript for this item"}), 404
+
+    return jsonify({"index": index, "url": item.url, "transcript": transcript})
+
+
 @jobs_bp.route("/<job_id>", methods=["DELETE"])
 def delete_job(job_id: str):
     """
-    Delete a job.
+    Delete a job, its downloaded audio and any spilled transcripts.
 
     Response:
         {"deleted": true} or 404
     """
-    if job_manager.delete_job(job_id):
+    if job_retention.delete_job(job_id):
         return jsonify({"deleted": True})
     return jsonify({"error": "Job not found"}), 404
 
@@ -157,8 +214,12 @@ def cancel_job(job_id: str):
 @jobs_bp.route("/<job_id>/start", methods=["POST"])
 def start_job(job_id: str):
     """
-    Start processing a pending job.
-    This endpoint will be expanded in Phase 4 to actually process the URLs.
+    Start processing a pending job in the background.
+
+    Request body (optional):
+        {
+            "api_key": "gsk_..."  // falls back to GROQ_API_KEY
+        }
 
     Response:
         Updated job object or error
@@ -168,13 +229,18 @@ def start_job(job_id: str):
         return jsonify({"error": "Job not found"}), 404
 
     if job.status != JobStatus.PENDING:
-        return jsonify({"error": f"Job is not pending (status: {job.status.value})"}), 400
-
-    # Mark job as running (actual processing will be added in Phase 4)
-    job_manager.update_job_status(job_id, JobStatus.RUNNING)
-
-    # TODO: In Phase 4, spawn background task to process URLs
-    # For now, just mark it as running
+        return jsonify(
+            {"error": f"Job is not pending (status: {job.status.value})"}
+        ), 409
+
+    data = request.get_json(silent=True) or {}
+    api_key = data.get("api_key") or os.getenv("GROQ_API_KEY")
+    if job.job_type != JobType.DOWNLOAD and not api_key:
+        return jsonify({"error": "api_key is required for transcription jobs"}), 400
+
+    # Only one of several concurrent starts wins the PENDING -> RUNNING claim
+    if not job_runner.start_job(job_id, api_key=api_key):
+        return jsonify({"error": "Job is not pending (already started)"}), 409
 
     job = job_manager.get_job(job_id)
     return jsonify(job.to_dict())
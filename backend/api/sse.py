@@ -1,32 +1,194 @@
 """
 Server-Sent Events (SSE) endpoint for real-time job progress streaming.
+
+Streams carry deltas, not whole jobs: item_update events hold only the
+fields that changed, and no event ever includes a transcript (clients
+fetch those from GET /api/jobs/<job_id>/items/<index>/transcript when an
+item reports has_transcript). Every event carries a per-job sequence
+number. Publishing appends the event to the job store, which assigns the
+number and keeps each job's latest events (see JobStore.append_event), so
+numbering survives as long as the job does and reconnecting clients can
+resume from their Last-Event-ID. A relay thread in every process reads
+new events back from the store and formats each once for all of the
+process's subscribers, so a stream served by one gunicorn worker gets the
+events of a job running in another.
+
+Each subscriber's pending events are bounded too: a newer item_update for
+the same item replaces the pending one, a newer progress batch is merged
+into the pending one, and a subscriber that still falls too far behind
+gets a fresh snapshot instead of its backlog. complete and
+error events are never dropped.
 """
 
 import json
 import queue
 import threading
+from collections import OrderedDict
+from typing import Optional
+
 from flask import Blueprint, Response, request
 
-from services.job_manager import job_manager, JobStatus
+from services.job_manager import Job, job_manager, JobStatus
+from utils.constants import SSE_POLL_SECONDS, SSE_SUBSCRIBER_QUEUE
 
 sse_bp = Blueprint("sse", __name__)
 
-# Store SSE subscribers per job
-_subscribers: dict[str, list[queue.Queue]] = {}
+FINISHED = (JobStatus.COMPLETED, JobStatus.FAILED, JobStatus.CANCELLED)
+TERMINAL_EVENTS = ("complete", "error")
+# Returned by SubscriberQueue.get() when the subscriber needs a new snapshot
+RESYNC = "resync"
+
+
+class SubscriberQueue:
+    """
+    Bounded, coalescing queue of (event, formatted message) for one stream.
+
+    Events put with the same key (one per item for item_update, one for
+    update snapshots) replace each other while pending; progress batches
+    are merged instead (see _merge_progress). Once `maxsize`
+    other events are pending, they are all dropped and the next get()
+    returns (RESYNC, None) so the stream sends a current snapshot instead.
+    Terminal events don't count toward the bound and are never dropped.
+    """
+
+    def __init__(self, maxsize: int = SSE_SUBSCRIBER_QUEUE):
+        self.maxsize = maxsize
+        # seq the stream starts after (its snapshot or replay covers the rest)
+        self.after = 0
+        self._pending: OrderedDict = OrderedDict()  # key -> (event, msg, data)
+        self._droppable = 0
+        self._resync = False
+        self._cond = threading.Condition()
+
+    def put(self, key, event: str, msg: str, data: Optional[dict] = None) -> int:
+        """
+        Queue an event.
+
+        Args:
+            key: Coalescing key (see _format_event)
+            event: Event name
+            msg: The event formatted with format_sse()
+            data: The event's data, needed to merge progress batches
+
+        Returns:
+            0 if queued, -1 if it replaced a pending event with the same
+            key, or how many events were dropped for a resync
+        """
+        with self._cond:
+            try:
+                if event in TERMINAL_EVENTS:
+                    self._pending[(event, id(msg))] = (event, msg, data)
+                    return 0
+                if key in self._pending:
+                    if event == "progress":
+                        # In place, so it still goes out before later events
+                        self._pending[key] = _merge_progress(self._pending[key], data)
+                    else:
+                        self._pending.pop(key)
+                        self._pending[key] = (event, msg, data)
+                    return -1
+                if self._droppable >= self.maxsize:
+                    # The snapshot taken on resync covers every dropped event
+                    # and this one
+                    dropped = self._droppable + 1
+                    self._drop_pending()
+                    return dropped
+                self._pending[key] = (event, msg, data)
+                self._droppable += 1
+                return 0
+            finally:
+                self._cond.notify()
+
+    def resync(self):
+        """Drop pending events so the next get() returns RESYNC."""
+        with self._cond:
+            self._drop_pending()
+            self._cond.notify()
+
+    def _drop_pending(self):
+        """Drop every pending event but terminal ones (lock held)."""
+        self._pending = OrderedDict(
+            (k, v) for k, v in self._pending.items() if v[0] in TERMINAL_EVENTS
+        )
+        self._droppable = 0
+        self._resync = True
+
+    def get(self, timeout: float) -> tuple[str, Optional[str]]:
+        """
+        Next (event, message), or (RESYNC, None) after events were dropped.
+
+        Raises:
+            queue.Empty: If nothing arrives within `timeout` seconds
+        """
+        with self._cond:
+            if not self._cond.wait_for(
+                lambda: self._resync or self._pending, timeout=timeout
+            ):
+                raise queue.Empty
+            if self._resync:
+                self._resync = False
+                return RESYNC, None
+            _, (event, msg, _) = self._pending.popitem(last=False)
+            if event not in TERMINAL_EVENTS:
+                self._droppable -= 1
+            return event, msg
+
+
+# Store SSE subscribers per job, and the seq up to which each job's events
+# have been relayed to them
+_subscribers: dict[str, list[SubscriberQueue]] = {}
+_relayed: dict[str, int] = {}
 _subscribers_lock = threading.Lock()
+# Set on every local publish, so the relay doesn't wait out its poll interval
+_relay_wake = threading.Event()
+_relay_thread: Optional[threading.Thread] = None
+# Delivery counters for this process (see sse_stats)
+_counters = {"published": 0, "coalesced": 0, "dropped": 0, "resyncs": 0}
 
 
-def subscribe_to_job(job_id: str) -> queue.Queue:
-    """Subscribe to updates for a specific job."""
-    q = queue.Queue()
-    with _subscribers_lock:
-        if job_id not in _subscribers:
-            _subscribers[job_id] = []
-        _subscribers[job_id].append(q)
-    return q
+def subscribe_to_job(
+    job_id: str, last_event_id: Optional[int] = None
+) -> tuple[SubscriberQueue, int, Optional[list[tuple[str, str]]]]:
+    """
+    Subscribe to updates for a specific job.
 
+    Args:
+        job_id: The job ID
+        last_event_id: seq of the last event a reconnecting client saw
 
-def unsubscribe_from_job(job_id: str, q: queue.Queue):
+    Returns:
+        (queue, seq of the last event published before subscribing,
+        the (event, message) pairs the client missed, or None if they're
+        no longer buffered and it needs a fresh snapshot)
+    """
+    global _relay_thread
+    q = SubscriberQueue()
+    store = job_manager.store
+    with _subscribers_lock:
+        # The relay delivers under the lock too, and only events it read
+        # before this, so nothing falls between the seq read here and the
+        # queue joining the fan-out
+        seq = store.last_event_seq(job_id)
+        missed = None
+        if last_event_id is not None and last_event_id <= seq:
+            events = store.events_after(job_id, last_event_id)
+            if events is not None:
+                missed = [
+                    (event, _format_event(event_seq, event, data)[2])
+                    for event_seq, event, data in events
+                ]
+        q.after = seq
+        _subscribers.setdefault(job_id, []).append(q)
+        _relayed.setdefault(job_id, seq)
+        if _relay_thread is None:
+            _relay_thread = threading.Thread(
+                target=_relay, name="sse-relay", daemon=True
+            )
+            _relay_thread.start()
+        return q, seq, missed
+
+
+def unsubscribe_from_job(job_id: str, q: SubscriberQueue):
     """Unsubscribe from job updates."""
     with _subscribers_lock:
         if job_id in _subscribers:
@@ -36,84 +198,247 @@ def unsubscribe_from_job(job_id: str, q: queue.Queue):
                 pass
             if not _subscribers[job_id]:
                 del _subscribers[job_id]
+                del _relayed[job_id]
 
 
 def publish_job_update(job_id: str, event_type: str = "update", data: dict = None):
     """
     Publish an update to all subscribers of a job.
 
+    The event is appended to the job's event log in the store, which
+    gives it the job's next sequence number (also its SSE id). Subscribers
+    in any process get it from there through their process's relay.
+
     Args:
         job_id: The job ID
         event_type: Event type (update, item_update, complete, error)
         data: The data to send
     """
+    payload = json.dumps(data or {}, separators=(",", ":"))
+    job_manager.store.append_event(job_id, event_type, payload)
     with _subscribers_lock:
-        if job_id not in _subscribers:
-            return
-        for q in _subscribers[job_id]:
+        _counters["published"] += 1
+    _relay_wake.set()
+
+
+def _relay():
+    """
+    Feed this process's subscriber queues from the job store's event logs.
+
+    Events are published by whichever gunicorn worker runs the job, so the
+    relay polls the log of every job with a local subscriber once per
+    SSE_POLL_SECONDS (right away after a publish in this process) and
+    formats each new event once for all of the job's local subscribers.
+    """
+    while True:
+        _relay_wake.wait(SSE_POLL_SECONDS)
+        _relay_wake.clear()
+        with _subscribers_lock:
+            cursors = list(_relayed.items())
+        for job_id, after in cursors:
             try:
-                q.put_nowait({
-                    "event": event_type,
-                    "data": data or {},
-                })
-            except queue.Full:
-                pass
+                _relay_job(job_id, after)
+            except Exception as e:
+                print(f"SSE relay failed for job {job_id}: {e}")
+
+
+def _relay_job(job_id: str, after: int):
+    """Deliver a job's events past `after` to its local subscribers."""
+    store = job_manager.store
+    events = store.events_after(job_id, after)
+    if events == []:
+        return
+    latest = store.last_event_seq(job_id) if events is None else events[-1][0]
+    with _subscribers_lock:
+        if _relayed.get(job_id) != after:
+            return  # everyone unsubscribed meanwhile
+        _relayed[job_id] = latest
+        queues = _subscribers[job_id]
+        if events is None:
+            # More events than the store keeps went by: resend state instead
+            for q in queues:
+                if q.after < latest:
+                    q.resync()
+                    _counters["resyncs"] += 1
+            return
+        for seq, event, data in events:
+            key, data, msg = _format_event(seq, event, data)
+            for q in queues:
+                if seq <= q.after:
+                    continue
+                outcome = q.put(key, event, msg, data)
+                if outcome < 0:
+                    _counters["coalesced"] += 1
+                elif outcome > 0:
+                    _counters["dropped"] += outcome
+                    _counters["resyncs"] += 1
+
+
+def current_seq(job_id: str) -> int:
+    """seq of the last event published for a job."""
+    return job_manager.store.last_event_seq(job_id)
+
+
+def sse_stats() -> dict:
+    """Subscriber and delivery counters for the health endpoint."""
+    with _subscribers_lock:
+        return {
+            "subscribers": sum(len(queues) for queues in _subscribers.values()),
+            **_counters,
+        }
 
 
-def format_sse(data: dict, event: str = None) -> str:
+def format_sse(data: dict, event: str = None, event_id: int = None) -> str:
     """Format data as SSE message."""
     msg = ""
+    if event_id is not None:
+        msg += f"id: {event_id}\n"
     if event:
         msg += f"event: {event}\n"
-    msg += f"data: {json.dumps(data)}\n\n"
+    msg += f"data: {json.dumps(data, separators=(',', ':'))}\n\n"
     return msg
 
 
+def _format_event(seq: int, event: str, data: str) -> tuple[tuple, dict, str]:
+    """
+    (coalescing key, data, format_sse() message) of an event from a job's log.
+
+    The key lets a subscriber keep one pending update per item, one pending
+    progress batch and one pending snapshot; other events each get their own.
+    """
+    data = {**json.loads(data), "seq": seq}
+    if event == "item_update":
+        key = ("item", data.get("index", data.get("url")))
+    elif event in ("progress", "update"):
+        key = (event,)
+    else:
+        key = (event, seq)
+    return key, data, format_sse(data, event=event, event_id=seq)
+
+
+def _merge_progress(pending: tuple, data: Optional[dict]) -> tuple:
+    """
+    Fold a newer progress batch into a pending one.
+
+    Each item keeps its newest progress, and items only the pending batch
+    had are kept. The merged event keeps the pending event's seq (and its
+    place in the queue), so a client resuming from its id misses nothing
+    that was published in between.
+    """
+    event, msg, older = pending
+    if older is None or data is None:
+        return pending
+    items = {}
+    for item in older.get("items", []) + data.get("items", []):
+        items[item.get("index", item.get("url"))] = item
+    merged = {**data, "items": list(items.values()), "seq": older["seq"]}
+    return event, format_sse(merged, event=event, event_id=older["seq"]), merged
+
+
+def job_snapshot(job: Job, seq: int) -> dict:
+    """Full job state without transcripts, tagged with a sequence number."""
+    return {**job.to_dict(transcripts=False), "seq": seq}
+
+
+def job_summary(job: Job, seq: int) -> dict:
+    """Job-level fields only (no items), tagged with a sequence number."""
+    return {**job.to_summary(), "seq": seq}
+
+
+def _last_event_id() -> Optional[int]:
+    """Last-Event-ID sent by a reconnecting EventSource (or ?last_event_id=)."""
+    value = request.headers.get("Last-Event-ID") or request.args.get("last_event_id")
+    try:
+        return int(value) if value else None
+    except ValueError:
+        return None
+
+
 @sse_bp.route("/jobs/<job_id>/stream")
 def stream_job(job_id: str):
     """
     Stream real-time updates for a specific job via SSE.
 
     The client should connect to this endpoint and listen for events:
-    - update: General job status update
-    - item_update: Progress update for a specific item
-    - complete: Job completed (all items done)
+    - update: Job state with items but no transcripts (sent first)
+    - item_update: Changed fields of one item (by index), plus job totals
+    - progress: {"items": [{index, url, progress, status}], "job_progress"},
+      the running items' progress batched once per tick
+    - complete: Job fields without items once all items are done
     - error: Job failed
 
+    Every event has a "seq" field (also its SSE id); item_update events
+    with a seq at or below the initial update's seq are already reflected
+    in it. When the browser reconnects with Last-Event-ID, the events it
+    missed are replayed instead of a new snapshot, as long as the job
+    store still keeps them.
+
     Example client code:
         const source = new EventSource('/api/sse/jobs/abc123/stream');
         source.onmessage = (e) => console.log(JSON.parse(e.data));
         source.addEventListener('complete', (e) => source.close());
     """
+    # Subscribe before reading the job, so no event falls between the
+    # snapshot (or replay) and the first queued delta
+    q, seq, missed = subscribe_to_job(job_id, _last_event_id())
     job = job_manager.get_job(job_id)
     if not job:
+        unsubscribe_from_job(job_id, q)
         return Response(
             format_sse({"error": "Job not found"}, event="error"),
             mimetype="text/event-stream",
             status=404,
         )
 
-    def generate():
-        # Send initial job state
-        yield format_sse(job.to_dict(), event="update")
-
-        # If job is already complete, send complete event and close
-        if job.status in (JobStatus.COMPLETED, JobStatus.FAILED, JobStatus.CANCELLED):
-            yield format_sse(job.to_dict(), event="complete")
-            return
-
-        # Subscribe to updates
-        q = subscribe_to_job(job_id)
+    # Taken now, not when the generator first runs: the job may move on
+    # (and its events queue up) before the response starts streaming
+    snapshot = format_sse(job_snapshot(job, seq), event="update", event_id=seq)
+    finished = format_sse(job_summary(job, seq), event="complete")
+    if job.status not in FINISHED:
+        finished = None
 
+    def generate():
         try:
+            if missed is None:
+                # Send initial job state
+                yield snapshot
+            else:
+                for event, msg in missed:
+                    yield msg
+                    if event in TERMINAL_EVENTS:
+                        return
+
+            # If job is already complete, send complete event and close
+            if finished:
+                yield finished
+                return
+
             while True:
                 try:
                     # Wait for update with timeout (for keepalive)
-                    msg = q.get(timeout=30)
-                    yield format_sse(msg["data"], event=msg["event"])
+                    event, msg = q.get(timeout=30)
+                    if event == RESYNC:
+                        # Fell behind and events were dropped: resend state
+                        latest = current_seq(job_id)
+                        current_job = job_manager.get_job(job_id)
+                        if not current_job:
+                            break
+                        msg = format_sse(
+                            job_snapshot(current_job, latest),
+                            event="update",
+                            event_id=latest,
+                        )
+                        if current_job.status in FINISHED:
+                            # Its complete event may be among those dropped
+                            yield msg
+                            yield format_sse(
+                                job_summary(current_job, latest), event="complete"
+                            )
+                            break
+                    yield msg
 
                     # If complete, stop streaming
-                    if msg["event"] in ("complete", "error"):
+                    if event in TERMINAL_EVENTS:
                         break
                 except queue.Empty:
                     # Send keepalive comment
@@ -123,12 +448,17 @@ def stream_job(job_id: str):
                     current_job = job_manager.get_job(job_id)
                     if not current_job:
                         break
-                    if current_job.status in (
-                        JobStatus.COMPLETED,
-                        JobStatus.FAILED,
-                        JobStatus.CANCELLED,
-                    ):
-                        yield format_sse(current_job.to_dict(), event="complete")
+                    if current_job.status in FINISHED:
+                        # complete carries no items, so send their final state
+                        latest = current_seq(job_id)
+                        yield format_sse(
+                            job_snapshot(current_job, latest),
+                            event="update",
+                            event_id=latest,
+                        )
+                        yield format_sse(
+                            job_summary(current_job, latest), event="complete"
+                        )
                         break
         finally:
             unsubscribe_from_job(job_id, q)
@@ -149,41 +479,49 @@ def notify_job_started(job_id: str):
     """Notify subscribers that a job has started."""
     job = job_manager.get_job(job_id)
     if job:
-        publish_job_update(job_id, "update", job.to_dict())
+        publish_job_update(job_id, "update", job.to_dict(transcripts=False))
 
 
-def notify_item_progress(job_id: str, url: str, progress: int, status: str = None):
-    """Notify subscribers of item progress update."""
-    job = job_manager.get_job(job_id)
-    if job:
-        publish_job_update(job_id, "item_update", {
-            "url": url,
-            "progress": progress,
-            "status": status,
-            "job_progress": job.progress,
-        })
+def notify_items_progress(job_id: str, items: list[dict], job_progress: int):
+    """Notify subscribers of a batch of item progress updates (one event)."""
+    publish_job_update(
+        job_id,
+        "progress",
+        {
+            "items": items,
+            "job_progress": job_progress,
+        },
+    )
 
 
-def notify_item_complete(job_id: str, url: str, title: str = None, transcript: str = None):
-    """Notify subscribers that an item completed."""
+def notify_item_complete(
+    job_id: str,
+    url: str,
+    title: str = None,
+    transcript: str = None,
+    index: int = None,
+):
+    """Notify subscribers that an item completed (the transcript stays out)."""
     job = job_manager.get_job(job_id)
     if job:
         publish_job_update(job_id, "item_update", {
+            "index": index,
             "url": url,
             "progress": 100,
             "status": "completed",
             "title": title,
-            "transcript": transcript,
+            "has_transcript": transcript is not None,
             "job_progress": job.progress,
             "completed_count": job.completed_count,
         })
 
 
-def notify_item_failed(job_id: str, url: str, error: str):
+def notify_item_failed(job_id: str, url: str, error: str, index: int = None):
     """Notify subscribers that an item failed."""
     job = job_manager.get_job(job_id)
     if job:
         publish_job_update(job_id, "item_update", {
+            "index": index,
             "url": url,
             "progress": 0,
             "status": "failed",
@@ -197,4 +535,4 @@ def notify_job_complete(job_id: str):
     """Notify subscribers that the job is complete."""
     job = job_manager.get_job(job_id)
     if job:
-        publish_job_update(job_id, "complete", job.to_dict())
+        publish_job_update(job_id, "complete", job.to_summary())
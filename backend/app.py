@@ -18,21 +18,56 @@ def create_app():
     # CORS for frontend
     CORS(app, origins=[os.getenv("FRONTEND_URL", "http://localhost:3000")])
 
-    # Health check
+    # Health check (includes artifact cache size, transcript and video info
+    # hit/miss counts)
     @app.route("/api/health")
     def health():
-        return jsonify({"status": "ok", "version": "2.0.0"})
+        from api.sse import sse_stats
+        from services.cache import artifact_store, video_info_cache
+        from services.groq_client import groq_clients
+        from services.job_retention import job_retention
+        from services.rate_limiter import groq_concurrency, groq_rate_limiter
+        from services.ydl_pool import ydl_pool
+
+        return jsonify(
+            {
+                "status": "ok",
+                "version": "2.0.0",
+                "cache": artifact_store.stats(),
+                "video_info": video_info_cache.stats(),
+                "ydl_pool": ydl_pool.stats(),
+                "jobs": job_retention.stats(),
+                "sse": sse_stats(),
+                "groq": {
+                    **groq_rate_limiter.stats(),
+                    "concurrency": groq_concurrency.stats(),
+                    "clients": groq_clients.stats(),
+                },
+            }
+        )
 
     # Register blueprints
     from api.urls import urls_bp
     from api.config import config_bp
     from api.jobs import jobs_bp
     from api.sse import sse_bp
+    from api.downloads import downloads_bp
+    from utils.constants import APP_ROLE
+
+    app.register_blueprint(sse_bp, url_prefix="/api/sse")
+    if APP_ROLE == "sse":
+        # Streams only (see gunicorn.conf.py): no jobs run in this process
+        return app
 
     app.register_blueprint(urls_bp, url_prefix="/api/urls")
     app.register_blueprint(config_bp, url_prefix="/api/config")
     app.register_blueprint(jobs_bp, url_prefix="/api/jobs")
-    app.register_blueprint(sse_bp, url_prefix="/api/sse")
+    app.register_blueprint(downloads_bp, url_prefix="/api/downloads")
+
+    # Expire old jobs and spill transcripts past the memory budget
+    from services.job_retention import job_retention
+
+    job_retention.start()
 
     # TODO: Register additional blueprints
     # from api.tiktok import tiktok_bp
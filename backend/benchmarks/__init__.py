@@ -0,0 +1 @@
+"""Benchmarks for MultiFetch v2 backend."""
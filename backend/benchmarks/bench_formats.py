@@ -0,0 +1,177 @@
+"""
+Bytes downloaded and transcodes per item, "bestaudio/best" vs. negotiated.
+
+Runs yt-dlp's format selection (process_ie_result without downloading)
+over format lists shaped like what YouTube, TikTok, Instagram and a
+podcast feed return, once with the old "bestaudio/best" spec and once
+with select_audio_format. Bytes are estimated from the selected format's
+bitrate and the duration. Before, every download was transcoded; with
+negotiation, downloads that pass is_groq_ready are uploaded as is. With
+ffmpeg installed, the CPU time of one transcode (preprocess_audio of a
+generated 130 kbps opus file of the same duration) is measured too.
+
+Usage (from backend/):
+    python -m benchmarks.bench_formats
+    python -m benchmarks.bench_formats --duration 1800
+"""
+
+import argparse
+import os
+import resource
+import shutil
+import subprocess
+import tempfile
+import time
+
+import yt_dlp
+
+from services.audio import preprocess_audio
+from services.format_selector import is_groq_ready, select_audio_format
+
+
+def _audio(format_id, ext, acodec, abr, **extra):
+    return {
+        "format_id": format_id,
+        "ext": ext,
+        "acodec": acodec,
+        "vcodec": "none",
+        "abr": abr,
+        **extra,
+    }
+
+
+def _video(format_id, ext, tbr, height, acodec="mp4a.40.2", vcodec="avc1"):
+    return {
+        "format_id": format_id,
+        "ext": ext,
+        "acodec": acodec,
+        "vcodec": vcodec,
+        "tbr": tbr,
+        "height": height,
+    }
+
+
+# Format lists in the order extractors return them (yt-dlp sorts them)
+SCENARIOS = {
+    "youtube": [
+        _audio("599", "m4a", "mp4a.40.5", 30.8),
+        _audio("600", "webm", "opus", 32.0),
+        _audio("139", "m4a", "mp4a.40.5", 48.8),
+        _audio("249", "webm", "opus", 50.0),
+        _audio("250", "webm", "opus", 65.0),
+        _audio("140", "m4a", "mp4a.40.2", 129.5),
+        _audio("251", "webm", "opus", 130.0),
+        _video("18", "mp4", 500, 360),
+        _video("137", "mp4", 4300, 1080, acodec="none"),
+        _video("248", "webm", 2600, 1080, acodec="none", vcodec="vp9"),
+    ],
+    "youtube_dubbed": [
+        _audio("251-0", "webm", "opus", 130.0, language="es", language_preference=-1),
+        _audio("249-0", "webm", "opus", 50.0, language="es", language_preference=-1),
+        _audio("251-1", "webm", "opus", 130.0, language="en", language_preference=10),
+        _audio("249-1", "webm", "opus", 50.0, language="en", language_preference=10),
+        _video("18", "mp4", 500, 360),
+    ],
+    "tiktok": [
+        _video("download", "mp4", 1300, 1024),
+        _video("h264_540p", "mp4", 900, 540),
+        _video("bytevc1_720p", "mp4", 700, 720, vcodec="h265"),
+        _video("bytevc1_1080p", "mp4", 1500, 1080, vcodec="h265"),
+    ],
+    "instagram": [
+        _video("dash-360", "mp4", 600, 360),
+        _video("dash-720", "mp4", 1800, 720),
+    ],
+    "podcast": [
+        _audio("mp3-128", "mp3", "mp3", 128.0),
+        _audio("mp3-64", "mp3", "mp3", 64.0),
+    ],
+}
+
+
+def select(spec, formats: list[dict], duration: int) -> dict:
+    """The format yt-dlp picks for `spec` (merged into a processed info)."""
+    info = {
+        "id": "bench",
+        "title": "bench",
+        "duration": duration,
+        "extractor": "bench",
+        "extractor_key": "Bench",
+        "webpage_url": "https://example.com/bench",
+        "formats": [
+            {**f, "url": f"https://example.com/{f['format_id']}"} for f in formats
+        ],
+    }
+    with yt_dlp.YoutubeDL({"format": spec, "quiet": True, "no_warnings": True}) as ydl:
+        return ydl.process_ie_result(info, download=False)
+
+
+def size_of(info: dict, duration: int) -> int:
+    """Estimated download size in bytes from the selected bitrate(s)."""
+    kbps = info.get("tbr") or (info.get("abr") or 0) + (info.get("vbr") or 0)
+    return int(kbps * 1000 * duration / 8)
+
+
+def transcode_cpu(duration: int):
+    """CPU seconds ffmpeg spends on one transcode, or None without ffmpeg."""
+    if not shutil.which("ffmpeg"):
+        return None
+    workdir = tempfile.mkdtemp(prefix="bench_formats_")
+    try:
+        source = os.path.join(workdir, "source.webm")
+        subprocess.run(
+            ["ffmpeg", "-v", "error", "-y", "-f", "lavfi"]
+            + ["-i", f"anoisesrc=d={duration}:a=0.1", "-ac", "2", "-ar", "48000"]
+            + ["-c:a", "libopus", "-b:a", "130k", source],
+            check=True,
+        )
+        before = resource.getrusage(resource.RUSAGE_CHILDREN)
+        preprocess_audio(source)
+        after = resource.getrusage(resource.RUSAGE_CHILDREN)
+        return (after.ru_utime - before.ru_utime) + (after.ru_stime - before.ru_stime)
+    finally:
+        shutil.rmtree(workdir)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument(
+        "--duration", type=int, default=600, help="Seconds of audio per item"
+    )
+    args = parser.parse_args()
+
+    totals = {"old": [0, 0], "new": [0, 0]}  # bytes, transcodes
+    started = time.perf_counter()
+    for name, formats in SCENARIOS.items():
+        old = select("bestaudio/best", formats, args.duration)
+        new = select(select_audio_format, formats, args.duration)
+        old_bytes, new_bytes = size_of(old, args.duration), size_of(new, args.duration)
+        passthrough = is_groq_ready(new, new_bytes)
+        totals["old"][0] += old_bytes
+        totals["old"][1] += 1
+        totals["new"][0] += new_bytes
+        totals["new"][1] += not passthrough
+        print(
+            f"{name:15} old {old['format_id']:>13} {old_bytes / 1e6:6.1f}MB transcode"
+            f" | new {new['format_id']:>13} {new_bytes / 1e6:6.1f}MB "
+            f"{'passthrough' if passthrough else 'transcode'}"
+        )
+    print(f"selection time: {(time.perf_counter() - started) * 1000:.0f}ms")
+
+    items = len(SCENARIOS)
+    for label, (total_bytes, transcodes) in totals.items():
+        print(
+            f"{label}: {total_bytes / items / 1e6:.1f}MB downloaded per item, "
+            f"{transcodes}/{items} transcoded"
+        )
+
+    cpu = transcode_cpu(args.duration)
+    if cpu is None:
+        print("ffmpeg not found; transcode CPU not measured")
+    else:
+        for label, (_, transcodes) in totals.items():
+            print(f"{label}: {cpu * transcodes / items:.2f}s ffmpeg CPU per item")
+
+
+if __name__ == "__main__":
+    main()
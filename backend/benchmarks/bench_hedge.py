@@ -0,0 +1,165 @@
+"""
+Download latency with and without hedged strategy extraction.
+
+Runs downloads through the real sequential and hedged strategy loops
+(services/downloader.py) with yt-dlp replaced by a sleep-based stub. Each
+metadata extraction usually takes --extract-ms, but with --hang-ratio
+probability it hangs for --hang-ms and fails, the way a blocked client
+runs out its socket timeout and retries. Reports latency percentiles and
+extractions started per download (the extra load hedging adds).
+
+Usage (from backend/):
+    python -m benchmarks.bench_hedge --downloads 400
+    python -m benchmarks.bench_hedge --hang-ratio 0.2
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import random
+import shutil
+import statistics
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from services import downloader
+from services.downloader import OPTIMIZED_SUFFIX
+from services.strategy_scheduler import StrategyScheduler
+
+STRATEGIES = ["Android Client", "iOS Client", "TV Client", "Web Embedded"]
+
+
+def make_ydl(args: argparse.Namespace):
+    """A YoutubeDL stand-in that sleeps instead of extracting and downloading."""
+    rng = random.Random(args.seed)
+    lock = threading.Lock()
+
+    def draw() -> tuple[float, bool]:
+        with lock:
+            if rng.random() < args.hang_ratio:
+                return args.hang_ms / 1000, False
+            return rng.lognormvariate(0, 0.3) * args.extract_ms / 1000, True
+
+    class StubYoutubeDL:
+        def __init__(self, opts: dict):
+            self.opts = opts
+            # What YoutubeDLPool resets between checkouts
+            self.params = opts
+            self._pps = {"post_process": []}
+            self._progress_hooks = []
+
+        def _parse_outtmpl(self):
+            pass
+
+        def add_progress_hook(self, hook):
+            self._progress_hooks.append(hook)
+
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *exc):
+            self.close()
+
+        def close(self):
+            pass
+
+        def add_post_processor(self, pp):
+            pass
+
+        def extract_info(self, url, download=True, process=True):
+            seconds, ok = draw()
+            time.sleep(seconds)
+            if not ok:
+                return None
+            info = {"title": url}
+            return self.process_ie_result(info) if download else info
+
+        def process_ie_result(self, info, download=True):
+            time.sleep(args.download_ms / 1000)
+            path = os.path.join(self.opts["output_dir"], f"audio{OPTIMIZED_SUFFIX}.ogg")
+            with open(path, "wb") as f:
+                f.write(b"\0")
+            return info
+
+    return StubYoutubeDL
+
+
+def run(args: argparse.Namespace, hedge: bool) -> dict:
+    downloader.yt_dlp.YoutubeDL = make_ydl(args)
+    scheduler = StrategyScheduler(
+        hedge_default_delay=args.extract_ms * 3 / 1000,
+        hedge_min_delay=args.extract_ms / 1000,
+    )
+
+    def one(i: int) -> tuple[float, int]:
+        output_dir = tempfile.mkdtemp(prefix="bench_hedge_")
+        strategies = [(name, {"output_dir": output_dir}) for name in STRATEGIES]
+        target = downloader.DownloadTarget(f"video{i}", output_dir, "opus")
+        start = time.perf_counter()
+        try:
+            if hedge:
+                _, _, started, _ = downloader._download_hedged(
+                    target, strategies, scheduler=scheduler
+                )
+            else:
+                _, _, started, _ = downloader._download_sequential(
+                    target, strategies, scheduler=scheduler
+                )
+            return time.perf_counter() - start, started
+        finally:
+            shutil.rmtree(output_dir, ignore_errors=True)
+
+    # The strategy loops print every attempt
+    with (
+        contextlib.redirect_stdout(io.StringIO()),
+        ThreadPoolExecutor(max_workers=args.concurrency) as pool,
+    ):
+        results = list(pool.map(one, range(args.downloads)))
+    latencies = sorted(seconds for seconds, _ in results)
+
+    def pct(p: float) -> float:
+        return latencies[min(len(latencies) - 1, int(len(latencies) * p / 100))]
+
+    return {
+        "p50": pct(50),
+        "p95": pct(95),
+        "p99": pct(99),
+        "mean": statistics.mean(latencies),
+        "extractions": statistics.mean(started for _, started in results),
+        "hedge": scheduler.stats()["hedge"],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--downloads", type=int, default=400)
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--extract-ms", type=float, default=100)
+    parser.add_argument("--download-ms", type=float, default=200)
+    parser.add_argument("--hang-ratio", type=float, default=0.05)
+    parser.add_argument("--hang-ms", type=float, default=3000)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    print(
+        f"{args.downloads} downloads, {args.hang_ratio:.0%} of extractions hang"
+        f" {args.hang_ms:.0f}ms"
+    )
+    for label, hedge in (("sequential", False), ("hedged", True)):
+        result = run(args, hedge)
+        print(
+            f"  {label:<10} p50 {result['p50'] * 1000:6.0f}ms"
+            f"  p95 {result['p95'] * 1000:6.0f}ms"
+            f"  p99 {result['p99'] * 1000:6.0f}ms"
+            f"  mean {result['mean'] * 1000:6.0f}ms"
+            f"  extractions/download {result['extractions']:.2f}"
+        )
+        if hedge:
+            print(f"  hedge: {result['hedge']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+"""
+Lock contention microbenchmark for the in-memory job store.
+
+Many threads hammer item progress updates across a set of jobs (with an
+occasional list_jobs(), as the API does), comparing the per-job-lock
+MemoryJobStore against the previous design where one process-wide lock
+was held for every operation.
+
+Usage (from backend/):
+    python -m benchmarks.bench_job_locks --threads 64 --jobs 50
+"""
+
+import argparse
+import random
+import threading
+import time
+from typing import Callable, Optional, TypeVar
+
+from services.job_manager import Job, JobManager, JobStatus
+from services.job_store import MemoryJobStore
+
+T = TypeVar("T")
+
+
+class GlobalLockJobStore(MemoryJobStore):
+    """The previous behaviour: every operation holds the one store lock."""
+
+    def list(self, limit=50, cursor=None, statuses=None) -> list[Job]:
+        with self._lock:
+            jobs = sorted(
+                (job for job, _ in self._jobs.values()),
+                key=lambda j: j.created_at,
+                reverse=True,
+            )
+            return jobs[:limit]
+
+    def update(self, job_id: str, mutate: Callable[[Job], T]) -> Optional[T]:
+        with self._lock:
+            entry = self._jobs.get(job_id)
+            return mutate(entry[0]) if entry else None
+
+
+def run(store, args: argparse.Namespace) -> dict:
+    manager = JobManager(store)
+    urls = [f"https://www.tiktok.com/@user/video/{i:019d}" for i in range(args.items)]
+    job_ids = [manager.create_job(urls=urls).id for _ in range(args.jobs)]
+    latencies: list[float] = []
+    latencies_lock = threading.Lock()
+    barrier = threading.Barrier(args.threads + 1)
+
+    def worker(seed: int):
+        rng = random.Random(seed)
+        local = []
+        barrier.wait()
+        for n in range(args.updates):
+            job_id = rng.choice(job_ids)
+            index = rng.randrange(args.items)
+            start = time.perf_counter()
+            if args.list_every and n % args.list_every == 0:
+                manager.list_jobs(limit=50)
+            manager.update_item_status(
+                job_id, urls[index], JobStatus.RUNNING, progress=n % 100, index=index
+            )
+            local.append(time.perf_counter() - start)
+        with latencies_lock:
+            latencies.extend(local)
+
+    threads = [
+        threading.Thread(target=worker, args=(seed,)) for seed in range(args.threads)
+    ]
+    for t in threads:
+        t.start()
+    barrier.wait()
+    start = time.perf_counter()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    return {
+        "elapsed": elapsed,
+        "ops": len(latencies) / elapsed,
+        "p50_us": latencies[len(latencies) // 2] * 1e6,
+        "p99_us": latencies[int(len(latencies) * 0.99)] * 1e6,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--threads", type=int, default=64)
+    parser.add_argument("--jobs", type=int, default=50)
+    parser.add_argument("--items", type=int, default=100, help="items per job")
+    parser.add_argument("--updates", type=int, default=2000, help="per thread")
+    parser.add_argument(
+        "--list-every", type=int, default=100, help="list_jobs() every N updates"
+    )
+    args = parser.parse_args()
+
+    print(
+        f"{args.threads} threads x {args.updates} updates across {args.jobs} jobs "
+        f"of {args.items} items"
+    )
+    for name, store in (
+        ("global lock", GlobalLockJobStore()),
+        ("per-job locks", MemoryJobStore()),
+    ):
+        result = run(store, args)
+        print(
+            f"  {name:<14} {result['elapsed']:6.2f}s  {result['ops']:9.0f} updates/s"
+            f"  p50 {result['p50_us']:7.1f}us  p99 {result['p99_us']:8.1f}us"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+"""
+Throughput benchmark for the job execution engine.
+
+Runs a job through JobRunner with stubbed downloader, chunker and
+transcriber backends that sleep instead of doing network work, and reports
+items per minute alongside the fully serial baseline, plus the SSE events
+published for progress (--progress-tick 0 sends every change unbatched).
+
+Usage (from backend/):
+    python -m benchmarks.bench_job_runner --items 100
+    python -m benchmarks.bench_job_runner --items 100 --progress-tick 0
+"""
+
+import argparse
+import os
+import random
+import shutil
+import tempfile
+import time
+
+from api.sse import sse_stats
+from services.job_manager import JobStatus, job_manager
+from services.job_runner import JobRunner
+
+
+def make_backends(args: argparse.Namespace):
+    """Build sleep-based stand-ins for yt-dlp, chunking and Groq."""
+    rng = random.Random(args.seed)
+
+    def downloader(url, output_dir, cookies_path=None, progress_callback=None):
+        # Occasional slow download (the yt-dlp straggler case)
+        seconds = args.download_ms / 1000
+        if rng.random() < args.slow_ratio:
+            seconds *= args.slow_factor
+        # yt-dlp reports progress once per fragment
+        steps = args.progress_steps
+        for step in range(steps):
+            time.sleep(seconds / steps)
+            if progress_callback:
+                progress_callback((step + 1) / steps)
+        path = os.path.join(output_dir, "audio.mp3")
+        with open(path, "wb") as f:
+            f.write(b"\0")
+        return path, f"Title for {url}", {}
+
+    def chunker(audio_path):
+        # Yield chunks one at a time, like the streaming ffmpeg chunker
+        for i in range(args.chunks_per_item):
+            time.sleep(args.chunk_ms / 1000 / args.chunks_per_item)
+            yield {"path": audio_path, "index": i, "count": args.chunks_per_item}
+
+    def transcriber(audio_path, api_key, language):
+        time.sleep(args.transcribe_ms / 1000)
+        return "lorem ipsum " * 50
+
+    return downloader, chunker, transcriber
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--items", type=int, default=100)
+    parser.add_argument("--download-ms", type=float, default=300)
+    parser.add_argument("--chunk-ms", type=float, default=50)
+    parser.add_argument("--transcribe-ms", type=float, default=150)
+    parser.add_argument("--chunks-per-item", type=int, default=3)
+    parser.add_argument("--slow-ratio", type=float, default=0.05)
+    parser.add_argument("--slow-factor", type=float, default=10)
+    parser.add_argument("--download-workers", type=int, default=4)
+    parser.add_argument("--chunk-workers", type=int, default=2)
+    parser.add_argument("--transcribe-workers", type=int, default=8)
+    parser.add_argument("--progress-steps", type=int, default=100)
+    parser.add_argument("--progress-tick", type=float, default=0.25)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    downloader, chunker, transcriber = make_backends(args)
+    runner = JobRunner(
+        downloader=downloader,
+        chunker=chunker,
+        transcriber=transcriber,
+        store=None,
+        warmup=None,
+        download_workers=args.download_workers,
+        chunk_workers=args.chunk_workers,
+        transcribe_workers=args.transcribe_workers,
+        progress_tick=args.progress_tick,
+    )
+
+    urls = [f"https://www.youtube.com/watch?v={i:011d}" for i in range(args.items)]
+    job = job_manager.create_job(urls=urls)
+
+    tempfile.tempdir = tempfile.mkdtemp(prefix="bench_job_runner_")
+    published = sse_stats()["published"]
+    start = time.perf_counter()
+    runner.start_job(job.id, api_key="gsk_benchmark")
+    while runner.is_active(job.id):
+        time.sleep(0.01)
+    elapsed = time.perf_counter() - start
+    runner.shutdown()
+    events = sse_stats()["published"] - published
+    shutil.rmtree(tempfile.tempdir, ignore_errors=True)
+
+    job = job_manager.get_job(job.id)
+    serial = (
+        args.items
+        * (
+            args.download_ms * (1 + args.slow_ratio * (args.slow_factor - 1))
+            + args.chunk_ms
+            + args.transcribe_ms * args.chunks_per_item
+        )
+        / 1000
+    )
+
+    print(f"items:             {args.items}")
+    print(f"completed:         {job.completed_count} ({job.status.value})")
+    print(f"elapsed:           {elapsed:.2f}s")
+    print(f"throughput:        {args.items / elapsed * 60:.0f} items/min")
+    print(
+        f"serial estimate:   {serial:.2f}s ({args.items / serial * 60:.0f} items/min)"
+    )
+    print(f"speedup vs serial: {serial / elapsed:.1f}x")
+    print(f"sse events:        {events} ({events / elapsed:.1f}/s)")
+
+    if job.status != JobStatus.COMPLETED:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
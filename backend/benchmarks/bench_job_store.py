@@ -0,0 +1,154 @@
+"""
+Concurrency benchmark for the job store backends.
+
+Concurrent writers create jobs, then update every item of every job
+through running -> progress -> completed (each writer owns a share of the
+items, so writers race on the same jobs), then list recent jobs, both as
+full jobs and as summary pages (the API's default view). Reports
+operations per second for each phase and checks that no concurrent item
+update was lost.
+
+Usage (from backend/):
+    python -m benchmarks.bench_job_store --store memory:// --store sqlite:////tmp/bench_jobs.db
+    python -m benchmarks.bench_job_store --store sqlite:////tmp/bench_jobs.db --processes
+"""
+
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from services.job_manager import JobManager, JobStatus
+from services.job_store import create_job_store
+
+
+def _urls(items: int) -> list[str]:
+    return [f"https://www.youtube.com/watch?v={i:011d}" for i in range(items)]
+
+
+def _manager(store_url: str, store) -> JobManager:
+    return JobManager(store or create_job_store(store_url))
+
+
+def create_jobs(store_url: str, store, args: argparse.Namespace) -> list[str]:
+    manager = _manager(store_url, store)
+    urls = _urls(args.items)
+    return [manager.create_job(urls=urls).id for _ in range(args.jobs)]
+
+
+def update_items(store_url: str, store, job_ids: list[str], writer: int, args):
+    """Update this writer's share of every job's items (jobs are shared)."""
+    manager = _manager(store_url, store)
+    for url in _urls(args.items)[writer :: args.writers]:
+        for job_id in job_ids:
+            manager.update_item_status(job_id, url, JobStatus.RUNNING)
+            manager.update_item_status(job_id, url, JobStatus.RUNNING, progress=50)
+            manager.update_item_status(
+                job_id,
+                url,
+                JobStatus.COMPLETED,
+                progress=100,
+                transcript="lorem " * 200,
+            )
+
+
+def list_jobs(store_url: str, store, args: argparse.Namespace):
+    manager = _manager(store_url, store)
+    for _ in range(args.lists):
+        manager.list_jobs(limit=50)
+
+
+def list_summaries(store_url: str, store, args: argparse.Namespace):
+    manager = _manager(store_url, store)
+    for _ in range(args.lists):
+        manager.list_job_page(limit=50)
+
+
+def run_phase(pool, name: str, count: int, calls: list) -> list:
+    start = time.perf_counter()
+    results = [future.result() for future in [pool.submit(*call) for call in calls]]
+    elapsed = time.perf_counter() - start
+    print(f"  {name:<7} {count:7d} ops  {elapsed:6.2f}s  {count / elapsed:9.0f} ops/s")
+    return results
+
+
+def bench(store_url: str, args: argparse.Namespace) -> int:
+    """Run all phases against one store; returns jobs with lost updates."""
+    if store_url.startswith("sqlite:///"):
+        path = store_url[len("sqlite:///") :]
+        for suffix in ("", "-wal", "-shm"):
+            if os.path.exists(path + suffix):
+                os.unlink(path + suffix)
+
+    if args.processes:
+        # Each process opens its own connection to the shared store
+        pool, shared = ProcessPoolExecutor(max_workers=args.writers), None
+    else:
+        pool = ThreadPoolExecutor(max_workers=args.writers)
+        shared = create_job_store(store_url)
+
+    mode = "processes" if args.processes else "threads"
+    print(f"{store_url} ({args.writers} {mode})")
+    writers = range(args.writers)
+    with pool:
+        created = run_phase(
+            pool,
+            "create",
+            args.writers * args.jobs,
+            [(create_jobs, store_url, shared, args) for _ in writers],
+        )
+        job_ids = [job_id for ids in created for job_id in ids]
+        run_phase(
+            pool,
+            "update",
+            len(job_ids) * args.items * 3,
+            [(update_items, store_url, shared, job_ids, w, args) for w in writers],
+        )
+        run_phase(
+            pool,
+            "list",
+            args.writers * args.lists,
+            [(list_jobs, store_url, shared, args) for _ in writers],
+        )
+        run_phase(
+            pool,
+            "summary",
+            args.writers * args.lists,
+            [(list_summaries, store_url, shared, args) for _ in writers],
+        )
+
+    manager = _manager(store_url, shared)
+    lost = sum(
+        1 for job_id in job_ids if manager.get_job(job_id).completed_count != args.items
+    )
+    print(f"  jobs with lost item updates: {lost}/{len(job_ids)}")
+    return lost
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument(
+        "--store",
+        action="append",
+        help="JOB_STORE_URL to benchmark (repeatable; default memory + sqlite)",
+    )
+    parser.add_argument("--writers", type=int, default=8)
+    parser.add_argument("--jobs", type=int, default=20, help="jobs per writer")
+    parser.add_argument("--items", type=int, default=10, help="items per job")
+    parser.add_argument("--lists", type=int, default=50, help="list calls per writer")
+    parser.add_argument(
+        "--processes", action="store_true", help="run writers as processes"
+    )
+    args = parser.parse_args()
+
+    stores = args.store or ["memory://", "sqlite:////tmp/bench_job_store.db"]
+    if args.processes:
+        stores = [url for url in stores if url != "memory://"]
+
+    lost = sum(bench(url, args) for url in stores)
+    if lost:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,255 @@
+"""
+Load test for concurrent SSE job streams under gunicorn.
+
+Starts one gunicorn worker per worker class (with gunicorn.conf.py), opens
+many /api/sse/jobs/<id>/stream connections against a single job, and
+reports:
+
+- held: streams that received their initial update event
+- rss per stream: worker RSS growth divided by the streams held
+- health: latency of GET /api/health while the streams are open (a sync
+  worker can't answer until a stream closes)
+- fan-out: time for one published event to reach every held stream
+
+The app under test is the real one plus a /bench/publish/<job_id> route,
+so events can be published inside the worker process.
+
+Usage (from backend/):
+    python -m benchmarks.bench_sse_streams --streams 2000
+    python -m benchmarks.bench_sse_streams --worker-class gthread --threads 256
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import signal
+import socket
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Optional
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+
+def bench_app():
+    """The backend app with a route for publishing events (gunicorn factory)."""
+    from flask import jsonify
+
+    from api.sse import publish_job_update
+    from app import create_app
+
+    app = create_app()
+
+    @app.route("/bench/publish/<job_id>", methods=["POST"])
+    def publish(job_id: str):
+        publish_job_update(
+            job_id, "item_update", {"index": 0, "progress": 1, "status": "running"}
+        )
+        return jsonify({"published": True})
+
+    return app
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _rss_kb(pid: int) -> int:
+    for line in Path(f"/proc/{pid}/status").read_text().splitlines():
+        if line.startswith("VmRSS:"):
+            return int(line.split()[1])
+    return 0
+
+
+def _worker_pid(master_pid: int) -> Optional[int]:
+    children = Path(f"/proc/{master_pid}/task/{master_pid}/children")
+    pids = children.read_text().split() if children.exists() else []
+    return int(pids[0]) if pids else None
+
+
+async def _request(port: int, method: str, path: str, body: dict = None) -> dict:
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    payload = json.dumps(body).encode() if body is not None else b""
+    writer.write(
+        f"{method} {path} HTTP/1.1\r\nHost: localhost\r\nConnection: close\r\n"
+        f"Content-Type: application/json\r\nContent-Length: {len(payload)}\r\n\r\n".encode()
+        + payload
+    )
+    await writer.drain()
+    response = await reader.read()
+    writer.close()
+    return json.loads(response.split(b"\r\n\r\n", 1)[1] or b"{}")
+
+
+class Stream:
+    """One SSE connection, counting the events it has seen."""
+
+    def __init__(self, port: int, job_id: str):
+        self.port = port
+        self.job_id = job_id
+        self.updates = 0
+        self.items = 0
+        self.connected = asyncio.Event()
+        self.writer = None
+
+    async def run(self):
+        try:
+            reader, self.writer = await asyncio.open_connection("127.0.0.1", self.port)
+            self.writer.write(
+                f"GET /api/sse/jobs/{self.job_id}/stream HTTP/1.1\r\n"
+                "Host: localhost\r\nAccept: text/event-stream\r\n\r\n".encode()
+            )
+            await self.writer.drain()
+            while line := await reader.readline():
+                if line.startswith(b"event: update"):
+                    self.updates += 1
+                    self.connected.set()
+                elif line.startswith(b"event: item_update"):
+                    self.items += 1
+        except (ConnectionError, OSError):
+            pass
+
+    def close(self):
+        if self.writer:
+            self.writer.close()
+
+
+async def _load(port: int, pid: int, args: argparse.Namespace) -> dict:
+    job = await _request(
+        port, "POST", "/api/jobs", {"urls": ["https://youtu.be/dQw4w9WgXcQ"]}
+    )
+    await _request(port, "GET", "/api/health")
+    baseline = _rss_kb(pid)
+
+    streams = [Stream(port, job["id"]) for _ in range(args.streams)]
+    tasks = [asyncio.create_task(stream.run()) for stream in streams]
+    try:
+        await asyncio.wait_for(
+            asyncio.gather(*(stream.connected.wait() for stream in streams)),
+            timeout=args.connect_timeout,
+        )
+    except asyncio.TimeoutError:
+        pass
+    held = [stream for stream in streams if stream.updates]
+    await asyncio.sleep(0.5)
+    rss = _rss_kb(pid)
+
+    start = time.perf_counter()
+    try:
+        await asyncio.wait_for(_request(port, "GET", "/api/health"), timeout=5)
+        health_ms = (time.perf_counter() - start) * 1000
+    except asyncio.TimeoutError:
+        health_ms = None
+
+    fanout_ms = None
+    if health_ms is not None:
+        start = time.perf_counter()
+        await _request(port, "POST", f"/bench/publish/{job['id']}")
+        deadline = start + 10
+        while time.perf_counter() < deadline:
+            if all(stream.items for stream in held):
+                fanout_ms = (time.perf_counter() - start) * 1000
+                break
+            await asyncio.sleep(0.001)
+
+    for stream in streams:
+        stream.close()
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+    return {
+        "held": len(held),
+        "baseline_mb": baseline / 1024,
+        "rss_mb": rss / 1024,
+        "kb_per_stream": (rss - baseline) / len(held) if held else 0,
+        "health_ms": health_ms,
+        "fanout_ms": fanout_ms,
+    }
+
+
+def bench(worker_class: str, args: argparse.Namespace) -> dict:
+    port = _free_port()
+    env = {
+        **os.environ,
+        "JOB_STORE_URL": "memory://",
+        "GUNICORN_BIND": f"127.0.0.1:{port}",
+        "WEB_CONCURRENCY": "1",
+        "GUNICORN_WORKER_CLASS": worker_class,
+        "GUNICORN_WORKER_CONNECTIONS": str(args.streams + 100),
+        # gunicorn quietly turns sync into gthread when threads > 1
+        "GUNICORN_THREADS": str(args.threads if worker_class == "gthread" else 1),
+    }
+    server = subprocess.Popen(
+        [
+            sys.executable,
+            "-m",
+            "gunicorn",
+            "-c",
+            "gunicorn.conf.py",
+            "--backlog",
+            str(args.streams + 100),
+            "benchmarks.bench_sse_streams:bench_app()",
+        ],
+        cwd=BACKEND_DIR,
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        deadline = time.time() + 30
+        while time.time() < deadline:
+            try:
+                socket.create_connection(("127.0.0.1", port), timeout=1).close()
+                break
+            except OSError:
+                time.sleep(0.2)
+        pid = _worker_pid(server.pid)
+        return asyncio.run(_load(port, pid, args))
+    finally:
+        server.send_signal(signal.SIGTERM)
+        try:
+            server.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            server.kill()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument(
+        "--worker-class",
+        action="append",
+        help="gunicorn worker class (repeatable; default gevent, gthread, sync)",
+    )
+    parser.add_argument("--streams", type=int, default=1000)
+    parser.add_argument("--threads", type=int, default=64, help="gthread threads")
+    parser.add_argument("--connect-timeout", type=float, default=15)
+    args = parser.parse_args()
+
+    print(f"{args.streams} streams against one worker")
+    for worker_class in args.worker_class or ["gevent", "gthread", "sync"]:
+        result = bench(worker_class, args)
+        health = (
+            f"{result['health_ms']:7.1f}ms"
+            if result["health_ms"] is not None
+            else "blocked"
+        )
+        fanout = (
+            f"{result['fanout_ms']:7.1f}ms"
+            if result["fanout_ms"] is not None
+            else "n/a"
+        )
+        print(
+            f"  {worker_class:<8} held {result['held']:5d}"
+            f"  rss {result['baseline_mb']:6.1f} -> {result['rss_mb']:6.1f}MB"
+            f"  ({result['kb_per_stream']:5.1f}KB/stream)"
+            f"  health {health}  fan-out {fanout}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""
+Attempts per YouTube download with and without strategy scheduling.
+
+Simulates downloads against the real YouTube strategy list, where each
+strategy succeeds with a given probability (by default the Android client
+is blocked and iOS is flaky), and reports the attempts per download for
+the fixed built-in order and for StrategyScheduler's best-first order.
+No network access: outcomes are drawn at random.
+
+Usage (from backend/):
+    python -m benchmarks.bench_strategies --downloads 500
+    python -m benchmarks.bench_strategies --success "Android Client=0.9"
+"""
+
+import argparse
+import random
+import statistics
+
+from services.downloader import build_strategies
+from services.strategy_scheduler import StrategyScheduler
+
+DEFAULT_SUCCESS = {
+    "Android Client": 0.0,
+    "iOS Client": 0.3,
+    "TV Client": 0.95,
+    "Cookie Authentication": 0.9,
+    "Web Embedded": 0.6,
+}
+
+
+def simulate(strategies, success, downloads, scheduler, rng) -> list[int]:
+    """Run the fallback loop, returning the attempts each download took."""
+    counts = []
+    for _ in range(downloads):
+        order = scheduler.order(strategies) if scheduler else strategies
+        attempts = len(order)
+        for attempt, (name, _) in enumerate(order, start=1):
+            ok = rng.random() < success.get(name, 0.0)
+            if scheduler:
+                scheduler.record(name, ok, rng.uniform(2, 8))
+            if ok:
+                attempts = attempt
+                break
+        if scheduler:
+            scheduler.record_download(attempts)
+        counts.append(attempts)
+    return counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--downloads", type=int, default=500)
+    parser.add_argument(
+        "--success",
+        action="append",
+        default=[],
+        help='override a strategy success rate, e.g. "TV Client=0.1"',
+    )
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    success = dict(DEFAULT_SUCCESS)
+    for override in args.success:
+        name, rate = override.rsplit("=", 1)
+        success[name] = float(rate)
+    strategies = build_strategies("youtube", {}, "cookies.txt", {})
+
+    print(f"{args.downloads} downloads, success rates: {success}")
+    for label, scheduler in (("fixed", None), ("scheduled", StrategyScheduler())):
+        counts = simulate(
+            strategies, success, args.downloads, scheduler, random.Random(args.seed)
+        )
+        print(
+            f"  {label:<10} median {statistics.median(counts):.0f}"
+            f"  mean {statistics.mean(counts):.2f}  max {max(counts)} attempts"
+        )
+        if scheduler:
+            order = [strategy["name"] for strategy in scheduler.stats()["strategies"]]
+            print(f"  final order: {', '.join(order)}")
+
+
+if __name__ == "__main__":
+    main()
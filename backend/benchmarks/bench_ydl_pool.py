@@ -0,0 +1,123 @@
+"""
+Per-URL YoutubeDL setup overhead, fresh instances vs. the pool.
+
+For each simulated URL, builds a YoutubeDL the way the download loop does
+(a strategy's options plus a per-download output template and progress
+hook), then touches what a real extraction initializes first: the cookie
+jar (parsed from a generated cookies.txt), the YouTube extractor and the
+HTTP request director, and makes one request to a local keep-alive HTTP
+server. "fresh" constructs and closes an instance per URL, as before;
+"pooled" checks one out of YoutubeDLPool and releases it.
+
+Usage (from backend/):
+    python -m benchmarks.bench_ydl_pool --urls 200
+    python -m benchmarks.bench_ydl_pool --cookies 2000 --no-http
+"""
+
+import argparse
+import os
+import shutil
+import statistics
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import yt_dlp
+
+from services.downloader import build_strategies
+from services.ydl_pool import YoutubeDLPool
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive
+
+    def do_GET(self):
+        body = b"ok"
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def write_cookies(path: str, count: int):
+    """A Netscape cookies file with `count` youtube.com cookies."""
+    with open(path, "w") as f:
+        f.write("# Netscape HTTP Cookie File\n")
+        for i in range(count):
+            f.write(f".youtube.com\tTRUE\t/\tTRUE\t2147483647\tcookie{i}\tvalue{i}\n")
+
+
+def touch(ydl: yt_dlp.YoutubeDL, url: str = None):
+    """Initialize what an extraction would: cookies, extractor, HTTP."""
+    cookiejar = ydl.cookiejar
+    ydl.get_info_extractor("Youtube")
+    director = ydl._request_director
+    assert cookiejar is not None and director is not None
+    if url:
+        ydl.urlopen(url).read()
+
+
+def run(args: argparse.Namespace, opts: dict, url: str, pooled: bool) -> list[float]:
+    pool = YoutubeDLPool()
+    timings = []
+    for i in range(args.urls):
+        call_opts = {
+            **opts,
+            "outtmpl": os.path.join(
+                tempfile.gettempdir(), f"item{i}", "%(title)s.%(ext)s"
+            ),
+            "progress_hooks": [lambda d: None],
+        }
+        start = time.perf_counter()
+        if pooled:
+            ydl = pool.checkout(call_opts)
+            touch(ydl, url)
+            pool.release(ydl)
+        else:
+            with yt_dlp.YoutubeDL(call_opts) as ydl:
+                touch(ydl, url)
+        timings.append(time.perf_counter() - start)
+    pool.close_idle()
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--urls", type=int, default=200)
+    parser.add_argument(
+        "--cookies", type=int, default=200, help="cookies in cookies.txt"
+    )
+    parser.add_argument("--no-http", action="store_true", help="skip the HTTP request")
+    args = parser.parse_args()
+
+    work_dir = tempfile.mkdtemp(prefix="bench_ydl_pool_")
+    cookie_file = os.path.join(work_dir, "cookies.txt")
+    write_cookies(cookie_file, args.cookies)
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = None if args.no_http else f"http://127.0.0.1:{server.server_port}/"
+
+    base_opts = {"quiet": True, "no_warnings": True, "format": "bestaudio/best"}
+    name, opts = build_strategies("youtube", base_opts, cookie_file, {})[1]
+    print(f"{args.urls} URLs, {name} strategy, {args.cookies} cookies")
+    try:
+        results = {}
+        for label, pooled in (("fresh", False), ("pooled", True)):
+            timings = run(args, opts, url, pooled)
+            results[label] = statistics.median(timings)
+            print(
+                f"  {label:<7} median {results[label] * 1000:7.2f}ms"
+                f"  mean {statistics.mean(timings) * 1000:7.2f}ms per URL"
+            )
+        print(f"  speedup: {results['fresh'] / results['pooled']:.1f}x")
+    finally:
+        server.shutdown()
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+"""
+Gunicorn settings for MultiFetch v2.
+
+The app runs jobs inside its workers: JobRunner's thread pools extract
+with yt-dlp (CPU-bound), wait on ffmpeg subprocesses and Groq uploads,
+and write to SQLite with BEGIN IMMEDIATE (blocking for up to 30s on the
+lock). Those need real OS threads, so the app uses the gthread worker;
+under gevent they would all share one hub that each of those calls
+stalls. An open SSE stream pins one of a gthread worker's threads for
+the life of its job, hence the high thread count.
+
+For many concurrent streams, run a second gunicorn with APP_ROLE=sse: it
+serves only /api/sse (plus /api/health), never runs jobs, and defaults to
+the gevent worker, so one process holds thousands of idle streams. Its
+streams follow jobs through the job store (see api/sse.py), so
+JOB_STORE_URL must be a sqlite:// or redis:// store shared with the app,
+and the proxy in front routes /api/sse/ to it.
+
+Measure with: python -m benchmarks.bench_sse_streams
+"""
+
+import os
+
+APP_ROLE = os.getenv("APP_ROLE", "all")
+
+DEFAULT_WORKER_CLASS = "gthread"
+if APP_ROLE == "sse":
+    try:
+        import gevent  # noqa: F401
+
+        DEFAULT_WORKER_CLASS = "gevent"
+    except ImportError:
+        pass
+
+bind = os.getenv("GUNICORN_BIND", "0.0.0.0:5000")
+workers = int(os.getenv("WEB_CONCURRENCY", "4"))
+# Every worker has its own Groq rate limiter: split the quota between them
+os.environ.setdefault("GROQ_PROCESSES", str(workers))
+worker_class = os.getenv("GUNICORN_WORKER_CLASS", DEFAULT_WORKER_CLASS)
+# Simultaneous connections per gevent worker (open streams count)
+worker_connections = int(os.getenv("GUNICORN_WORKER_CONNECTIONS", "2000"))
+# Threads per gthread worker: job requests, plus one per open stream
+threads = int(os.getenv("GUNICORN_THREADS", "64"))
+# Streams send a keepalive every 30s; don't kill workers between them
+timeout = 120
@@ -0,0 +1,230 @@
+"""
+Audio processing service for MultiFetch v2.
+Ported from original app.py lines 957-968 and 1054-1185.
+"""
+
+import os
+import re
+import subprocess
+import tempfile
+from typing import Any, Iterator, Tuple
+
+from services.media_probe import probe_media
+from utils.constants import AUDIO_FORMAT, AUDIO_FORMATS, AUDIO_SAMPLE_RATE
+
+
+def sanitize_filename(filename: str) -> str:
+    """Sanitize a string to be used as a filename."""
+    # Remove invalid characters
+    filename = re.sub(r'[<>:"/\\|?*]', "", filename)
+    # Replace multiple spaces with single space
+    filename = re.sub(r"\s+", " ", filename)
+    # Remove leading/trailing spaces and dots
+    filename = filename.strip(". ")
+    return filename[:200] or "untitled"
+
+
+def preprocess_audio(input_path: str, audio_format: str = AUDIO_FORMAT) -> str:
+    """
+    Re-encode a download to 16 kHz mono in a Whisper-friendly format.
+
+    Args:
+        input_path: Downloaded media file (audio or video)
+        audio_format: Key of AUDIO_FORMATS ("opus", "flac" or "mp3")
+
+    Returns:
+        Path of the new "<name>_groq_optimized.<ext>" file next to the input
+
+    Raises:
+        ValueError: If audio_format is unknown
+        RuntimeError: If ffmpeg fails
+    """
+    if audio_format not in AUDIO_FORMATS:
+        raise ValueError(f"Unknown audio format: {audio_format}")
+
+    ext, codec_args = AUDIO_FORMATS[audio_format]
+    output_path = f"{os.path.splitext(input_path)[0]}_groq_optimized.{ext}"
+    result = subprocess.run(
+        [
+            "ffmpeg",
+            "-v",
+            "error",
+            "-y",
+            "-i",
+            input_path,
+            "-map",
+            "0:a:0",
+            "-ar",
+            str(AUDIO_SAMPLE_RATE),
+            "-ac",
+            "1",
+            *codec_args,
+            output_path,
+        ],
+        capture_output=True,
+        text=True,
+        check=False,
+    )
+    if result.returncode != 0:
+        if os.path.exists(output_path):
+            os.unlink(output_path)
+        raise RuntimeError(f"ffmpeg preprocessing failed: {result.stderr[-200:]}")
+    return output_path
+
+
+def chunk_audio(
+    audio_path: str, max_chunk_size_mb: int = 20, dev_tier: bool = False
+) -> Iterator[dict[str, Any]]:
+    """
+    Split audio into chunks that fit within Groq's size limits.
+
+    The duration comes from the media probe (container headers, no decode)
+    and each chunk is cut by its own ffmpeg call that seeks into the source
+    and stream-copies the window, so memory use does not grow with the
+    length of the input. Chunks are yielded as soon as they are written,
+    letting the first ones be transcribed while the rest are still being cut.
+
+    Args:
+        audio_path: Path to the audio file to split
+        max_chunk_size_mb: Target upper bound for each chunk
+        dev_tier: Whether the API key is on Groq's dev tier
+
+    Yields:
+        Chunk dicts with path, start_ms, end_ms, index, count, duration_ms
+        and size_mb. Files under the size limit (or that cannot be probed)
+        are yielded as a single chunk pointing at the original file.
+
+    Raises:
+        RuntimeError: If ffmpeg fails to cut a chunk
+    """
+    file_size_mb = os.path.getsize(audio_path) / (1024 * 1024)
+    if file_size_mb <= max_chunk_size_mb:
+        yield _whole_file_chunk(audio_path, file_size_mb)
+        return
+
+    try:
+        info = probe_media(audio_path)
+    except (OSError, ValueError) as e:
+        print(f"Error probing {audio_path} for chunking: {e}")
+        yield _whole_file_chunk(audio_path, file_size_mb)
+        return
+
+    # Average bitrate when the probe didn't report one
+    bit_rate = info.bit_rate or file_size_mb * 1024 * 1024 * 8 / info.duration
+    windows = _plan_chunks(info.duration_ms, bit_rate, max_chunk_size_mb, dev_tier)
+    print(
+        f"File size: {file_size_mb:.1f}MB, chunking into {len(windows)} "
+        f"~{windows[0][1] / 60000:.1f} minute segments"
+    )
+
+    ext = os.path.splitext(audio_path)[1] or ".mp3"
+    for index, (start_ms, end_ms) in enumerate(windows):
+        fd, chunk_path = tempfile.mkstemp(suffix=ext, prefix=f"chunk_{index}_")
+        os.close(fd)
+        chunk_path = _cut_chunk(audio_path, chunk_path, start_ms, end_ms, dev_tier)
+
+        yield {
+            "path": chunk_path,
+            "start_ms": start_ms,
+            "end_ms": end_ms,
+            "index": index,
+            "count": len(windows),
+            "duration_ms": end_ms - start_ms,
+            "size_mb": os.path.getsize(chunk_path) / (1024 * 1024),
+        }
+
+
+def _plan_chunks(
+    total_length_ms: int, bit_rate: float, max_chunk_size_mb: int, dev_tier: bool
+) -> list[Tuple[int, int]]:
+    """
+    Compute (start_ms, end_ms) windows for chunk_audio.
+
+    Window lengths come from the file's bitrate (bits per second), so a
+    16 kHz mono opus download gets as few chunks as the time caps allow
+    rather than being sized like a 192 kbps MP3.
+    """
+    mb_per_ms = bit_rate / 8 / (1024 * 1024) / 1000
+    if dev_tier:
+        # Target 20MB chunks, at most 15 minutes each
+        chunk_duration_ms = min(int(20.0 / mb_per_ms), 900000)
+    else:
+        # Use 50% of max size for safety margin, at most 10 minutes each
+        target_chunk_size_mb = max_chunk_size_mb * 0.5
+        chunk_duration_ms = min(int(target_chunk_size_mb / mb_per_ms), 600000)
+
+    # Ensure minimum chunk duration of 30 seconds
+    chunk_duration_ms = max(chunk_duration_ms, 30000)
+    overlap_ms = 500
+
+    windows = []
+    start_ms = 0
+    while start_ms < total_length_ms:
+        end_ms = min(start_ms + chunk_duration_ms, total_length_ms)
+        windows.append((start_ms, end_ms))
+        if end_ms >= total_length_ms:
+            break
+
+        # Overlap all chunks except the final one
+        if end_ms + chunk_duration_ms >= total_length_ms:
+            start_ms = end_ms
+        else:
+            start_ms = end_ms - overlap_ms
+    return windows
+
+
+def _cut_chunk(
+    audio_path: str, chunk_path: str, start_ms: int, end_ms: int, dev_tier: bool
+) -> str:
+    """
+    Write [start_ms, end_ms) of audio_path to chunk_path with ffmpeg.
+
+    Stream-copies the audio when the container allows it and falls back to
+    re-encoding MP3 at the tier's bitrate otherwise.
+
+    Returns:
+        Path of the written chunk (an .mp3 sibling of chunk_path if the
+        fallback re-encode was used)
+    """
+    window = [
+        "-ss",
+        f"{start_ms / 1000:.3f}",
+        "-t",
+        f"{(end_ms - start_ms) / 1000:.3f}",
+    ]
+    base = ["ffmpeg", "-v", "error", "-y", *window, "-i", audio_path, "-map", "0:a:0"]
+    bitrate = "192k" if dev_tier else "64k"
+    mp3_path = os.path.splitext(chunk_path)[0] + ".mp3"
+    attempts = [
+        (chunk_path, ["-c:a", "copy"]),
+        (mp3_path, ["-c:a", "libmp3lame", "-b:a", bitrate]),
+    ]
+
+    error = ""
+    for path, codec_args in attempts:
+        result = subprocess.run(
+            [*base, *codec_args, path], capture_output=True, text=True, check=False
+        )
+        if result.returncode == 0 and os.path.getsize(path) > 0:
+            if path != chunk_path:
+                os.unlink(chunk_path)
+            return path
+        error = result.stderr.strip()[-200:]
+
+    for path in {chunk_path, mp3_path}:
+        if os.path.exists(path):
+            os.unlink(path)
+    raise RuntimeError(f"ffmpeg could not cut {start_ms}-{end_ms}ms: {error}")
+
+
+def _whole_file_chunk(audio_path: str, size_mb: float) -> dict[str, Any]:
+    """Describe an unsplit file as a single chunk."""
+    return {
+        "path": audio_path,
+        "start_ms": 0,
+        "end_ms": 0,
+        "index": 0,
+        "count": 1,
+        "duration_ms": 0,
+        "size_mb": size_mb,
+    }
@@ -0,0 +1,532 @@
+"""
+Content-addressed artifact cache for MultiFetch v2.
+Replaces the pickle cache from original app.py lines 401-423.
+
+Layout under the cache root:
+    blobs/<sha[:2]>/<sha><ext>   audio files, keyed by SHA-256 of their bytes
+    transcripts/<key>.txt        transcripts, keyed by (audio hash, model,
+                                 language, prompt)
+    index.json                   URL / video_id -> audio hash, sizes and
+                                 last-access times for LRU eviction
+
+All files are written to a temp file and renamed into place, and index
+updates happen under a file lock so several worker processes can share
+one cache directory. Cache hits only bump last-access times in memory;
+those are written with the next index update, or by the next hit once
+CACHE_TOUCH_FLUSH_SECONDS have passed, so reads don't rewrite the index.
+
+VideoInfoCache is a separate, in-memory cache of extracted yt-dlp
+metadata, so a download can start from info that was already fetched.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import copy
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Iterator, Optional, Tuple
+
+from utils.constants import (
+    CACHE_DIR,
+    CACHE_MAX_BYTES,
+    CACHE_TOUCH_FLUSH_SECONDS,
+    VIDEO_INFO_CACHE_SIZE,
+    VIDEO_INFO_TTL_SECONDS,
+)
+
+try:
+    import fcntl
+except ImportError:  # Windows: fall back to in-process locking only
+    fcntl = None
+
+# yt-dlp info fields worth keeping (the full info dict is huge)
+INFO_FIELDS = ("id", "title", "duration", "uploader", "webpage_url", "extractor")
+
+
+def hash_file(path: str, chunk_size: int = 1 << 20) -> str:
+    """SHA-256 of a file's bytes, read in chunks."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        while chunk := f.read(chunk_size):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def video_key(platform: Optional[str], video_id: Optional[str]) -> Optional[str]:
+    """Index key for a platform video ID, e.g. "youtube:dQw4w9WgXcQ"."""
+    if platform and video_id:
+        return f"{platform}:{video_id}"
+    return None
+
+
+def _atomic_write(path: Path, data: bytes):
+    """Write bytes to path via a temp file + rename."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=".tmp_")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+
+
+def _atomic_copy(src: str, dest: Path):
+    """Copy a file to dest via a temp file + rename."""
+    dest.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=dest.parent, prefix=".tmp_")
+    os.close(fd)
+    try:
+        shutil.copyfile(src, tmp_path)
+        os.replace(tmp_path, dest)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+
+
+@contextmanager
+def _file_lock(path: Path) -> Iterator[None]:
+    """Exclusive cross-process lock (no-op where fcntl is unavailable)."""
+    if fcntl is None:
+        yield
+        return
+    with open(path, "a") as f:
+        fcntl.flock(f, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(f, fcntl.LOCK_UN)
+
+
+class ArtifactStore:
+    """
+    Size-bounded, content-addressed store for audio and transcripts.
+
+    Sources (URLs and platform video IDs) map to an audio hash, so a repeat
+    request can skip the download (blob present) and the transcription
+    (transcript present for that hash) across jobs and restarts.
+    """
+
+    def __init__(self, root: Path = CACHE_DIR, max_bytes: int = CACHE_MAX_BYTES):
+        self.root = Path(root)
+        self.max_bytes = max_bytes
+        self.root.mkdir(parents=True, exist_ok=True)
+        self._index_path = self.root / "index.json"
+        self._lock_path = self.root / "index.lock"
+        self._lock = threading.RLock()
+        self._index_mtime = None
+        self._index = self._empty_index()
+        self._verified: set[str] = set()  # blob hashes checked this process
+        # (section, key) -> last access not yet written to the index
+        self._touches: dict[Tuple[str, str], float] = {}
+        self._touches_flushed = time.monotonic()
+        # Transcript lookup counters for this process (see find_transcript)
+        self._counters = {"source_hits": 0, "audio_hits": 0, "misses": 0}
+
+    # -- Sources ------------------------------------------------------------
+
+    def lookup(
+        self, url: Optional[str] = None, video: Optional[str] = None
+    ) -> Optional[dict]:
+        """
+        Find the cached source entry for a URL or video key.
+
+        Returns:
+            dict with "audio" (hash), "title" and "info", or None
+        """
+        with self._lock:
+            self._refresh()
+            for key in (f"video:{video}" if video else None, f"url:{url}"):
+                if key and key in self._index["sources"]:
+                    return dict(self._index["sources"][key])
+        return None
+
+    def get_audio(
+        self, url: Optional[str] = None, video: Optional[str] = None
+    ) -> Optional[dict]:
+        """
+        Get a cached audio blob for a URL or video key.
+
+        The returned path points into the store and must not be modified or
+        deleted by the caller.
+
+        Returns:
+            dict with "path", "audio", "title" and "info", or None
+        """
+        entry = self.lookup(url, video)
+        if not entry:
+            return None
+
+        audio_hash = entry["audio"]
+        path = self._verified_blob(audio_hash)
+        if not path:
+            return None
+
+        self._touch("blobs", audio_hash)
+        return {**entry, "path": str(path)}
+
+    def put_audio(
+        self,
+        path: str,
+        url: Optional[str] = None,
+        video: Optional[str] = None,
+        title: Optional[str] = None,
+        info: Optional[dict] = None,
+    ) -> str:
+        """
+        Add an audio file to the store and map the URL / video key to it.
+
+        Returns:
+            The audio file's SHA-256 hash
+        """
+        audio_hash = hash_file(path)
+        ext = Path(path).suffix
+        blob_path = self._blob_path(audio_hash, ext)
+        if not blob_path.exists():
+            _atomic_copy(path, blob_path)
+
+        entry = {
+            "audio": audio_hash,
+            "title": title,
+            "info": {k: (info or {}).get(k) for k in INFO_FIELDS},
+        }
+        with self._transaction() as index:
+            index["blobs"][audio_hash] = {
+                "ext": ext,
+                "size": blob_path.stat().st_size,
+                "last_access": time.time(),
+            }
+            if url:
+                index["sources"][f"url:{url}"] = entry
+            if video:
+                index["sources"][f"video:{video}"] = entry
+        self._verified.add(audio_hash)
+        return audio_hash
+
+    # -- Transcripts --------------------------------------------------------
+
+    @staticmethod
+    def transcript_key(audio_hash: str, model: str, language: str, prompt: str) -> str:
+        """Cache key for a transcript of specific audio with specific settings."""
+        raw = json.dumps([audio_hash, model, language, prompt])
+        return hashlib.sha256(raw.encode()).hexdigest()
+
+    def get_transcript(
+        self, audio_hash: str, model: str, language: str, prompt: str
+    ) -> Optional[str]:
+        """Get a cached transcript, or None if missing or corrupt."""
+        key = self.transcript_key(audio_hash, model, language, prompt)
+        with self._lock:
+            self._refresh()
+            meta = self._index["transcripts"].get(key)
+        if not meta:
+            return None
+
+        try:
+            data = (self.root / "transcripts" / f"{key}.txt").read_bytes()
+        except OSError:
+            return None
+        if hashlib.sha256(data).hexdigest() != meta["sha256"]:
+            print(f"Cache: transcript {key[:12]} failed integrity check")
+            self._discard("transcripts", key)
+            return None
+
+        self._touch("transcripts", key)
+        return data.decode("utf-8")
+
+    def find_transcript(
+        self,
+        model: str,
+        language: str,
+        prompt: str,
+        url: Optional[str] = None,
+        video: Optional[str] = None,
+        audio_path: Optional[str] = None,
+    ) -> Tuple[Optional[str], Optional[str]]:
+        """
+        Find a transcript by source first, then by audio content.
+
+        A URL / video key hit needs no access to the audio at all, so a
+        repeat request for the same video skips hashing, chunking and Groq.
+        Only on a source miss is audio_path hashed and looked up by content.
+        Hits are counted in stats(); misses only when audio_path is given,
+        since a source-only probe is retried by content after download.
+
+        Returns:
+            (transcript or None, audio hash or None). The hash is set
+            whenever audio_path was hashed, so callers can pass it to
+            put_transcript after transcribing.
+        """
+        entry = self.lookup(url, video) if url or video else None
+        if entry:
+            transcript = self.get_transcript(entry["audio"], model, language, prompt)
+            if transcript:
+                self._count("source_hits")
+                return transcript, None
+
+        audio_hash = hash_file(audio_path) if audio_path else None
+        if audio_hash:
+            transcript = self.get_transcript(audio_hash, model, language, prompt)
+            if transcript:
+                self._count("audio_hits")
+                return transcript, audio_hash
+
+        if audio_path:
+            self._count("misses")
+        return None, audio_hash
+
+    def put_transcript(
+        self, audio_hash: str, model: str, language: str, prompt: str, text: str
+    ):
+        """Store a transcript for audio transcribed with the given settings."""
+        key = self.transcript_key(audio_hash, model, language, prompt)
+        data = text.encode("utf-8")
+        _atomic_write(self.root / "transcripts" / f"{key}.txt", data)
+        with self._transaction() as index:
+            index["transcripts"][key] = {
+                "audio": audio_hash,
+                "size": len(data),
+                "sha256": hashlib.sha256(data).hexdigest(),
+                "last_access": time.time(),
+            }
+
+    # -- Maintenance --------------------------------------------------------
+
+    def stats(self) -> dict[str, Any]:
+        """Entry counts and total size of the store."""
+        with self._lock:
+            self._refresh()
+            blobs = self._index["blobs"]
+            transcripts = self._index["transcripts"]
+            return {
+                "sources": len(self._index["sources"]),
+                "audio_count": len(blobs),
+                "transcript_count": len(transcripts),
+                "size_bytes": sum(m["size"] for m in blobs.values())
+                + sum(m["size"] for m in transcripts.values()),
+                "max_bytes": self.max_bytes,
+                "transcript_lookups": dict(self._counters),
+            }
+
+    def clear(self):
+        """Remove every artifact and index entry."""
+        with self._transaction() as index:
+            for audio_hash, meta in list(index["blobs"].items()):
+                self._delete_file(self._blob_path(audio_hash, meta["ext"]))
+            for key in list(index["transcripts"]):
+                self._delete_file(self.root / "transcripts" / f"{key}.txt")
+            index.update(self._empty_index())
+        self._verified.clear()
+
+    # -- Internals ----------------------------------------------------------
+
+    @staticmethod
+    def _empty_index() -> dict:
+        return {"sources": {}, "blobs": {}, "transcripts": {}}
+
+    def _count(self, counter: str):
+        with self._lock:
+            self._counters[counter] += 1
+
+    def _blob_path(self, audio_hash: str, ext: str) -> Path:
+        return self.root / "blobs" / audio_hash[:2] / f"{audio_hash}{ext}"
+
+    def _verified_blob(self, audio_hash: str) -> Optional[Path]:
+        """Path of a blob whose bytes still match its hash, else None."""
+        with self._lock:
+            meta = self._index["blobs"].get(audio_hash)
+        if not meta:
+            return None
+
+        path = self._blob_path(audio_hash, meta["ext"])
+        try:
+            if path.stat().st_size != meta["size"]:
+                raise ValueError("size mismatch")
+            if audio_hash not in self._verified:
+                if hash_file(str(path)) != audio_hash:
+                    raise ValueError("hash mismatch")
+                self._verified.add(audio_hash)
+        except (OSError, ValueError) as e:
+            print(f"Cache: audio {audio_hash[:12]} failed integrity check ({e})")
+            self._discard("blobs", audio_hash)
+            return None
+        return path
+
+    def _refresh(self):
+        """Reload the index if another process has rewritten it."""
+        try:
+            mtime = self._index_path.stat().st_mtime_ns
+        except FileNotFoundError:
+            return
+        if mtime != self._index_mtime:
+            self._index = self._read_index()
+            self._index_mtime = mtime
+
+    def _read_index(self) -> dict:
+        try:
+            with open(self._index_path, encoding="utf-8") as f:
+                index = json.load(f)
+        except (OSError, ValueError):
+            return self._empty_index()
+        for section, value in self._empty_index().items():
+            index.setdefault(section, value)
+        return index
+
+    @contextmanager
+    def _transaction(self) -> Iterator[dict]:
+        """Read-modify-write the index under both locks, then evict."""
+        with self._lock, _file_lock(self._lock_path):
+            self._index = self._read_index()
+            self._apply_touches()
+            yield self._index
+            self._evict()
+            _atomic_write(self._index_path, json.dumps(self._index).encode("utf-8"))
+            self._index_mtime = self._index_path.stat().st_mtime_ns
+
+    def _touch(self, section: str, key: str):
+        """Record an access; written to the index at most every flush interval."""
+        with self._lock:
+            self._touches[(section, key)] = time.time()
+            if time.monotonic() - self._touches_flushed < CACHE_TOUCH_FLUSH_SECONDS:
+                return
+        with self._transaction():
+            pass
+
+    def _apply_touches(self):
+        """Copy pending last-access times into the index just read."""
+        for (section, key), accessed in self._touches.items():
+            meta = self._index[section].get(key)
+            if meta:
+                meta["last_access"] = max(meta["last_access"], accessed)
+        self._touches.clear()
+        self._touches_flushed = time.monotonic()
+
+    def _discard(self, section: str, key: str):
+        with self._transaction() as index:
+            meta = index[section].pop(key, None)
+            if meta:
+                self._delete_artifact(section, key, meta)
+
+    def _evict(self):
+        """Drop least recently used artifacts until under max_bytes."""
+        entries = [
+            (meta["last_access"], section, key, meta)
+            for section in ("blobs", "transcripts")
+            for key, meta in self._index[section].items()
+        ]
+        total = sum(entry[3]["size"] for entry in entries)
+        if total <= self.max_bytes:
+            return
+
+        for _, section, key, meta in sorted(entries, key=lambda e: e[0]):
+            if total <= self.max_bytes:
+                break
+            del self._index[section][key]
+            self._delete_artifact(section, key, meta)
+            total -= meta["size"]
+
+        # Forget sources whose audio has neither a blob nor a transcript left
+        live = set(self._index["blobs"])
+        live.update(meta["audio"] for meta in self._index["transcripts"].values())
+        self._index["sources"] = {
+            key: entry
+            for key, entry in self._index["sources"].items()
+            if entry["audio"] in live
+        }
+
+    def _delete_artifact(self, section: str, key: str, meta: dict):
+        if section == "blobs":
+            self._delete_file(self._blob_path(key, meta["ext"]))
+            self._verified.discard(key)
+        else:
+            self._delete_file(self.root / "transcripts" / f"{key}.txt")
+
+    @staticmethod
+    def _delete_file(path: Path):
+        try:
+            path.unlink()
+        except FileNotFoundError:
+            pass
+
+
+class VideoInfoCache:
+    """
+    Per-process LRU of yt-dlp info dicts (extract_info(process=False)) by
+    video key, each with the name of the strategy that extracted it.
+
+    Entries expire after `ttl` seconds, since the format URLs in them do.
+    Dicts are copied in and out because yt-dlp mutates them while
+    processing, and the bulky fields a download doesn't need are dropped.
+    """
+
+    # Not needed to download audio, and often most of the dict
+    DROPPED_FIELDS = ("automatic_captions", "subtitles", "thumbnails", "heatmap")
+
+    def __init__(
+        self,
+        ttl: float = VIDEO_INFO_TTL_SECONDS,
+        max_entries: int = VIDEO_INFO_CACHE_SIZE,
+    ):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        # video key -> (stored at, info, strategy)
+        self._entries: OrderedDict[str, Tuple[float, dict, Optional[str]]] = (
+            OrderedDict()
+        )
+        self._lock = threading.Lock()
+        self._counters = {"hits": 0, "misses": 0}
+
+    def get(self, video: Optional[str]) -> Optional[Tuple[dict, Optional[str]]]:
+        """(info, strategy) for a video key, or None if missing or expired."""
+        if not video:
+            return None
+        with self._lock:
+            entry = self._entries.get(video)
+            if entry and time.monotonic() - entry[0] > self.ttl:
+                del self._entries[video]
+                entry = None
+            if entry is None:
+                self._counters["misses"] += 1
+                return None
+            self._counters["hits"] += 1
+            self._entries.move_to_end(video)
+            info = entry[1]
+        return copy.deepcopy(info), entry[2]
+
+    def put(self, video: Optional[str], info: dict, strategy: Optional[str] = None):
+        """Store freshly extracted info for a video key."""
+        if not video:
+            return
+        info = copy.deepcopy(
+            {k: v for k, v in info.items() if k not in self.DROPPED_FIELDS}
+        )
+        with self._lock:
+            self._entries[video] = (time.monotonic(), info, strategy)
+            self._entries.move_to_end(video)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def discard(self, video: Optional[str]):
+        """Forget a video's info (e.g. its format URLs stopped working)."""
+        with self._lock:
+            self._entries.pop(video, None)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"entries": len(self._entries), **self._counters}
+
+
+# Global artifact store instance
+artifact_store = ArtifactStore()
+
+# Global video info cache instance
+video_info_cache = VideoInfoCache()
@@ -0,0 +1,717 @@
+"""
+Download engine for MultiFetch v2.
+Ported from original app.py lines 425-791 and 925-955.
+"""
+
+import os
+import time
+from dataclasses import dataclass
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Callable, Optional, Tuple
+
+import yt_dlp
+from yt_dlp.postprocessor.common import PostProcessor
+
+from services.audio import preprocess_audio, sanitize_filename
+from services.cache import artifact_store, video_info_cache, video_key
+from services.format_selector import format_stats, is_groq_ready, select_audio_format
+from services.platform_detector import detect_platform
+from services.strategy_scheduler import StrategyScheduler, strategy_scheduler
+from services.ydl_pool import ydl_pool
+from utils.constants import (
+    AUDIO_FORMAT,
+    AUDIO_PASSTHROUGH,
+    DOWNLOAD_HEDGE,
+    DOWNLOAD_WORKERS,
+    HEDGE_MAX_PARALLEL,
+)
+
+ProgressCallback = Callable[[float], None]
+
+# Marker in the file name of preprocessed audio (see preprocess_audio)
+OPTIMIZED_SUFFIX = "_groq_optimized"
+
+# Metadata extractions of hedged downloads (abandoned ones run to their
+# socket timeout here, off the download workers)
+_extract_pool = ThreadPoolExecutor(
+    max_workers=DOWNLOAD_WORKERS * HEDGE_MAX_PARALLEL * 2,
+    thread_name_prefix="extract",
+)
+
+
+class GroqAudioPP(PostProcessor):
+    """
+    yt-dlp postprocessor that turns the download into 16 kHz mono audio.
+
+    Replaces FFmpegExtractAudio: extraction and resampling happen in one
+    ffmpeg pass, straight to the configured Whisper-friendly format.
+    Downloads Groq can take as they are (see is_groq_ready) are only
+    renamed, unless passthrough is off.
+    """
+
+    def __init__(
+        self,
+        downloader=None,
+        audio_format: str = AUDIO_FORMAT,
+        passthrough: bool = AUDIO_PASSTHROUGH,
+    ):
+        super().__init__(downloader)
+        self.audio_format = audio_format
+        self.passthrough = passthrough
+
+    def run(self, info: dict):
+        source = info["filepath"]
+        size = os.path.getsize(source)
+        if self.passthrough and is_groq_ready(info, size):
+            base, ext = os.path.splitext(source)
+            output_path = f"{base}{OPTIMIZED_SUFFIX}{ext}"
+            os.replace(source, output_path)
+            format_stats.record_output(size, size, 0.0, passthrough=True)
+            deleted = []
+        else:
+            started = time.monotonic()
+            output_path = preprocess_audio(source, self.audio_format)
+            format_stats.record_output(
+                size,
+                os.path.getsize(output_path),
+                time.monotonic() - started,
+                passthrough=False,
+            )
+            deleted = [source]
+        info["filepath"] = output_path
+        info["ext"] = os.path.splitext(output_path)[1].lstrip(".")
+        # Returned paths are deleted by yt-dlp once the chain finishes
+        return deleted, info
+
+
+INSTAGRAM_HEADERS = {
+    "User-Agent": (
+        "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+        "(KHTML, like Gecko) Chrome/95.0.4638.54 Safari/537.36"
+    ),
+    "Accept": "*/*",
+    "Accept-Language": "en-us,en;q=0.5",
+    "Accept-Encoding": "gzip, deflate",
+    "X-Ig-App-Id": "936619743392459",
+    "X-Asbd-Id": "198387",
+    "X-Ig-Www-Claim": "0",
+    "Origin": "https://www.instagram.com",
+    "Referer": "https://www.instagram.com/",
+}
+
+
+def summarize_info(info: dict) -> dict[str, Any]:
+    """Title, duration and live status fields of a yt-dlp info dict."""
+    return {
+        "title": info.get("title", "Unknown"),
+        "duration": info.get("duration", 0),
+        "is_live": info.get("is_live", False),
+        "live_status": info.get("live_status", "none"),
+        "was_live": info.get("live_status") == "was_live",
+        "uploader": info.get("uploader", ""),
+    }
+
+
+def get_video_info(url: str) -> dict[str, Any]:
+    """
+    Get YouTube video info including live status.
+
+    The extracted metadata is kept in video_info_cache, so downloading the
+    video shortly after doesn't extract it again.
+
+    Args:
+        url: YouTube video URL
+
+    Returns:
+        dict with title, duration and live status fields (or an error)
+    """
+    video = video_key(*detect_platform(url))
+    cached = video_info_cache.get(video)
+    if cached:
+        return summarize_info(cached[0])
+
+    ydl_opts = {
+        "quiet": True,
+        "no_warnings": True,
+        "extract_flat": False,
+    }
+
+    try:
+        with ydl_pool.lease(ydl_opts) as ydl:
+            info = ydl.extract_info(url, download=False, process=False)
+            video_info_cache.put(video, info)
+            return summarize_info(info)
+    except Exception as e:
+        print(f"Error getting video info: {e}")
+        return {"title": "Unknown", "duration": 0, "error": str(e)}
+
+
+def find_cookie_file(cookies_path: Optional[str] = None) -> Optional[str]:
+    """Return the cookies file to use, preferring a local cookies.txt."""
+    if os.path.exists("cookies.txt"):
+        return "cookies.txt"
+    if cookies_path and os.path.exists(cookies_path):
+        return cookies_path
+    return None
+
+
+def build_strategies(
+    platform: Optional[str],
+    base_opts: dict,
+    cookie_file: Optional[str],
+    video_info: dict,
+) -> list[Tuple[str, dict]]:
+    """
+    Build the ordered list of (name, yt-dlp options) download strategies.
+
+    YouTube gets several client fallbacks; other platforms use one standard
+    strategy. Every strategy keeps base_opts' format selector (see
+    select_audio_format); audio conversion is added per download (see
+    GroqAudioPP).
+    """
+    if platform == "instagram":
+        return [
+            (
+                "Standard",
+                {
+                    **base_opts,
+                    "http_headers": INSTAGRAM_HEADERS,
+                    "extractor_args": {"instagram": {"skip": ["dash"]}},
+                    "source_address": "0.0.0.0",
+                },
+            )
+        ]
+
+    if platform != "youtube":
+        return [("Standard", base_opts)]
+
+    cookie_opts = {"cookiefile": cookie_file} if cookie_file else {}
+    strategies = []
+
+    # Strategy 1: Android client (works most reliably)
+    strategies.append(
+        (
+            "Android Client",
+            {
+                **base_opts,
+                "extractor_args": {"youtube": {"player_client": ["android"]}},
+                "user_agent": (
+                    "Mozilla/5.0 (Linux; Android 11; SM-G973F) AppleWebKit/537.36"
+                ),
+            },
+        )
+    )
+
+    # Strategy 2: iOS client with anti-bot headers
+    strategies.append(
+        (
+            "iOS Client",
+            {
+                **base_opts,
+                **cookie_opts,
+                "extractor_args": {
+                    "youtube": {
+                        "player_client": ["ios", "android_creator"],
+                        "player_skip": ["webpage", "configs"],
+                        "include_dash_manifest": False,
+                    }
+                },
+                "user_agent": (
+                    "com.google.ios.youtube/19.29.1 "
+                    "(iPhone16,2; U; CPU iOS 17_5_1 like Mac OS X;)"
+                ),
+                "http_headers": {
+                    "Accept": "*/*",
+                    "Accept-Language": "en-US,en;q=0.9",
+                    "Accept-Encoding": "gzip, deflate, br",
+                    "Origin": "https://www.youtube.com",
+                    "Referer": "https://www.youtube.com/",
+                    "X-YouTube-Client-Name": "5",
+                    "X-YouTube-Client-Version": "19.29.1",
+                },
+            },
+        )
+    )
+
+    # Strategy 3: TV client (often bypasses restrictions)
+    strategies.append(
+        (
+            "TV Client",
+            {
+                **base_opts,
+                **cookie_opts,
+                "extractor_args": {
+                    "youtube": {
+                        "player_client": ["tv_embedded"],
+                        "player_skip": ["webpage"],
+                    }
+                },
+                "user_agent": (
+                    "Mozilla/5.0 (ChromiumStylePlatform) Cobalt/40.13031-qa "
+                    "(unlike Gecko) v8/8.8.278.8-jit gles Starboard/12"
+                ),
+            },
+        )
+    )
+
+    # Strategy 4: Standard with cookie authentication (if available)
+    if cookie_file:
+        strategies.append(
+            (
+                "Cookie Authentication",
+                {
+                    **base_opts,
+                    **cookie_opts,
+                    "user_agent": (
+                        "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
+                        "AppleWebKit/537.36 (KHTML, like Gecko) "
+                        "Chrome/131.0.0.0 Safari/537.36"
+                    ),
+                },
+            )
+        )
+
+    # Strategy 5: Web embedded client
+    strategies.append(
+        (
+            "Web Embedded",
+            {
+                **base_opts,
+                **cookie_opts,
+                "extractor_args": {
+                    "youtube": {
+                        "player_client": ["web_embedded"],
+                        "player_skip": ["webpage"],
+                    }
+                },
+            },
+        )
+    )
+
+    # Strategy 6: Live stream optimized (if applicable)
+    live = live_strategy(base_opts, video_info)
+    if live:
+        strategies.append(live)
+
+    return strategies
+
+
+def live_strategy(base_opts: dict, video_info: dict) -> Optional[Tuple[str, dict]]:
+    """The live stream strategy, if the video is (or was) live."""
+    is_live = video_info.get("is_live", False)
+    if not is_live and video_info.get("live_status", "none") != "was_live":
+        return None
+    live_opts = {
+        **base_opts,
+        "live_from_start": True,
+        "hls_use_mpegts": True,
+        "wait_for_video": 5,
+    }
+    if is_live:
+        live_opts["fixup"] = "never"
+    return "Live Optimized", live_opts
+
+
+def _find_audio_file(output_dir: str, audio_format: str) -> Optional[str]:
+    """Find the preprocessed audio in output_dir, converting leftovers."""
+    files = os.listdir(output_dir)
+
+    for file in files:
+        if OPTIMIZED_SUFFIX in file:
+            return os.path.join(output_dir, file)
+
+    # The postprocessor didn't run (e.g. a partial download was kept)
+    for file in files:
+        if file.endswith((".mp3", ".mp4", ".webm", ".m4a", ".opus")):
+            print(f"Converting {file} to {audio_format}")
+            try:
+                return preprocess_audio(os.path.join(output_dir, file), audio_format)
+            except RuntimeError as e:
+                print(f"Conversion error: {e}")
+
+    return None
+
+
+def _cache_audio(
+    path: str, url: str, video: Optional[str], title: Optional[str], info: dict
+):
+    """Add a finished download to the artifact cache (best effort)."""
+    try:
+        artifact_store.put_audio(path, url=url, video=video, title=title, info=info)
+    except OSError as e:
+        print(f"Could not cache audio for {url}: {e}")
+
+
+@dataclass
+class DownloadTarget:
+    """What the strategy loops download, and where to."""
+
+    url: str
+    output_dir: str
+    audio_format: str
+    video: Optional[str] = None  # video key for video_info_cache
+    # (info) -> extra strategy to try once the extracted info is known
+    # (the live stream strategy)
+    extra_strategy: Optional[Callable[[dict], Optional[Tuple[str, dict]]]] = None
+
+
+def _extract(
+    name: str, opts: dict, target: DownloadTarget
+) -> Tuple[yt_dlp.YoutubeDL, dict]:
+    """
+    Metadata phase of a strategy attempt; returns the still checked out
+    YoutubeDL (see ydl_pool).
+
+    The info is unprocessed (no format selection yet). The strategy loops
+    put the info they download from into video_info_cache (only that one:
+    hedged extractions may return several).
+    """
+    ydl = _checkout(opts, target)
+    try:
+        info = ydl.extract_info(target.url, download=False, process=False)
+    except Exception:
+        ydl_pool.release(ydl, reuse=False)
+        raise
+    if info is None:
+        ydl_pool.release(ydl)
+        raise RuntimeError(f"Strategy {name}: No info returned")
+    return ydl, info
+
+
+def _checkout(opts: dict, target: DownloadTarget) -> yt_dlp.YoutubeDL:
+    ydl = ydl_pool.checkout(opts)
+    ydl.add_post_processor(GroqAudioPP(ydl, target.audio_format))
+    return ydl
+
+
+def _process(
+    ydl: yt_dlp.YoutubeDL, name: str, info: dict, target: DownloadTarget
+) -> Tuple[Optional[str], dict, Optional[Exception]]:
+    """
+    Download phase: process already extracted info, then release the ydl.
+
+    Returns:
+        (audio_path or None, processed info, error)
+    """
+    try:
+        info = ydl.process_ie_result(info, download=True)
+    except Exception as e:
+        print(f"{name} strategy failed: {str(e)[:100]}...")
+        info, error = None, e
+    else:
+        error = None
+    ydl_pool.release(ydl, reuse=error is None)
+    file_path = None
+    if info is None:
+        print(f"Strategy {name}: No info returned")
+    else:
+        file_path = _find_audio_file(target.output_dir, target.audio_format)
+    if not file_path:
+        # Its format URLs may be what failed
+        video_info_cache.discard(target.video)
+    return file_path, info or {}, error
+
+
+def _add_extra_strategy(info: dict, target: DownloadTarget, tried: list, pending: list):
+    """Queue the target's extra strategy for this info, unless already listed."""
+    extra = target.extra_strategy(info) if target.extra_strategy else None
+    if extra and all(extra[0] != name for name, _ in tried + pending):
+        pending.append(extra)
+
+
+def _download_sequential(
+    target: DownloadTarget,
+    strategies: list[Tuple[str, dict]],
+    scheduler: Optional[StrategyScheduler] = strategy_scheduler,
+) -> Tuple[Optional[str], dict, int, Optional[Exception]]:
+    """
+    Try strategies one after another until one downloads.
+
+    Attempts are recorded in `scheduler` unless it is None.
+
+    Returns:
+        (audio_path or None, info, strategies tried, last error)
+    """
+    pending = list(strategies)
+    tried = []
+    last_error = None
+    while pending:
+        strategy_name, opts = pending.pop(0)
+        tried.append((strategy_name, opts))
+        started = time.monotonic()
+        file_path = None
+        try:
+            print(f"Trying {strategy_name} strategy for {target.url}")
+            ydl, info = _extract(strategy_name, opts, target)
+        except Exception as e:
+            last_error = e
+            print(f"{strategy_name} strategy failed: {str(e)[:100]}...")
+            if "429" in str(e):
+                time.sleep(2)
+        else:
+            video_info_cache.put(target.video, info, strategy_name)
+            _add_extra_strategy(info, target, tried, pending)
+            file_path, info, error = _process(ydl, strategy_name, info, target)
+            last_error = error or last_error
+
+        if scheduler:
+            scheduler.record(
+                strategy_name, file_path is not None, time.monotonic() - started
+            )
+        if file_path:
+            print(f"Downloaded with {strategy_name} strategy")
+            return file_path, info, len(tried), last_error
+
+    return None, {}, len(tried), last_error
+
+
+def _close_extraction(future: Future):
+    """Release the YoutubeDL of an extraction whose result is not used."""
+    if not future.cancelled() and future.exception() is None:
+        ydl_pool.release(future.result()[0])
+
+
+def _download_hedged(
+    target: DownloadTarget,
+    strategies: list[Tuple[str, dict]],
+    scheduler: StrategyScheduler = strategy_scheduler,
+) -> Tuple[Optional[str], dict, int, Optional[Exception]]:
+    """
+    Try strategies with hedged metadata extraction.
+
+    Strategies start in order, the next one as soon as the current one
+    fails. If an extraction is still running after the hedge delay, the
+    next strategy's extraction starts alongside it (up to
+    HEDGE_MAX_PARALLEL at once); the first to return metadata downloads.
+    The others keep running meanwhile, so if that download fails the next
+    extraction to return takes over without starting again; once a
+    download succeeds they are abandoned (not recorded in the scheduler,
+    their results discarded).
+
+    Returns:
+        (audio_path or None, info, strategies started, last error)
+    """
+    delay = scheduler.hedge_delay()
+    pending = list(strategies)
+    tried = []
+    # future -> (strategy name, start time, started as a hedge)
+    running: dict[Future, Tuple[str, float, bool]] = {}
+    # Extractions that returned, in order, waiting for a download attempt:
+    # (strategy name, start time, started as a hedge, extraction seconds,
+    # checked out ydl, info)
+    ready: list[tuple] = []
+    hedged = False
+    last_error = None
+    last_start = 0.0
+
+    while pending or running or ready:
+        if not ready:
+            now = time.monotonic()
+            can_hedge = len(running) < HEDGE_MAX_PARALLEL and now - last_start >= delay
+            if pending and (not running or can_hedge):
+                name, opts = pending.pop(0)
+                tried.append((name, opts))
+                if running:
+                    hedged = True
+                    print(f"Hedging {target.url}: starting {name} strategy alongside")
+                else:
+                    print(f"Trying {name} strategy for {target.url}")
+                future = _extract_pool.submit(_extract, name, opts, target)
+                running[future] = (name, now, bool(running))
+                last_start = now
+                continue
+
+            timeout = None
+            if pending and len(running) < HEDGE_MAX_PARALLEL:
+                timeout = max(0.0, last_start + delay - now)
+            done, _ = wait(running, timeout=timeout, return_when=FIRST_COMPLETED)
+            for future in done:
+                name, started, is_hedge = running.pop(future)
+                try:
+                    ydl, info = future.result()
+                except Exception as e:
+                    last_error = e
+                    print(f"{name} strategy failed: {str(e)[:100]}...")
+                    scheduler.record(name, False, time.monotonic() - started)
+                    continue
+                elapsed = time.monotonic() - started
+                ready.append((name, started, is_hedge, elapsed, ydl, info))
+            continue
+
+        name, started, is_hedge, elapsed, ydl, info = ready.pop(0)
+        scheduler.record_extraction(elapsed)
+        if hedged:
+            scheduler.record_hedge(won=is_hedge)
+            hedged = False
+
+        video_info_cache.put(target.video, info, name)
+        _add_extra_strategy(info, target, tried, pending)
+        file_path, info, error = _process(ydl, name, info, target)
+        last_error = error or last_error
+        scheduler.record(name, file_path is not None, time.monotonic() - started)
+        if file_path:
+            print(f"Downloaded with {name} strategy")
+            for future in running:
+                future.add_done_callback(_close_extraction)
+            for *_, other_ydl, _ in ready:
+                ydl_pool.release(other_ydl)
+            return file_path, info, len(tried), last_error
+
+    return None, {}, len(tried), last_error
+
+
+def download_audio(
+    url: str,
+    output_dir: str,
+    cookies_path: Optional[str] = None,
+    progress_callback: Optional[ProgressCallback] = None,
+    audio_format: str = AUDIO_FORMAT,
+    hedge: bool = DOWNLOAD_HEDGE,
+) -> Tuple[Optional[str], Optional[str], dict]:
+    """
+    Download audio for a URL, trying multiple fallback strategies.
+
+    YouTube strategies are tried best-first by their recent record (see
+    StrategyScheduler). Each attempt extracts the metadata once and
+    downloads from that info; metadata extracted in the last few minutes
+    (video_info_cache) is downloaded directly, without extracting again.
+
+    Args:
+        url: Video URL (YouTube, Instagram or TikTok)
+        output_dir: Directory to write the audio file into
+        cookies_path: Optional path to a Netscape cookies file
+        progress_callback: Optional callback receiving download progress (0.0-1.0)
+        audio_format: Output encoding, a key of AUDIO_FORMATS (16 kHz mono)
+        hedge: Race a slow YouTube strategy against the next one (see
+            _download_hedged)
+
+    Returns:
+        (audio_path, title, info). On failure audio_path and title are None
+        and info contains an "error" message.
+    """
+    platform, video_id = detect_platform(url)
+    video = video_key(platform, video_id)
+
+    # Check the artifact cache first (by video ID, then URL)
+    cached = artifact_store.get_audio(url=url, video=video)
+    if cached:
+        print(f"Using cached audio for {url}")
+        if progress_callback:
+            progress_callback(1.0)
+        return cached["path"], cached["title"], cached["info"]
+
+    # Metadata extracted recently (e.g. by a previous attempt) is reused;
+    # otherwise the first strategy extracts it, and the live status is
+    # checked then
+    cached_info = video_info_cache.get(video)
+    video_info = cached_info[0] if cached_info else {}
+    video_title = video_info.get("title", f"video_{video_id}")
+
+    cookie_file = find_cookie_file(cookies_path)
+
+    def progress_hook(d: dict):
+        if not progress_callback:
+            return
+        if d["status"] == "downloading":
+            total = d.get("total_bytes") or d.get("total_bytes_estimate") or 0
+            downloaded = d.get("downloaded_bytes") or 0
+            if total > 0:
+                progress_callback(min(downloaded / total, 1.0))
+        elif d["status"] == "finished":
+            progress_callback(1.0)
+
+    base_opts = {
+        # Smallest speech-quality audio, Groq-acceptable containers first
+        "format": select_audio_format,
+        "outtmpl": os.path.join(output_dir, "%(title)s.%(ext)s"),
+        "quiet": True,
+        "no_warnings": True,
+        "extract_flat": False,
+        "ignoreerrors": True,
+        "no_color": True,
+        "socket_timeout": 30,
+        "retries": 5,
+        "fragment_retries": 5,
+        "skip_unavailable_fragments": True,
+        "progress_hooks": [progress_hook],
+    }
+    if cookie_file and platform != "youtube":
+        base_opts["cookiefile"] = cookie_file
+
+    strategies = build_strategies(platform, base_opts, cookie_file, video_info)
+    scheduled = len(strategies) > 1
+    if scheduled:
+        strategies = strategy_scheduler.order(strategies)
+    target = DownloadTarget(
+        url=url,
+        output_dir=output_dir,
+        audio_format=audio_format,
+        video=video,
+        extra_strategy=(
+            (lambda info: live_strategy(base_opts, info))
+            if platform == "youtube"
+            else None
+        ),
+    )
+
+    file_path, info, attempts, last_error = None, {}, 0, None
+    if cached_info:
+        # Download with the strategy that extracted the info
+        name, opts = next(
+            (strategy for strategy in strategies if strategy[0] == cached_info[1]),
+            strategies[0],
+        )
+        print(f"Using cached metadata for {url} ({name} strategy)")
+        started = time.monotonic()
+        file_path, info, last_error = _process(
+            _checkout(opts, target), name, cached_info[0], target
+        )
+        attempts = 1
+        if scheduled:
+            strategy_scheduler.record(
+                name, file_path is not None, time.monotonic() - started
+            )
+
+    if not file_path:
+        if scheduled and hedge:
+            file_path, info, tried, last_error = _download_hedged(target, strategies)
+        else:
+            file_path, info, tried, last_error = _download_sequential(
+                target,
+                strategies,
+                scheduler=strategy_scheduler if scheduled else None,
+            )
+        attempts += tried
+    if scheduled:
+        strategy_scheduler.record_download(attempts)
+    if file_path:
+        title = info.get("title", "Unknown")
+        _cache_audio(file_path, url, video, title, info)
+        return file_path, title, info
+
+    # If YouTube strategies failed, try pytube as a final fallback
+    if platform == "youtube":
+        video_info = summarize_info(video_info) if video_info else {}
+        try:
+            from pytube import YouTube
+
+            print("Trying pytube as final fallback...")
+            audio_stream = (
+                YouTube(url)
+                .streams.filter(only_audio=True, file_extension="mp4")
+                .first()
+            )
+            if audio_stream:
+                safe_title = sanitize_filename(video_title)
+                temp_path = audio_stream.download(
+                    output_path=output_dir, filename=f"{safe_title}.mp4"
+                )
+                output_path = preprocess_audio(temp_path, audio_format)
+                os.remove(temp_path)
+                _cache_audio(output_path, url, video, video_title, video_info)
+                return output_path, video_title, video_info
+        except Exception as e:
+            print(f"Pytube also failed: {str(e)[:100]}...")
+
+    error_msg = f"All download strategies failed. Last error: {str(last_error)[:200]}"
+    return None, None, {"error": error_msg}
@@ -0,0 +1,174 @@
+"""
+Audio format negotiation for MultiFetch v2.
+
+Whisper only needs speech-quality audio, so there is no point downloading
+the best audio a site offers, let alone a video, and re-encoding it. The
+selector below is passed to yt-dlp as the "format" option and picks, in
+order of preference:
+
+1. An audio-only format in a container Groq accepts, the lowest bitrate at
+   or above SPEECH_MIN_ABR (the highest below it if none reach it), in the
+   original language when the site offers dubbed tracks.
+2. Where there is no audio-only format (TikTok, Instagram), the combined
+   format with the lowest bitrate.
+3. Otherwise the best format with audio, as "bestaudio/best" would.
+
+GroqAudioPP then uploads the download as is when it is audio-only, in an
+accepted container and no richer than AUDIO_PASSTHROUGH_MAX_KBPS (see
+is_groq_ready), and only transcodes the rest. FormatStats counts what was
+selected, the bytes downloaded and uploaded, and the time spent
+transcoding, so the savings show up in /api/downloads/formats.
+"""
+
+import threading
+from typing import Iterator, Optional, Tuple
+
+from utils.constants import (
+    AUDIO_PASSTHROUGH_MAX_KBPS,
+    GROQ_AUDIO_EXTENSIONS,
+    SPEECH_MIN_ABR,
+)
+
+
+def _known(codec: Optional[str]) -> bool:
+    return codec not in (None, "none")
+
+
+def _audio_rank(fmt: dict) -> tuple:
+    """Sort key for audio-only formats, best choice first."""
+    abr = fmt.get("abr") or fmt.get("tbr")
+    below = abr is not None and abr < SPEECH_MIN_ABR
+    return (
+        -(fmt.get("language_preference") or 0),
+        fmt.get("ext") not in GROQ_AUDIO_EXTENSIONS,
+        abr is None,
+        below,
+        -abr if below else abr or 0,
+    )
+
+
+def _combined_rank(fmt: dict) -> tuple:
+    """Sort key for audio+video formats: smallest first."""
+    tbr = fmt.get("tbr")
+    return tbr is None, tbr or 0, fmt.get("height") or 0
+
+
+def choose_format(formats: list[dict]) -> Tuple[Optional[dict], str]:
+    """
+    Pick the format to download for transcription.
+
+    Args:
+        formats: yt-dlp format dicts, worst to best (as yt-dlp sorts them)
+
+    Returns:
+        (format or None, kind), kind being "audio", "combined", "best" or
+        "none"
+    """
+    audio = [
+        f for f in formats if f.get("vcodec") == "none" and _known(f.get("acodec"))
+    ]
+    if audio:
+        return min(audio, key=_audio_rank), "audio"
+
+    combined = [
+        f for f in formats if _known(f.get("acodec")) and _known(f.get("vcodec"))
+    ]
+    if combined:
+        return min(combined, key=_combined_rank), "combined"
+
+    # Codecs unknown (e.g. generic extractor): the best one that may have audio
+    with_audio = [f for f in formats if f.get("acodec") != "none"]
+    if with_audio:
+        return with_audio[-1], "best"
+    return None, "none"
+
+
+def select_audio_format(ctx: dict) -> Iterator[dict]:
+    """yt-dlp format selector (the "format" option) using choose_format."""
+    fmt, kind = choose_format(ctx["formats"])
+    format_stats.record_selection(kind)
+    if fmt is not None:
+        yield fmt
+
+
+def is_groq_ready(info: dict, size: int) -> bool:
+    """
+    Whether a finished download can be uploaded without transcoding.
+
+    Args:
+        info: yt-dlp info of the downloaded format
+        size: Size of the downloaded file in bytes
+    """
+    if info.get("vcodec") != "none" or not _known(info.get("acodec")):
+        return False
+    if info.get("ext") not in GROQ_AUDIO_EXTENSIONS:
+        return False
+    kbps = info.get("abr") or info.get("tbr")
+    duration = info.get("duration")
+    if not kbps and duration:
+        kbps = size * 8 / duration / 1000
+    return bool(kbps) and kbps <= AUDIO_PASSTHROUGH_MAX_KBPS
+
+
+class FormatStats:
+    """Counts format selections and what postprocessing each download cost."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._selections = {"audio": 0, "combined": 0, "best": 0, "none": 0}
+        self._counters = {
+            "downloads": 0,
+            "passthrough": 0,
+            "transcoded": 0,
+            "bytes_downloaded": 0,
+            "bytes_uploaded": 0,
+            "transcode_seconds": 0.0,
+        }
+
+    def record_selection(self, kind: str):
+        """Record which kind of format the selector picked."""
+        with self._lock:
+            self._selections[kind] += 1
+
+    def record_output(
+        self, downloaded: int, uploaded: int, seconds: float, passthrough: bool
+    ):
+        """
+        Record one postprocessed download.
+
+        Args:
+            downloaded: Bytes downloaded
+            uploaded: Bytes of the audio file handed to transcription
+            seconds: Time spent transcoding (0 for passthrough)
+            passthrough: Whether the download was kept as is
+        """
+        with self._lock:
+            self._counters["downloads"] += 1
+            self._counters["passthrough" if passthrough else "transcoded"] += 1
+            self._counters["bytes_downloaded"] += downloaded
+            self._counters["bytes_uploaded"] += uploaded
+            self._counters["transcode_seconds"] += seconds
+
+    def stats(self) -> dict:
+        """Selection counts, totals and per-download means."""
+        with self._lock:
+            counters = dict(self._counters)
+            selections = dict(self._selections)
+        downloads = counters["downloads"]
+        return {
+            "selections": selections,
+            **counters,
+            "transcode_seconds": round(counters["transcode_seconds"], 2),
+            "mean_bytes_downloaded": (
+                counters["bytes_downloaded"] // downloads if downloads else None
+            ),
+            "mean_transcode_seconds": (
+                round(counters["transcode_seconds"] / downloads, 3)
+                if downloads
+                else None
+            ),
+        }
+
+
+# Global format stats instance
+format_stats = FormatStats()
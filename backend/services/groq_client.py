@@ -0,0 +1,165 @@
+"""
+Groq client pool for MultiFetch v2.
+
+Keeps one Groq client (and its HTTP connection pool) per API key, so API
+key validation and every transcription request for that key reuse warm
+keep-alive (or HTTP/2, when h2 is installed) connections instead of paying
+a TLS handshake each time. Clients idle for longer than the timeout are
+closed.
+"""
+
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Iterator
+
+import httpx
+from groq import DefaultHttpxClient, Groq
+
+from utils.constants import (
+    GROQ_CLIENT_IDLE_SECONDS,
+    GROQ_CLIENT_POOL_SIZE,
+    GROQ_CONCURRENCY_MAX,
+)
+
+try:
+    import h2  # noqa: F401  (enables httpx's HTTP/2 support)
+
+    HTTP2 = True
+except ImportError:
+    HTTP2 = False
+
+
+@dataclass
+class _PooledClient:
+    client: Groq
+    last_used: float
+    leases: int = 0
+
+
+class GroqClientPool:
+    """
+    Thread-safe pool of Groq clients keyed by API key.
+
+    Clients are handed out with lease(); a client is only closed once it
+    has no active leases and has sat idle past `idle_timeout`, or when the
+    pool grows past `max_clients`.
+    """
+
+    def __init__(
+        self,
+        idle_timeout: float = GROQ_CLIENT_IDLE_SECONDS,
+        max_clients: int = GROQ_CLIENT_POOL_SIZE,
+    ):
+        self.idle_timeout = idle_timeout
+        self.max_clients = max_clients
+        self._clients: dict[str, _PooledClient] = {}
+        self._lock = threading.Lock()
+        self._counters = {"created": 0, "reused": 0, "evicted": 0}
+
+    @contextmanager
+    def lease(self, api_key: str) -> Iterator[Groq]:
+        """
+        Borrow the client for an API key, creating it if needed.
+
+        Args:
+            api_key: Groq API key
+
+        Yields:
+            A Groq client that won't be closed while the lease is held
+        """
+        with self._lock:
+            now = time.monotonic()
+            stale = self._collect_idle(now)
+            entry = self._clients.get(api_key)
+            if entry:
+                self._counters["reused"] += 1
+            else:
+                entry = _PooledClient(client=self._create(api_key), last_used=now)
+                self._clients[api_key] = entry
+                self._counters["created"] += 1
+            entry.leases += 1
+            stale += self._collect_overflow()
+        self._close(stale)
+
+        try:
+            yield entry.client
+        finally:
+            with self._lock:
+                entry.leases -= 1
+                entry.last_used = time.monotonic()
+
+    def warm(self, api_key: str):
+        """
+        Open a connection for an API key ahead of its first real request.
+
+        Makes one cheap models.list() call; failures are only logged, since
+        the transcription that follows will report them properly.
+        """
+        try:
+            with self.lease(api_key) as client:
+                client.models.list()
+        except Exception as e:
+            print(f"Groq client warm-up failed: {str(e)[:100]}")
+
+    def evict_idle(self) -> int:
+        """Close clients idle past the timeout; returns how many were closed."""
+        with self._lock:
+            stale = self._collect_idle(time.monotonic())
+        self._close(stale)
+        return len(stale)
+
+    def stats(self) -> dict:
+        """Pool counters for the health endpoint."""
+        with self._lock:
+            return {
+                "clients": len(self._clients),
+                "http2": HTTP2,
+                **self._counters,
+            }
+
+    def _create(self, api_key: str) -> Groq:
+        # Retries are handled by transcribe_with_retry, so every 429 reaches
+        # the shared rate limiter
+        http_client = DefaultHttpxClient(
+            http2=HTTP2,
+            limits=httpx.Limits(
+                max_connections=GROQ_CONCURRENCY_MAX * 2,
+                max_keepalive_connections=GROQ_CONCURRENCY_MAX,
+                keepalive_expiry=self.idle_timeout,
+            ),
+        )
+        return Groq(api_key=api_key, max_retries=0, http_client=http_client)
+
+    def _collect_idle(self, now: float) -> list[Groq]:
+        """Remove unleased clients idle past the timeout (lock held)."""
+        stale = [
+            key
+            for key, entry in self._clients.items()
+            if not entry.leases and now - entry.last_used > self.idle_timeout
+        ]
+        self._counters["evicted"] += len(stale)
+        return [self._clients.pop(key).client for key in stale]
+
+    def _collect_overflow(self) -> list[Groq]:
+        """Remove least recently used unleased clients over the cap (lock held)."""
+        idle = sorted(
+            (entry.last_used, key)
+            for key, entry in self._clients.items()
+            if not entry.leases
+        )
+        overflow = idle[: max(len(self._clients) - self.max_clients, 0)]
+        self._counters["evicted"] += len(overflow)
+        return [self._clients.pop(key).client for _, key in overflow]
+
+    def _close(self, clients: list[Groq]):
+        for client in clients:
+            try:
+                client.close()
+            except Exception as e:
+                print(f"Error closing Groq client: {e}")
+
+
+# Global client pool instance
+groq_clients = GroqClientPool()
@@ -4,12 +4,17 @@ Handles job creation, status tracking, and results storage.
 """
 
 import uuid
-import threading
 from datetime import datetime
 from enum import Enum
-from typing import Optional
+from pathlib import Path
+from typing import TYPE_CHECKING, Optional
 from dataclasses import dataclass, field
 
+from utils.constants import JOB_STORE_URL
+
+if TYPE_CHECKING:
+    from services.job_store import JobStore
+
 
 class JobStatus(str, Enum):
     PENDING = "pending"
@@ -37,10 +42,25 @@ class JobItem:
     title: Optional[str] = None
     audio_path: Optional[str] = None
     transcript: Optional[str] = None
+    transcript_path: Optional[str] = None  # set when retention spills it
     error: Optional[str] = None
     started_at: Optional[datetime] = None
     completed_at: Optional[datetime] = None
 
+    @property
+    def has_transcript(self) -> bool:
+        return self.transcript is not None or self.transcript_path is not None
+
+    def read_transcript(self) -> Optional[str]:
+        """The transcript, reloaded from disk if it was spilled."""
+        if self.transcript is not None or not self.transcript_path:
+            return self.transcript
+        try:
+            return Path(self.transcript_path).read_text(encoding="utf-8")
+        except OSError as e:
+            print(f"Could not reload spilled transcript {self.transcript_path}: {e}")
+            return None
+
 
 @dataclass
 class Job:
@@ -56,24 +76,73 @@ class Job:
     language: str = "en"
     error: Optional[str] = None
 
+    def __post_init__(self):
+        # Not dataclass fields, so they stay out of asdict() and the stores.
+        # Index by URL (first occurrence wins, as the old linear scan did)
+        # plus running totals, so item updates and the aggregate properties
+        # are O(1) however many items the job has.
+        self._by_url: dict[str, int] = {}
+        for index, item in enumerate(self.items):
+            self._by_url.setdefault(item.url, index)
+        self._progress_sum = 0
+        self._completed = 0
+        self._failed = 0
+        self._transcript_bytes = 0
+        for item in self.items:
+            self._tally(item, 1)
+
+    def _tally(self, item: JobItem, sign: int):
+        self._progress_sum += sign * item.progress
+        if item.transcript:
+            self._transcript_bytes += sign * len(item.transcript.encode("utf-8"))
+        if item.status == JobStatus.COMPLETED:
+            self._completed += sign
+        elif item.status == JobStatus.FAILED:
+            self._failed += sign
+
+    def item_for(self, url: str) -> Optional[JobItem]:
+        """Item for a URL, or None."""
+        index = self._by_url.get(url)
+        return self.items[index] if index is not None else None
+
+    def item_at(self, index: int) -> Optional[JobItem]:
+        """Item at a position in the job, or None."""
+        return self.items[index] if 0 <= index < len(self.items) else None
+
+    def update_item(self, item: JobItem, **changes):
+        """Set fields on one of this job's items, keeping the totals current."""
+        self._tally(item, -1)
+        for name, value in changes.items():
+            setattr(item, name, value)
+        self._tally(item, 1)
+
     @property
     def progress(self) -> int:
         """Overall job progress (0-100)."""
         if not self.items:
             return 0
-        total_progress = sum(item.progress for item in self.items)
-        return total_progress // len(self.items)
+        return self._progress_sum // len(self.items)
 
     @property
     def completed_count(self) -> int:
-        return sum(1 for item in self.items if item.status == JobStatus.COMPLETED)
+        return self._completed
 
     @property
     def failed_count(self) -> int:
-        return sum(1 for item in self.items if item.status == JobStatus.FAILED)
+        return self._failed
+
+    @property
+    def finished_count(self) -> int:
+        """Items that completed or failed."""
+        return self._completed + self._failed
 
-    def to_dict(self) -> dict:
-        """Convert job to dictionary for JSON serialization."""
+    @property
+    def transcript_bytes(self) -> int:
+        """Size of the transcripts held in the job (spilled ones excluded)."""
+        return self._transcript_bytes
+
+    def to_summary(self) -> dict:
+        """Job fields and aggregates without items (for job lists)."""
         return {
             "id": self.id,
             "job_type": self.job_type.value,
@@ -85,8 +154,23 @@ class Job:
             "language": self.language,
             "created_at": self.created_at.isoformat(),
             "started_at": self.started_at.isoformat() if self.started_at else None,
-            "completed_at": self.completed_at.isoformat() if self.completed_at else None,
+            "completed_at": self.completed_at.isoformat()
+            if self.completed_at
+            else None,
             "error": self.error,
+            "transcript_bytes": self.transcript_bytes,
+        }
+
+    def to_dict(self, transcripts: bool = True) -> dict:
+        """
+        Convert job to dictionary for JSON serialization.
+
+        Args:
+            transcripts: Include item transcripts; when False they're left
+                as None and clients check has_transcript instead
+        """
+        return {
+            **self.to_summary(),
             "items": [
                 {
                     "url": item.url,
@@ -95,7 +179,8 @@ class Job:
                     "status": item.status.value,
                     "progress": item.progress,
                     "title": item.title,
-                    "transcript": item.transcript,
+                    "transcript": item.read_transcript() if transcripts else None,
+                    "has_transcript": item.has_transcript,
                     "error": item.error,
                 }
                 for item in self.items
@@ -105,14 +190,18 @@ class Job:
 
 class JobManager:
     """
-    Thread-safe job manager with in-memory storage.
-    Can be extended to use Redis or database for persistence.
+    Thread-safe job manager over a pluggable store.
+
+    Jobs live in memory by default; set JOB_STORE_URL to a SQLite or Redis
+    store (see services/job_store.py) so every gunicorn worker sees the
+    same jobs.
     """
 
-    def __init__(self):
-        self._jobs: dict[str, Job] = {}
-        self._lock = threading.Lock()
-        self._subscribers: dict[str, list] = {}  # job_id -> list of SSE queues
+    def __init__(self, store: Optional["JobStore"] = None):
+        # Imported here because the stores build Job objects from this module
+        from services.job_store import create_job_store
+
+        self.store = store or create_job_store(JOB_STORE_URL)
 
     def create_job(
         self,
@@ -151,35 +240,101 @@ class JobManager:
             language=language,
         )
 
-        with self._lock:
-            self._jobs[job_id] = job
+        self.store.put(job)
 
         return job
 
     def get_job(self, job_id: str) -> Optional[Job]:
         """Get a job by ID."""
-        with self._lock:
-            return self._jobs.get(job_id)
+        return self.store.get(job_id)
+
+    def list_jobs(
+        self,
+        limit: int = 50,
+        cursor: Optional[str] = None,
+        statuses: Optional[set[JobStatus]] = None,
+    ) -> list[Job]:
+        """
+        List recent jobs, newest first.
+
+        Args:
+            limit: Maximum number of jobs to return
+            cursor: Only return jobs older than this page cursor
+            statuses: Only return jobs in one of these statuses
+
+        Raises:
+            ValueError: If the cursor is malformed
+        """
+        return self.store.list(limit, cursor, statuses)
+
+    def list_job_page(
+        self,
+        limit: int = 50,
+        cursor: Optional[str] = None,
+        statuses: Optional[set[JobStatus]] = None,
+        full: bool = False,
+    ) -> tuple[list[dict], Optional[str]]:
+        """
+        One page of jobs as dicts, newest first.
+
+        Args:
+            limit: Maximum number of jobs on the page
+            cursor: Cursor returned with the previous page
+            statuses: Only return jobs in one of these statuses
+            full: Include items and transcripts (to_dict) instead of the
+                summary projection, which never loads them
+
+        Returns:
+            (jobs, cursor for the next page or None on the last page)
 
-    def list_jobs(self, limit: int = 50) -> list[Job]:
-        """List recent jobs, newest first."""
-        with self._lock:
-            jobs = sorted(
-                self._jobs.values(), key=lambda j: j.created_at, reverse=True
-            )
-            return jobs[:limit]
+        Raises:
+            ValueError: If the cursor is malformed
+        """
+        # Imported here because the stores build Job objects from this module
+        from services.job_store import make_cursor
+
+        if full:
+            jobs = [
+                job.to_dict() for job in self.store.list(limit + 1, cursor, statuses)
+            ]
+        else:
+            jobs = self.store.list_summaries(limit + 1, cursor, statuses)
+        if len(jobs) <= limit:
+            return jobs, None
+        last = jobs[limit - 1]
+        return jobs[:limit], make_cursor(
+            datetime.fromisoformat(last["created_at"]), last["id"]
+        )
 
     def update_job_status(self, job_id: str, status: JobStatus, error: str = None):
         """Update job status."""
-        with self._lock:
-            job = self._jobs.get(job_id)
-            if job:
-                job.status = status
-                job.error = error
-                if status == JobStatus.RUNNING and not job.started_at:
-                    job.started_at = datetime.utcnow()
-                elif status in (JobStatus.COMPLETED, JobStatus.FAILED, JobStatus.CANCELLED):
-                    job.completed_at = datetime.utcnow()
+
+        def apply(job: Job):
+            job.status = status
+            job.error = error
+            if status == JobStatus.RUNNING and not job.started_at:
+                job.started_at = datetime.utcnow()
+            elif status in (JobStatus.COMPLETED, JobStatus.FAILED, JobStatus.CANCELLED):
+                job.completed_at = datetime.utcnow()
+
+        self.store.update(job_id, apply)
+
+    def claim_job(self, job_id: str) -> bool:
+        """
+        Move a pending job to running, atomically.
+
+        Returns:
+            True if this call started the job; False if it wasn't pending
+            (another request or worker got there first) or doesn't exist
+        """
+
+        def started(job: Job):
+            job.error = None
+            job.started_at = job.started_at or datetime.utcnow()
+
+        return self.store.transition(
+            job_id, JobStatus.PENDING, JobStatus.RUNNING, started
+        )
 
     def update_item_status(
         self,
@@ -191,60 +346,96 @@ class JobManager:
         audio_path: str = None,
         transcript: str = None,
         error: str = None,
+        index: int = None,
     ):
-        """Update status of a specific item within a job."""
-        with self._lock:
-            job = self._jobs.get(job_id)
-            if not job:
+        """
+        Update status of a specific item within a job.
+
+        The item is found by `index` (its position in the job) when given,
+        otherwise by URL.
+        """
+
+        def apply(job: Job):
+            item = job.item_at(index) if index is not None else job.item_for(url)
+            if item is None:
                 return
 
-            for item in job.items:
-                if item.url == url:
-                    item.status = status
-                    if progress is not None:
-                        item.progress = progress
-                    if title is not None:
-                        item.title = title
-                    if audio_path is not None:
-                        item.audio_path = audio_path
-                    if transcript is not None:
-                        item.transcript = transcript
-                    if error is not None:
-                        item.error = error
-                    if status == JobStatus.RUNNING and not item.started_at:
-                        item.started_at = datetime.utcnow()
-                    elif status in (JobStatus.COMPLETED, JobStatus.FAILED):
-                        item.completed_at = datetime.utcnow()
-                    break
+            changes = {"status": status}
+            if progress is not None:
+                changes["progress"] = progress
+            if title is not None:
+                changes["title"] = title
+            if audio_path is not None:
+                changes["audio_path"] = audio_path
+            if transcript is not None:
+                changes["transcript"] = transcript
+            if error is not None:
+                changes["error"] = error
+            if status == JobStatus.RUNNING and not item.started_at:
+                changes["started_at"] = datetime.utcnow()
+            elif status in (JobStatus.COMPLETED, JobStatus.FAILED):
+                changes["completed_at"] = datetime.utcnow()
+            job.update_item(item, **changes)
 
             # Check if all items are done
-            all_done = all(
-                item.status in (JobStatus.COMPLETED, JobStatus.FAILED)
-                for item in job.items
-            )
-            if all_done:
-                all_failed = all(item.status == JobStatus.FAILED for item in job.items)
+            if job.finished_count == len(job.items):
+                all_failed = job.failed_count == len(job.items)
                 job.status = JobStatus.FAILED if all_failed else JobStatus.COMPLETED
                 job.completed_at = datetime.utcnow()
 
+        self.store.update(job_id, apply)
+
+    def update_items_progress(
+        self, job_id: str, progress: dict[int, int]
+    ) -> Optional[tuple[int, list[int]]]:
+        """
+        Set the progress of several running items in one store update.
+
+        Items that already completed or failed are left alone.
+
+        Args:
+            job_id: The job to change
+            progress: Item index -> progress (0-100)
+
+        Returns:
+            (job progress, indexes that were updated), or None if the job
+            doesn't exist
+        """
+
+        def apply(job: Job) -> tuple[int, list[int]]:
+            applied = []
+            for index, value in progress.items():
+                item = job.item_at(index)
+                if item is None or item.status in (
+                    JobStatus.COMPLETED,
+                    JobStatus.FAILED,
+                ):
+                    continue
+                changes = {"status": JobStatus.RUNNING, "progress": value}
+                if not item.started_at:
+                    changes["started_at"] = datetime.utcnow()
+                job.update_item(item, **changes)
+                applied.append(index)
+            return job.progress, applied
+
+        return self.store.update(job_id, apply)
+
     def delete_job(self, job_id: str) -> bool:
         """Delete a job."""
-        with self._lock:
-            if job_id in self._jobs:
-                del self._jobs[job_id]
-                return True
-            return False
+        return self.store.delete(job_id)
 
     def cancel_job(self, job_id: str) -> bool:
         """Cancel a running job."""
-        with self._lock:
-            job = self._jobs.get(job_id)
-            if job and job.status in (JobStatus.PENDING, JobStatus.RUNNING):
+
+        def apply(job: Job) -> bool:
+            if job.status in (JobStatus.PENDING, JobStatus.RUNNING):
                 job.status = JobStatus.CANCELLED
                 job.completed_at = datetime.utcnow()
                 return True
             return False
 
+        return bool(self.store.update(job_id, apply))
+
 
 # Global job manager instance
 job_manager = JobManager()
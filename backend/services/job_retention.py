@@ -0,0 +1,257 @@
+"""
+Job retention service for MultiFetch v2.
+
+Jobs otherwise live until someone deletes them, each item holding its full
+transcript. A background sweep bounds that:
+
+- finished jobs older than the TTL are deleted along with the downloaded
+  audio in their work directories (artifact cache blobs are never touched)
+- once the transcripts held in the job store exceed the byte budget, the
+  oldest jobs' transcripts are written to the spill directory and reloaded
+  from there on access (JobItem.read_transcript)
+
+Every gunicorn worker starts the thread, but only the one holding the job
+store's "job-retention" lease sweeps; the others take over if it stops
+renewing it. Sweeps page through job summaries and only load the jobs
+they delete.
+"""
+
+import os
+import shutil
+import socket
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Iterator, Optional
+
+from services.job_manager import Job, JobManager, JobStatus, job_manager
+from utils.constants import (
+    JOB_RETENTION_INTERVAL,
+    JOB_SPILL_DIR,
+    JOB_TRANSCRIPT_MAX_BYTES,
+    JOB_TTL_SECONDS,
+)
+
+FINISHED = (JobStatus.COMPLETED, JobStatus.FAILED, JobStatus.CANCELLED)
+
+# Job summaries fetched per page while sweeping
+SWEEP_PAGE_SIZE = 100
+# The sweeping process renews its lease every interval; others wait this
+# many intervals after its last renewal before taking over
+LEASE_INTERVALS = 3
+
+
+class JobRetention:
+    """
+    Expires finished jobs and keeps resident transcripts under a budget.
+
+    Call sweep() directly, or start() a daemon thread that sweeps every
+    `interval` seconds while this process holds the retention lease. A ttl
+    or max_bytes of 0 disables that limit.
+    """
+
+    def __init__(
+        self,
+        manager: JobManager = job_manager,
+        ttl: float = JOB_TTL_SECONDS,
+        max_bytes: int = JOB_TRANSCRIPT_MAX_BYTES,
+        spill_dir: Path = JOB_SPILL_DIR,
+        interval: float = JOB_RETENTION_INTERVAL,
+    ):
+        self.manager = manager
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.spill_dir = Path(spill_dir)
+        self.interval = interval
+        self._lock = threading.Lock()  # one sweep at a time
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._leader = False
+        self._counters = {
+            "sweeps": 0,
+            "expired": 0,
+            "spilled_jobs": 0,
+            "spilled_bytes": 0,
+        }
+        self._last = {"jobs": 0, "resident_bytes": 0, "sweep_ms": 0.0}
+
+    def start(self):
+        """Start the background sweep thread (no-op if already running)."""
+        with self._lock:
+            if self._thread:
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(
+                target=self._run, name="job-retention", daemon=True
+            )
+            self._thread.start()
+
+    def stop(self):
+        """Stop the background sweep thread."""
+        self._stop.set()
+        if self._thread:
+            self._thread.join()
+            self._thread = None
+
+    def sweep(self) -> dict:
+        """
+        Run one retention pass.
+
+        Returns:
+            {"expired": jobs deleted, "spilled": jobs whose transcripts
+            moved to disk, "resident_bytes": transcript bytes left in the
+            store}
+        """
+        with self._lock:
+            start = time.perf_counter()
+            cutoff = datetime.utcnow() - timedelta(seconds=self.ttl)
+            finished = {status.value for status in FINISHED}
+            expired: list[str] = []
+            resident: list[tuple[str, int]] = []  # (job id, bytes), newest first
+            total = jobs = 0
+            for summary in self._iter_summaries():
+                jobs += 1
+                completed_at = summary["completed_at"]
+                size = summary.get("transcript_bytes", 0)
+                if (
+                    self.ttl
+                    and summary["status"] in finished
+                    and completed_at
+                    and datetime.fromisoformat(completed_at) < cutoff
+                ):
+                    expired.append(summary["id"])
+                elif size:
+                    resident.append((summary["id"], size))
+                    total += size
+
+            expired_count = sum(1 for job_id in expired if self.delete_job(job_id))
+
+            # Spilled files must be readable by every process using the store
+            spilled = 0
+            if self.max_bytes and self.manager.store.host_local:
+                for job_id, _ in reversed(resident):
+                    if total <= self.max_bytes:
+                        break
+                    freed = self._spill(job_id)
+                    if freed:
+                        total -= freed
+                        spilled += 1
+                        self._counters["spilled_bytes"] += freed
+
+            self._counters["sweeps"] += 1
+            self._counters["expired"] += expired_count
+            self._counters["spilled_jobs"] += spilled
+            self._last = {
+                "jobs": jobs - expired_count,
+                "resident_bytes": total,
+                "sweep_ms": round((time.perf_counter() - start) * 1000, 1),
+            }
+            return {
+                "expired": expired_count,
+                "spilled": spilled,
+                "resident_bytes": total,
+            }
+
+    def delete_job(self, job_id: str) -> bool:
+        """Delete a job now, along with its audio and spilled transcripts."""
+        job = self.manager.get_job(job_id)
+        return bool(job) and self._evict(job)
+
+    def stats(self) -> dict:
+        """Retention counters for the health endpoint."""
+        return {
+            "ttl_seconds": self.ttl,
+            "max_transcript_bytes": self.max_bytes,
+            "leader": self._leader,
+            **self._counters,
+            **self._last,
+        }
+
+    def _run(self):
+        # Per process, so read once the thread runs (after gunicorn forks)
+        owner = f"{socket.gethostname()}:{os.getpid()}"
+        while not self._stop.wait(self.interval):
+            try:
+                self._leader = self.manager.store.acquire_lease(
+                    "job-retention", owner, self.interval * LEASE_INTERVALS
+                )
+                if self._leader:
+                    self.sweep()
+            except Exception as e:
+                print(f"Job retention sweep failed: {e}")
+
+    def _iter_summaries(self) -> Iterator[dict]:
+        """Every stored job's summary, newest first, a page at a time."""
+        cursor = None
+        while True:
+            page, cursor = self.manager.list_job_page(SWEEP_PAGE_SIZE, cursor)
+            yield from page
+            if not cursor:
+                return
+
+    def _evict(self, job: Job) -> bool:
+        if not self.manager.delete_job(job.id):
+            return False
+        shutil.rmtree(self.spill_dir / job.id, ignore_errors=True)
+        for item in job.items:
+            work_dir = _work_dir(item.audio_path, job.id)
+            if work_dir:
+                shutil.rmtree(work_dir, ignore_errors=True)
+        return True
+
+    def _spill(self, job_id: str) -> int:
+        """Move a job's transcripts to disk; returns the bytes freed."""
+        job_dir = self.spill_dir / job_id
+
+        def apply(job: Job) -> int:
+            freed = 0
+            for index, item in enumerate(job.items):
+                if item.transcript is None:
+                    continue
+                path = job_dir / f"{index}.txt"
+                _write_text(path, item.transcript)
+                freed += len(item.transcript.encode("utf-8"))
+                job.update_item(item, transcript=None, transcript_path=str(path))
+            return freed
+
+        try:
+            return self.manager.store.update(job_id, apply) or 0
+        except OSError as e:
+            print(f"Could not spill transcripts of job {job_id}: {e}")
+            return 0
+
+
+def _work_dir(audio_path: Optional[str], job_id: str) -> Optional[Path]:
+    """
+    The JobRunner work directory holding an item's audio, if it is one.
+
+    Cache hits get a link to the cached audio in their work directory too,
+    so the artifact store's blobs/ directory is never touched here.
+    """
+    if not audio_path:
+        return None
+    parent = Path(audio_path).parent
+    # JobRunner creates these with tempfile.mkdtemp(prefix=...)
+    if parent.name.startswith(f"multifetch_{job_id}_"):
+        return parent
+    return None
+
+
+def _write_text(path: Path, text: str):
+    """Write text to path via a temp file + rename."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=".tmp_")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(text)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+
+
+# Global job retention instance
+job_retention = JobRetention()
@@ -0,0 +1,489 @@
+"""
+Background job execution engine for MultiFetch v2.
+
+Each JobItem flows through three stages: download -> chunk -> transcribe.
+Every stage has its own bounded thread pool, so a slow yt-dlp download only
+occupies a download worker while already-downloaded items keep transcribing.
+"""
+
+import os
+import shutil
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Callable, Iterable, Optional, Tuple
+
+from api.sse import (
+    notify_item_complete,
+    notify_item_failed,
+    notify_job_complete,
+    notify_job_started,
+)
+from services.audio import chunk_audio, sanitize_filename
+from services.cache import ArtifactStore, artifact_store, video_key
+from services.downloader import ProgressCallback, download_audio
+from services.groq_client import groq_clients
+from services.job_manager import JobManager, JobStatus, JobType, job_manager
+from services.media_probe import probe_media
+from services.progress import ProgressAggregator
+from services.transcriber import transcribe_file
+from utils.constants import (
+    CHUNK_WORKERS,
+    DOWNLOAD_WORKERS,
+    GROQ_MODEL,
+    GROQ_PROMPT,
+    PROGRESS_TICK_SECONDS,
+    TRANSCRIBE_WORKERS,
+)
+
+# (url, output_dir, cookies_path, progress_callback) -> (audio_path, title, info)
+Downloader = Callable[
+    [str, str, Optional[str], Optional[ProgressCallback]],
+    Tuple[Optional[str], Optional[str], dict],
+]
+# (audio_path) -> chunk dicts with "path", "index" and optionally "count",
+# possibly produced lazily while later chunks are still being cut
+Chunker = Callable[[str], Iterable[dict]]
+# (audio_path, api_key, language) -> transcript text or None
+Transcriber = Callable[[str, Optional[str], str], Optional[str]]
+# (api_key) -> None; opens the transcription backend's connection early
+Warmup = Callable[[str], None]
+
+# Share of item progress (0-100) reached when each stage finishes
+DOWNLOAD_PROGRESS = 45
+CHUNK_PROGRESS = 50
+
+
+@dataclass
+class ItemRun:
+    """Execution state for one JobItem as it moves through the stages."""
+
+    job_id: str
+    index: int  # position of the item within its job
+    url: str
+    video: Optional[str]
+    job_type: JobType
+    language: str
+    api_key: Optional[str]
+    cookies_path: Optional[str]
+    work_dir: str
+    title: Optional[str] = None
+    audio_path: Optional[str] = None
+    audio_hash: Optional[str] = None
+    chunk_count: int = 0  # chunks produced so far
+    expected_chunks: int = 1  # chunker's estimate of the total, for progress
+    pending_chunks: int = 0
+    chunking_done: bool = False
+    chunk_error: Optional[str] = None
+    transcripts: dict[int, str] = field(default_factory=dict)
+    failed_chunks: list[int] = field(default_factory=list)
+    last_progress: int = -1
+    ended: bool = False  # completed, failed or abandoned (exactly once)
+    lock: threading.Lock = field(default_factory=threading.Lock)
+
+
+class JobRunner:
+    """
+    Runs jobs from the JobManager on per-stage worker pools.
+
+    The download, chunk and transcribe backends are injectable so the
+    pipeline can be exercised against stubs (see benchmarks/). Finished
+    transcripts go into the artifact store (pass store=None to disable),
+    and the Groq connection is warmed when a job starts (warmup=None to
+    disable). Item progress is batched per job every `progress_tick`
+    seconds (0 to send each change as it happens).
+    """
+
+    def __init__(
+        self,
+        manager: JobManager = job_manager,
+        downloader: Downloader = download_audio,
+        chunker: Chunker = chunk_audio,
+        transcriber: Transcriber = transcribe_file,
+        store: Optional[ArtifactStore] = artifact_store,
+        warmup: Optional[Warmup] = groq_clients.warm,
+        download_workers: int = DOWNLOAD_WORKERS,
+        chunk_workers: int = CHUNK_WORKERS,
+        transcribe_workers: int = TRANSCRIBE_WORKERS,
+        progress_tick: float = PROGRESS_TICK_SECONDS,
+    ):
+        self.manager = manager
+        self.downloader = downloader
+        self.chunker = chunker
+        self.transcriber = transcriber
+        self.store = store
+        self.warmup = warmup
+        self.progress = ProgressAggregator(manager, tick=progress_tick)
+        self._download_pool = ThreadPoolExecutor(
+            max_workers=download_workers, thread_name_prefix="download"
+        )
+        self._chunk_pool = ThreadPoolExecutor(
+            max_workers=chunk_workers, thread_name_prefix="chunk"
+        )
+        self._transcribe_pool = ThreadPoolExecutor(
+            max_workers=transcribe_workers, thread_name_prefix="transcribe"
+        )
+        self._remaining: dict[str, int] = {}  # job_id -> unfinished item count
+        self._lock = threading.Lock()
+
+    def start_job(
+        self,
+        job_id: str,
+        api_key: Optional[str] = None,
+        cookies_path: Optional[str] = None,
+    ) -> bool:
+        """
+        Mark a pending job as running and queue all of its items.
+
+        Args:
+            job_id: The job to run
+            api_key: Groq API key (required unless job_type is download)
+            cookies_path: Optional cookies file for authenticated downloads
+
+        Returns:
+            True if the job was queued, False if it was not found or was
+            no longer pending
+        """
+        if not self.manager.claim_job(job_id):
+            return False
+        job = self.manager.get_job(job_id)
+        if not job:
+            return False
+
+        with self._lock:
+            self._remaining[job_id] = len(job.items)
+
+        notify_job_started(job_id)
+
+        # Connect to Groq while the first download runs, so the first chunk
+        # doesn't pay for the TLS handshake
+        if self.warmup and api_key and job.job_type != JobType.DOWNLOAD:
+            self._transcribe_pool.submit(self.warmup, api_key)
+
+        for index, item in enumerate(job.items):
+            run = ItemRun(
+                job_id=job_id,
+                index=index,
+                url=item.url,
+                video=video_key(item.platform, item.video_id),
+                job_type=job.job_type,
+                language=job.language,
+                api_key=api_key,
+                cookies_path=cookies_path,
+                work_dir=tempfile.mkdtemp(prefix=f"multifetch_{job_id}_"),
+            )
+            self._download_pool.submit(self._guard, self._download, run)
+
+        return True
+
+    def is_active(self, job_id: str) -> bool:
+        """Whether the runner still has unfinished items for a job."""
+        with self._lock:
+            return job_id in self._remaining
+
+    def shutdown(self, wait: bool = True):
+        """Stop accepting work and optionally wait for queued stages."""
+        for pool in (self._download_pool, self._chunk_pool, self._transcribe_pool):
+            pool.shutdown(wait=wait)
+        self.progress.stop()
+
+    # -- Stages -------------------------------------------------------------
+
+    def _guard(self, stage: Callable[[ItemRun], None], run: ItemRun, *args):
+        """Run a stage, failing the item on any unexpected exception."""
+        try:
+            stage(run, *args)
+        except Exception as e:
+            print(f"Stage {stage.__name__} failed for {run.url}: {e}")
+            self._fail(run, str(e))
+
+    def _download(self, run: ItemRun):
+        if self._is_cancelled(run):
+            return self._abandon(run)
+
+        self._report(run, 0)
+        if run.job_type != JobType.DOWNLOAD and self._complete_from_cache(run):
+            return
+
+        def on_progress(fraction: float):
+            self._report(run, int(fraction * DOWNLOAD_PROGRESS))
+
+        audio_path, title, info = self.downloader(
+            run.url, run.work_dir, run.cookies_path, on_progress
+        )
+        if not audio_path:
+            error = (info or {}).get("error", "Unknown error")
+            return self._fail(run, f"Download failed: {error}")
+
+        run.audio_path = audio_path
+        run.title = title
+        if run.job_type != JobType.DOWNLOAD:
+            # Seed the probe cache with yt-dlp's duration so chunking
+            # never has to spawn ffprobe for this file
+            try:
+                probe_media(audio_path, known_duration=(info or {}).get("duration"))
+            except (OSError, ValueError) as e:
+                print(f"Could not probe {audio_path}: {e}")
+        self.manager.update_item_status(
+            run.job_id,
+            run.url,
+            JobStatus.RUNNING,
+            progress=DOWNLOAD_PROGRESS,
+            title=title,
+            audio_path=audio_path,
+            index=run.index,
+        )
+
+        if run.job_type == JobType.DOWNLOAD:
+            return self._complete(run, transcript=None)
+
+        self._chunk_pool.submit(self._guard, self._chunk, run)
+
+    def _chunk(self, run: ItemRun):
+        if self._is_cancelled(run):
+            return self._abandon(run)
+
+        if self.store:
+            transcript, run.audio_hash = self.store.find_transcript(
+                GROQ_MODEL, run.language, GROQ_PROMPT, audio_path=run.audio_path
+            )
+            if transcript:
+                return self._complete(run, transcript)
+
+        self._report(run, CHUNK_PROGRESS)
+
+        # Hand each chunk to transcription as soon as the chunker yields it
+        try:
+            for chunk in self.chunker(run.audio_path):
+                with run.lock:
+                    run.chunk_count += 1
+                    run.pending_chunks += 1
+                    run.expected_chunks = chunk.get("count", run.chunk_count)
+                self._transcribe_pool.submit(self._guard, self._transcribe, run, chunk)
+                if self._is_cancelled(run):
+                    break
+        except Exception as e:
+            print(f"Error chunking {run.url}: {e}")
+            run.chunk_error = f"Chunking failed: {e}"
+
+        with run.lock:
+            run.chunking_done = True
+            finished = run.pending_chunks == 0
+        if finished:
+            self._finish(run)
+
+    def _transcribe(self, run: ItemRun, chunk: dict):
+        text = None
+        try:
+            if not self._is_cancelled(run):
+                text = self.transcriber(chunk["path"], run.api_key, run.language)
+        except Exception as e:
+            print(f"Error transcribing chunk {chunk['index']} of {run.url}: {e}")
+        finally:
+            if chunk["path"] != run.audio_path:
+                _remove_file(chunk["path"])
+
+        with run.lock:
+            # An empty transcript is a silent chunk; None is a failure
+            if text is None:
+                run.failed_chunks.append(chunk["index"])
+            else:
+                run.transcripts[chunk["index"]] = text
+            run.pending_chunks -= 1
+            done = run.chunk_count - run.pending_chunks
+            total = max(run.expected_chunks, run.chunk_count)
+            finished = run.chunking_done and run.pending_chunks == 0
+
+        if not finished:
+            share = (100 - CHUNK_PROGRESS) * done // total
+            return self._report(run, CHUNK_PROGRESS + share)
+        self._finish(run)
+
+    def _finish(self, run: ItemRun):
+        """Join chunk transcripts once chunking and every transcription is done."""
+        if self._is_cancelled(run):
+            return self._abandon(run)
+        if run.chunk_error:
+            return self._fail(run, run.chunk_error)
+        if not run.chunk_count:
+            return self._fail(run, "Chunking produced no audio")
+        if run.failed_chunks:
+            # A transcript with holes in it is worse than a clear failure
+            failed = ", ".join(str(i + 1) for i in sorted(run.failed_chunks))
+            return self._fail(
+                run, f"Transcription failed for chunk(s) {failed} of {run.chunk_count}"
+            )
+
+        transcript = " ".join(
+            run.transcripts[i] for i in sorted(run.transcripts) if run.transcripts[i]
+        )
+        if self.store and run.audio_hash:
+            self.store.put_transcript(
+                run.audio_hash, GROQ_MODEL, run.language, GROQ_PROMPT, transcript
+            )
+        self._complete(run, transcript)
+
+    def _complete_from_cache(self, run: ItemRun) -> bool:
+        """Complete an item straight from the artifact store, skipping all stages."""
+        if not self.store:
+            return False
+
+        transcript, _ = self.store.find_transcript(
+            GROQ_MODEL, run.language, GROQ_PROMPT, url=run.url, video=run.video
+        )
+        if not transcript:
+            return False
+
+        entry = self.store.lookup(url=run.url, video=run.video)
+        run.title = entry["title"] if entry else None
+        if run.job_type == JobType.FULL:
+            run.audio_path = self._audio_from_cache(run)
+        if not run.audio_path:
+            shutil.rmtree(run.work_dir, ignore_errors=True)
+        self.manager.update_item_status(
+            run.job_id,
+            run.url,
+            JobStatus.RUNNING,
+            title=run.title,
+            audio_path=run.audio_path,
+            index=run.index,
+        )
+        self._complete(run, transcript)
+        return True
+
+    def _audio_from_cache(self, run: ItemRun) -> Optional[str]:
+        """
+        Link the cached audio for an item into its work directory.
+
+        The job gets its own link (or copy, across filesystems) rather than
+        a path into the store, so cache eviction can't delete audio the job
+        still serves, and retention removes it with the work directory.
+        """
+        cached_audio = self.store.get_audio(url=run.url, video=run.video)
+        if not cached_audio:
+            return None
+        source = cached_audio["path"]
+        name = sanitize_filename(run.title or "audio") + os.path.splitext(source)[1]
+        path = os.path.join(run.work_dir, name)
+        try:
+            try:
+                os.link(source, path)
+            except OSError:
+                shutil.copyfile(source, path)
+        except OSError as e:
+            # Evicted since the lookup
+            print(f"Could not link cached audio for {run.url}: {e}")
+            return None
+        return path
+
+    # -- Item lifecycle -----------------------------------------------------
+
+    def _report(self, run: ItemRun, progress: int):
+        """Queue item progress for the next batch, skipping unchanged values."""
+        with run.lock:
+            if progress == run.last_progress:
+                return
+            run.last_progress = progress
+        self.progress.report(run.job_id, run.index, run.url, progress)
+
+    def _complete(self, run: ItemRun, transcript: Optional[str]):
+        self._end(run, JobStatus.COMPLETED, transcript=transcript)
+
+    def _fail(self, run: ItemRun, error: str):
+        self._end(run, JobStatus.FAILED, error=error)
+
+    def _abandon(self, run: ItemRun):
+        """Drop an item of a cancelled job without touching its status."""
+        self._end(run, JobStatus.CANCELLED)
+
+    def _end(
+        self,
+        run: ItemRun,
+        status: JobStatus,
+        transcript: Optional[str] = None,
+        error: Optional[str] = None,
+    ):
+        """
+        Record an item's outcome and release it, once per item.
+
+        Later calls (say, _guard failing an item whose completion raised
+        halfway) are no-ops, and the item is released even if recording
+        the outcome raises, so its job always finishes.
+        """
+        with run.lock:
+            if run.ended:
+                return
+            run.ended = True
+        self.progress.discard(run.job_id, run.index)
+        try:
+            if status == JobStatus.CANCELLED or self._is_cancelled(run):
+                shutil.rmtree(run.work_dir, ignore_errors=True)
+            elif status == JobStatus.COMPLETED:
+                self._record_complete(run, transcript)
+            else:
+                self._record_failure(run, error)
+        except Exception as e:
+            print(f"Could not record the outcome of {run.url}: {e}")
+            if status == JobStatus.COMPLETED:
+                try:
+                    self._record_failure(run, f"Could not save the result: {e}")
+                except Exception as e2:
+                    print(f"Could not record the failure of {run.url}: {e2}")
+        finally:
+            self._release(run)
+
+    def _record_complete(self, run: ItemRun, transcript: Optional[str]):
+        self.manager.update_item_status(
+            run.job_id,
+            run.url,
+            JobStatus.COMPLETED,
+            progress=100,
+            transcript=transcript,
+            index=run.index,
+        )
+        notify_item_complete(
+            run.job_id, run.url, run.title, transcript, index=run.index
+        )
+
+        # Transcribe-only jobs don't keep the audio around
+        if run.job_type == JobType.TRANSCRIBE:
+            shutil.rmtree(run.work_dir, ignore_errors=True)
+
+    def _record_failure(self, run: ItemRun, error: str):
+        self.manager.update_item_status(
+            run.job_id,
+            run.url,
+            JobStatus.FAILED,
+            progress=0,
+            error=error,
+            index=run.index,
+        )
+        notify_item_failed(run.job_id, run.url, error, index=run.index)
+        shutil.rmtree(run.work_dir, ignore_errors=True)
+
+    def _release(self, run: ItemRun):
+        """Mark an item as finished and publish job completion after the last."""
+        with self._lock:
+            self._remaining[run.job_id] -= 1
+            if self._remaining[run.job_id] > 0:
+                return
+            del self._remaining[run.job_id]
+
+        if not self._is_cancelled(run):
+            notify_job_complete(run.job_id)
+
+    def _is_cancelled(self, run: ItemRun) -> bool:
+        job = self.manager.get_job(run.job_id)
+        return job is None or job.status == JobStatus.CANCELLED
+
+
+def _remove_file(path: str):
+    try:
+        os.unlink(path)
+    except OSError:
+        pass
+
+
+# Global job runner instance
+job_runner = JobRunner()
@@ -0,0 +1,822 @@
+"""
+Job storage backends for MultiFetch v2.
+
+JobManager keeps jobs in one of these stores, picked by JOB_STORE_URL:
+
+- memory:// (default): a dict in this process
+- sqlite:///path/to/jobs.db: one WAL-mode SQLite file, shared by every
+  gunicorn worker on the host
+- redis://host:6379/0: any Redis-compatible server, shared across hosts
+
+All changes to an existing job go through update(), which applies a
+mutation function atomically (a lock, a write transaction, or a
+WATCH/MULTI optimistic retry), so concurrent item updates from different
+threads or processes never overwrite each other.
+
+Every store keeps jobs ordered by (created_at, id), so listing walks an
+index from a page cursor instead of sorting every job, and each store can
+return summary projections without loading items and transcripts.
+
+Stores also keep each job's SSE event log: a sequence number assigned
+atomically by append_event() and the latest SSE_REPLAY_EVENTS events.
+Both live as long as the job does (they are deleted with it), so every
+process streaming the job sees the same numbering and can replay from it.
+"""
+
+import base64
+import bisect
+import json
+import sqlite3
+import threading
+import time
+from collections import deque
+from dataclasses import asdict
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Optional, TypeVar
+
+from services.job_manager import Job, JobItem, JobStatus, JobType
+from utils.constants import SSE_REPLAY_EVENTS
+
+try:
+    import redis
+except ImportError:  # only needed for redis:// job stores
+    redis = None
+
+T = TypeVar("T")
+
+# (seq, event type, JSON data) as kept in a job's event log, oldest first
+# (an alias: inside the store classes, `list` is their list() method)
+Events = list[tuple[int, str, str]]
+
+_ITEM_DATETIMES = ("started_at", "completed_at")
+_JOB_DATETIMES = ("created_at", "started_at", "completed_at")
+
+
+def job_to_json(job: Job) -> str:
+    """Serialize a job, including item transcripts and audio paths."""
+    return json.dumps(
+        asdict(job), default=lambda value: value.isoformat(), separators=(",", ":")
+    )
+
+
+def job_from_json(data: str) -> Job:
+    """Rebuild a Job from job_to_json() output."""
+    record = json.loads(data)
+    items = []
+    for item in record.pop("items"):
+        item["status"] = JobStatus(item["status"])
+        for key in _ITEM_DATETIMES:
+            item[key] = _parse_datetime(item[key])
+        items.append(JobItem(**item))
+
+    record["job_type"] = JobType(record["job_type"])
+    record["status"] = JobStatus(record["status"])
+    for key in _JOB_DATETIMES:
+        record[key] = _parse_datetime(record[key])
+    return Job(items=items, **record)
+
+
+def _parse_datetime(value: Optional[str]) -> Optional[datetime]:
+    return datetime.fromisoformat(value) if value else None
+
+
+def _sort_key(created_at: datetime) -> str:
+    """Fixed-width timestamp, so string order matches time order."""
+    return created_at.strftime("%Y-%m-%dT%H:%M:%S.%f")
+
+
+def make_cursor(created_at: datetime, job_id: str) -> str:
+    """Opaque page cursor pointing just past the given job."""
+    raw = f"{_sort_key(created_at)}|{job_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def read_cursor(cursor: str) -> tuple[str, str]:
+    """
+    Decode a page cursor into (sort key, job id).
+
+    Raises:
+        ValueError: If the cursor wasn't produced by make_cursor()
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        created_at, job_id = raw.split("|", 1)
+        datetime.fromisoformat(created_at)
+    except (ValueError, UnicodeDecodeError) as e:
+        raise ValueError(f"Invalid cursor: {cursor!r}") from e
+    return created_at, job_id
+
+
+class JobStore:
+    """Interface for job storage backends."""
+
+    # Whether every process using the store runs on this host, so files
+    # referenced from jobs (spilled transcripts) are readable by all of them
+    host_local = True
+
+    def put(self, job: Job):
+        """Insert (or replace) a job."""
+        raise NotImplementedError
+
+    def get(self, job_id: str) -> Optional[Job]:
+        """Get a job by ID, or None."""
+        raise NotImplementedError
+
+    def list_summaries(
+        self,
+        limit: int = 50,
+        cursor: Optional[str] = None,
+        statuses: Optional[set[JobStatus]] = None,
+    ) -> list[dict]:
+        """Like list() below, but Job.to_summary() dicts."""
+        return [job.to_summary() for job in self.list(limit, cursor, statuses)]
+
+    def list(
+        self,
+        limit: int = 50,
+        cursor: Optional[str] = None,
+        statuses: Optional[set[JobStatus]] = None,
+    ) -> list[Job]:
+        """
+        Recent jobs, newest first.
+
+        Args:
+            limit: Maximum number of jobs
+            cursor: Only jobs older than this make_cursor() position
+            statuses: Only jobs in one of these statuses
+        """
+        raise NotImplementedError
+
+    def update(self, job_id: str, mutate: Callable[[Job], T]) -> Optional[T]:
+        """
+        Atomically apply `mutate` to a stored job.
+
+        Args:
+            job_id: The job to change
+            mutate: Function that modifies the job in place; it may be
+                called more than once if a concurrent writer wins a race
+
+        Returns:
+            mutate's return value, or None if the job doesn't exist
+        """
+        raise NotImplementedError
+
+    def transition(
+        self,
+        job_id: str,
+        expected: JobStatus,
+        status: JobStatus,
+        mutate: Optional[Callable[[Job], None]] = None,
+    ) -> bool:
+        """
+        Atomically move a job from one status to another (compare-and-set).
+
+        Args:
+            job_id: The job to change
+            expected: Status the job must be in
+            status: Status to set
+            mutate: Optional further changes, applied with the new status
+
+        Returns:
+            True if the job was in `expected` and now is in `status`
+        """
+
+        def apply(job: Job) -> bool:
+            if job.status != expected:
+                return False
+            job.status = status
+            if mutate:
+                mutate(job)
+            return True
+
+        return bool(self.update(job_id, apply))
+
+    def delete(self, job_id: str) -> bool:
+        """Delete a job (and its events); returns False if it didn't exist."""
+        raise NotImplementedError
+
+    def acquire_lease(self, name: str, owner: str, ttl: float) -> bool:
+        """
+        Take or renew a named lease, so one process does a shared chore.
+
+        Args:
+            name: The lease
+            owner: Unique ID of the calling process
+            ttl: Seconds the lease lasts unless renewed
+
+        Returns:
+            True if `owner` holds the lease for the next `ttl` seconds
+        """
+        raise NotImplementedError
+
+    def append_event(self, job_id: str, event: str, data: str) -> int:
+        """
+        Add an event to a job's log, keeping the latest SSE_REPLAY_EVENTS.
+
+        Events for jobs that no longer exist (late publishes from the runner
+        threads of a deleted job) are dropped, so they can't leave a log
+        behind that nothing deletes.
+
+        Args:
+            job_id: The job ID
+            event: SSE event type
+            data: JSON-encoded event data
+
+        Returns:
+            The event's sequence number (1 for a job's first event), or 0
+            if it was dropped
+        """
+        raise NotImplementedError
+
+    def last_event_seq(self, job_id: str) -> int:
+        """Sequence number of a job's latest event (0 if it has none)."""
+        raise NotImplementedError
+
+    def events_after(self, job_id: str, after: int) -> Optional[Events]:
+        """
+        A job's events with a sequence number above `after`, oldest first.
+
+        Returns:
+            The events, or None if some of them are no longer kept
+        """
+        raise NotImplementedError
+
+
+def _events_after(kept: Events, after: int) -> Optional[Events]:
+    """events_after() from the kept events past `after`: None on a gap."""
+    if kept and kept[0][0] != after + 1:
+        return None
+    return kept
+
+
+class MemoryJobStore(JobStore):
+    """
+    Jobs in a dict, visible to this process only.
+
+    A registry lock guards only the dict itself; each job has its own lock
+    for updates, so writers to different jobs never wait on each other.
+    """
+
+    def __init__(self):
+        self._jobs: dict[str, tuple[Job, threading.Lock]] = {}
+        # (sort key, job id) ascending; new jobs almost always append
+        self._order: list[tuple[str, str]] = []
+        self._lock = threading.Lock()  # registry lock: _jobs/_order only
+        # job_id -> (last seq, latest events); guarded by _events_lock
+        self._events: dict[str, tuple[int, deque]] = {}
+        self._events_lock = threading.Lock()
+        self._leases: dict[str, tuple[str, float]] = {}  # name -> (owner, expiry)
+
+    def put(self, job: Job):
+        key = (_sort_key(job.created_at), job.id)
+        with self._lock:
+            if job.id in self._jobs:
+                self._unindex(self._jobs[job.id][0])
+            self._jobs[job.id] = (job, threading.Lock())
+            if not self._order or key > self._order[-1]:
+                self._order.append(key)
+            else:
+                bisect.insort(self._order, key)
+
+    def get(self, job_id: str) -> Optional[Job]:
+        with self._lock:
+            entry = self._jobs.get(job_id)
+        return entry[0] if entry else None
+
+    def list(
+        self,
+        limit: int = 50,
+        cursor: Optional[str] = None,
+        statuses: Optional[set[JobStatus]] = None,
+    ) -> list[Job]:
+        jobs = []
+        with self._lock:
+            if cursor:
+                end = bisect.bisect_left(self._order, read_cursor(cursor))
+            else:
+                end = len(self._order)
+            # Walk the index newest-first from the cursor; stops after
+            # `limit` matches instead of touching every job
+            for position in range(end - 1, -1, -1):
+                job = self._jobs[self._order[position][1]][0]
+                if statuses and job.status not in statuses:
+                    continue
+                jobs.append(job)
+                if len(jobs) == limit:
+                    break
+        return jobs
+
+    def update(self, job_id: str, mutate: Callable[[Job], T]) -> Optional[T]:
+        with self._lock:
+            entry = self._jobs.get(job_id)
+        if not entry:
+            return None
+        job, job_lock = entry
+        with job_lock:
+            return mutate(job)
+
+    def delete(self, job_id: str) -> bool:
+        with self._lock:
+            entry = self._jobs.pop(job_id, None)
+            if entry:
+                self._unindex(entry[0])
+        # After the job is gone, so append_event can't recreate the log
+        with self._events_lock:
+            self._events.pop(job_id, None)
+        return entry is not None
+
+    def acquire_lease(self, name: str, owner: str, ttl: float) -> bool:
+        now = time.time()
+        with self._lock:
+            holder, expires_at = self._leases.get(name, (owner, 0.0))
+            if holder != owner and expires_at > now:
+                return False
+            self._leases[name] = (owner, now + ttl)
+            return True
+
+    def append_event(self, job_id: str, event: str, data: str) -> int:
+        with self._events_lock:
+            with self._lock:
+                if job_id not in self._jobs:
+                    return 0
+            entry = self._events.get(job_id)
+            seq, events = entry or (0, deque(maxlen=SSE_REPLAY_EVENTS))
+            seq += 1
+            events.append((seq, event, data))
+            self._events[job_id] = (seq, events)
+            return seq
+
+    def last_event_seq(self, job_id: str) -> int:
+        with self._events_lock:
+            entry = self._events.get(job_id)
+            return entry[0] if entry else 0
+
+    def events_after(self, job_id: str, after: int) -> Optional[Events]:
+        with self._events_lock:
+            _, events = self._events.get(job_id) or (0, ())
+            kept = [e for e in events if e[0] > after]
+        return _events_after(kept, after)
+
+    def _unindex(self, job: Job):
+        """Drop a job from _order (registry lock held)."""
+        key = (_sort_key(job.created_at), job.id)
+        index = bisect.bisect_left(self._order, key)
+        if index < len(self._order) and self._order[index] == key:
+            del self._order[index]
+
+
+class SQLiteJobStore(JobStore):
+    """
+    Jobs in a WAL-mode SQLite database, shared by processes on one host.
+
+    Each thread gets its own connection; updates run in BEGIN IMMEDIATE
+    transactions so read-modify-write cycles are serialized across
+    processes. Status and a JSON summary are kept in their own columns,
+    so listing pages through an index and never parses item data.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._local = threading.local()
+        conn = self._conn()
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS jobs ("
+            "id TEXT PRIMARY KEY, created_at TEXT NOT NULL, status TEXT, "
+            "summary TEXT, data TEXT NOT NULL)"
+        )
+        self._migrate(conn)
+        conn.execute("DROP INDEX IF EXISTS jobs_created")
+        conn.execute(
+            "CREATE INDEX IF NOT EXISTS jobs_by_created ON jobs (created_at, id)"
+        )
+        conn.execute(
+            "CREATE INDEX IF NOT EXISTS jobs_by_status ON jobs (status, created_at, id)"
+        )
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS job_events ("
+            "job_id TEXT NOT NULL, seq INTEGER NOT NULL, event TEXT NOT NULL, "
+            "data TEXT NOT NULL, PRIMARY KEY (job_id, seq)) WITHOUT ROWID"
+        )
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS leases ("
+            "name TEXT PRIMARY KEY, owner TEXT NOT NULL, expires_at REAL NOT NULL)"
+        )
+
+    def _migrate(self, conn: sqlite3.Connection):
+        """Add the status/summary columns to databases created without them."""
+        columns = {row[1] for row in conn.execute("PRAGMA table_info(jobs)")}
+        if "summary" in columns:
+            return
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.execute("ALTER TABLE jobs ADD COLUMN status TEXT")
+            conn.execute("ALTER TABLE jobs ADD COLUMN summary TEXT")
+            for job_id, data in conn.execute("SELECT id, data FROM jobs").fetchall():
+                job = job_from_json(data)
+                conn.execute(
+                    "UPDATE jobs SET created_at = ?, status = ?, summary = ? "
+                    "WHERE id = ?",
+                    (*self._columns(job), job_id),
+                )
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            # Autocommit mode: transactions are opened explicitly in update()
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    @staticmethod
+    def _columns(job: Job) -> tuple[str, str, str]:
+        """(created_at, status, summary) column values for a job."""
+        summary = json.dumps(job.to_summary(), separators=(",", ":"))
+        return _sort_key(job.created_at), job.status.value, summary
+
+    def put(self, job: Job):
+        self._conn().execute(
+            "INSERT OR REPLACE INTO jobs (id, created_at, status, summary, data) "
+            "VALUES (?, ?, ?, ?, ?)",
+            (job.id, *self._columns(job), job_to_json(job)),
+        )
+
+    def get(self, job_id: str) -> Optional[Job]:
+        row = (
+            self._conn()
+            .execute("SELECT data FROM jobs WHERE id = ?", (job_id,))
+            .fetchone()
+        )
+        return job_from_json(row[0]) if row else None
+
+    def _select(
+        self,
+        column: str,
+        limit: int,
+        cursor: Optional[str],
+        statuses: Optional[set[JobStatus]],
+    ) -> list[str]:
+        where, params = [], []
+        if cursor:
+            where.append("(created_at, id) < (?, ?)")
+            params.extend(read_cursor(cursor))
+        if statuses:
+            where.append(f"status IN ({', '.join('?' * len(statuses))})")
+            params.extend(status.value for status in statuses)
+        clause = f"WHERE {' AND '.join(where)} " if where else ""
+        rows = self._conn().execute(
+            f"SELECT {column} FROM jobs {clause}"
+            "ORDER BY created_at DESC, id DESC LIMIT ?",
+            (*params, limit),
+        )
+        return [value for (value,) in rows]
+
+    def list_summaries(
+        self,
+        limit: int = 50,
+        cursor: Optional[str] = None,
+        statuses: Optional[set[JobStatus]] = None,
+    ) -> list[dict]:
+        return [
+            json.loads(summary)
+            for summary in self._select("summary", limit, cursor, statuses)
+        ]
+
+    def list(
+        self,
+        limit: int = 50,
+        cursor: Optional[str] = None,
+        statuses: Optional[set[JobStatus]] = None,
+    ) -> list[Job]:
+        return [
+            job_from_json(data)
+            for data in self._select("data", limit, cursor, statuses)
+        ]
+
+    def update(
+        self,
+        job_id: str,
+        mutate: Callable[[Job], T],
+        status: Optional[JobStatus] = None,
+    ) -> Optional[T]:
+        """update(), or only if the job is in `status` (None otherwise)."""
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            if status is None:
+                row = conn.execute(
+                    "SELECT data FROM jobs WHERE id = ?", (job_id,)
+                ).fetchone()
+            else:
+                row = conn.execute(
+                    "SELECT data FROM jobs WHERE id = ? AND status = ?",
+                    (job_id, status.value),
+                ).fetchone()
+            if not row:
+                conn.execute("ROLLBACK")
+                return None
+            job = job_from_json(row[0])
+            result = mutate(job)
+            _, status, summary = self._columns(job)
+            conn.execute(
+                "UPDATE jobs SET status = ?, summary = ?, data = ? WHERE id = ?",
+                (status, summary, job_to_json(job), job_id),
+            )
+            conn.execute("COMMIT")
+            return result
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+
+    def transition(
+        self,
+        job_id: str,
+        expected: JobStatus,
+        status: JobStatus,
+        mutate: Optional[Callable[[Job], None]] = None,
+    ) -> bool:
+        # Filtered on the status column, so a lost race writes nothing
+        def apply(job: Job) -> bool:
+            job.status = status
+            if mutate:
+                mutate(job)
+            return True
+
+        return bool(self.update(job_id, apply, status=expected))
+
+    def delete(self, job_id: str) -> bool:
+        conn = self._conn()
+        conn.execute("DELETE FROM job_events WHERE job_id = ?", (job_id,))
+        cursor = conn.execute("DELETE FROM jobs WHERE id = ?", (job_id,))
+        return cursor.rowcount > 0
+
+    def acquire_lease(self, name: str, owner: str, ttl: float) -> bool:
+        now = time.time()
+        cursor = self._conn().execute(
+            "INSERT INTO leases (name, owner, expires_at) VALUES (?, ?, ?) "
+            "ON CONFLICT (name) DO UPDATE SET owner = excluded.owner, "
+            "expires_at = excluded.expires_at "
+            "WHERE leases.owner = excluded.owner OR leases.expires_at <= ?",
+            (name, owner, now + ttl, now),
+        )
+        return cursor.rowcount > 0
+
+    def append_event(self, job_id: str, event: str, data: str) -> int:
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            if not conn.execute(
+                "SELECT 1 FROM jobs WHERE id = ?", (job_id,)
+            ).fetchone():
+                conn.execute("COMMIT")
+                return 0
+            seq = self.last_event_seq(job_id) + 1
+            conn.execute(
+                "INSERT INTO job_events (job_id, seq, event, data) VALUES (?, ?, ?, ?)",
+                (job_id, seq, event, data),
+            )
+            # The latest event is never trimmed, so MAX(seq) stays the seq
+            conn.execute(
+                "DELETE FROM job_events WHERE job_id = ? AND seq <= ?",
+                (job_id, seq - SSE_REPLAY_EVENTS),
+            )
+            conn.execute("COMMIT")
+            return seq
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+
+    def last_event_seq(self, job_id: str) -> int:
+        row = (
+            self._conn()
+            .execute("SELECT MAX(seq) FROM job_events WHERE job_id = ?", (job_id,))
+            .fetchone()
+        )
+        return row[0] or 0
+
+    def events_after(self, job_id: str, after: int) -> Optional[Events]:
+        rows = self._conn().execute(
+            "SELECT seq, event, data FROM job_events WHERE job_id = ? AND seq > ? "
+            "ORDER BY seq",
+            (job_id, after),
+        )
+        return _events_after(rows.fetchall(), after)
+
+
+# Next seq (INCR) and the event under it, trimming the log to ARGV[3] events;
+# members are "seq|event|data" scored by seq. Returns 0 without adding the
+# event if the job (KEYS[3]) no longer exists
+_APPEND_EVENT = """
+if redis.call("EXISTS", KEYS[3]) == 0 then
+    return 0
+end
+local seq = redis.call("INCR", KEYS[1])
+redis.call("ZADD", KEYS[2], seq, seq .. "|" .. ARGV[1] .. "|" .. ARGV[2])
+redis.call("ZREMRANGEBYSCORE", KEYS[2], "-inf", seq - tonumber(ARGV[3]))
+return seq
+"""
+
+
+# Set the lease to ARGV[1] for ARGV[2] ms if it's free or already ARGV[1]'s
+_ACQUIRE_LEASE = """
+local holder = redis.call("GET", KEYS[1])
+if holder and holder ~= ARGV[1] then
+    return 0
+end
+redis.call("SET", KEYS[1], ARGV[1], "PX", ARGV[2])
+return 1
+"""
+
+
+class RedisJobStore(JobStore):
+    """
+    Jobs in a Redis-compatible server, shared across hosts.
+
+    Each job is one JSON string key, with its summary in a hash. A
+    lexicographic sorted set of "created_at|id" members indexes them, so
+    pages are ZREVRANGEBYLEX reads from the cursor. Updates use WATCH/MULTI
+    and retry when another writer got there first.
+    """
+
+    host_local = False
+
+    def __init__(self, url: str, prefix: str = "multifetch"):
+        if redis is None:
+            raise RuntimeError(
+                "JOB_STORE_URL points at Redis but the redis package is not installed"
+            )
+        self._redis = redis.Redis.from_url(url)
+        self._prefix = prefix
+        self._index = f"{prefix}:jobs"
+        self._summaries = f"{prefix}:summaries"
+        self._append_event = self._redis.register_script(_APPEND_EVENT)
+        self._acquire_lease = self._redis.register_script(_ACQUIRE_LEASE)
+
+    def _key(self, job_id: str) -> str:
+        return f"{self._prefix}:job:{job_id}"
+
+    def _seq_key(self, job_id: str) -> str:
+        return f"{self._prefix}:seq:{job_id}"
+
+    def _events_key(self, job_id: str) -> str:
+        return f"{self._prefix}:events:{job_id}"
+
+    @staticmethod
+    def _member(created_at: str, job_id: str) -> str:
+        return f"{created_at}|{job_id}"
+
+    @staticmethod
+    def _summary(job: Job) -> str:
+        return json.dumps(job.to_summary(), separators=(",", ":"))
+
+    def put(self, job: Job):
+        pipe = self._redis.pipeline()
+        pipe.set(self._key(job.id), job_to_json(job))
+        pipe.hset(self._summaries, job.id, self._summary(job))
+        pipe.zadd(self._index, {self._member(_sort_key(job.created_at), job.id): 0})
+        pipe.execute()
+
+    def get(self, job_id: str) -> Optional[Job]:
+        data = self._redis.get(self._key(job_id))
+        return job_from_json(data) if data else None
+
+    def _page(
+        self,
+        limit: int,
+        cursor: Optional[str],
+        statuses: Optional[set[JobStatus]],
+    ) -> list[tuple[str, dict]]:
+        """(job id, summary) pairs for one page, newest first."""
+        wanted = {status.value for status in statuses} if statuses else None
+        start = "(" + self._member(*read_cursor(cursor)) if cursor else "+"
+        batch = limit if wanted is None else max(limit * 4, 100)
+        page: list[tuple[str, dict]] = []
+        while len(page) < limit:
+            members = self._redis.zrevrangebylex(
+                self._index, start, "-", start=0, num=batch
+            )
+            if not members:
+                break
+            job_ids = [member.decode().split("|", 1)[1] for member in members]
+            for job_id, summary in zip(
+                job_ids, self._redis.hmget(self._summaries, job_ids)
+            ):
+                if summary is None:
+                    continue
+                summary = json.loads(summary)
+                if wanted is None or summary["status"] in wanted:
+                    page.append((job_id, summary))
+                    if len(page) == limit:
+                        break
+            start = "(" + members[-1].decode()
+        return page
+
+    def list_summaries(
+        self,
+        limit: int = 50,
+        cursor: Optional[str] = None,
+        statuses: Optional[set[JobStatus]] = None,
+    ) -> list[dict]:
+        return [summary for _, summary in self._page(limit, cursor, statuses)]
+
+    def list(
+        self,
+        limit: int = 50,
+        cursor: Optional[str] = None,
+        statuses: Optional[set[JobStatus]] = None,
+    ) -> list[Job]:
+        job_ids = [job_id for job_id, _ in self._page(limit, cursor, statuses)]
+        if not job_ids:
+            return []
+        values = self._redis.mget([self._key(job_id) for job_id in job_ids])
+        return [job_from_json(data) for data in values if data]
+
+    def update(self, job_id: str, mutate: Callable[[Job], T]) -> Optional[T]:
+        key = self._key(job_id)
+        with self._redis.pipeline() as pipe:
+            while True:
+                try:
+                    pipe.watch(key)
+                    data = pipe.get(key)
+                    if not data:
+                        pipe.unwatch()
+                        return None
+                    job = job_from_json(data)
+                    result = mutate(job)
+                    pipe.multi()
+                    pipe.set(key, job_to_json(job))
+                    pipe.hset(self._summaries, job_id, self._summary(job))
+                    pipe.execute()
+                    return result
+                except redis.WatchError:
+                    continue
+
+    def delete(self, job_id: str) -> bool:
+        summary = self._redis.hget(self._summaries, job_id)
+        pipe = self._redis.pipeline()
+        pipe.delete(self._key(job_id))
+        pipe.delete(self._seq_key(job_id), self._events_key(job_id))
+        pipe.hdel(self._summaries, job_id)
+        if summary:
+            created_at = datetime.fromisoformat(json.loads(summary)["created_at"])
+            pipe.zrem(self._index, self._member(_sort_key(created_at), job_id))
+        deleted = pipe.execute()[0]
+        return deleted > 0
+
+    def acquire_lease(self, name: str, owner: str, ttl: float) -> bool:
+        return bool(
+            self._acquire_lease(
+                keys=[f"{self._prefix}:lease:{name}"], args=[owner, int(ttl * 1000)]
+            )
+        )
+
+    def append_event(self, job_id: str, event: str, data: str) -> int:
+        return int(
+            self._append_event(
+                keys=[
+                    self._seq_key(job_id),
+                    self._events_key(job_id),
+                    self._key(job_id),
+                ],
+                args=[event, data, SSE_REPLAY_EVENTS],
+            )
+        )
+
+    def last_event_seq(self, job_id: str) -> int:
+        return int(self._redis.get(self._seq_key(job_id)) or 0)
+
+    def events_after(self, job_id: str, after: int) -> Optional[Events]:
+        members = self._redis.zrangebyscore(
+            self._events_key(job_id), f"({after}", "+inf"
+        )
+        kept = []
+        for member in members:
+            seq, event, data = member.decode().split("|", 2)
+            kept.append((int(seq), event, data))
+        return _events_after(kept, after)
+
+
+def create_job_store(url: str) -> JobStore:
+    """
+    Build a job store from a URL.
+
+    Args:
+        url: "memory://", "sqlite:///path/to/jobs.db" or "redis://..."
+
+    Raises:
+        ValueError: If the URL scheme isn't supported
+    """
+    if not url or url == "memory://":
+        return MemoryJobStore()
+    if url.startswith("sqlite:///"):
+        return SQLiteJobStore(url[len("sqlite:///") :])
+    if url.startswith(("redis://", "rediss://", "unix://")):
+        return RedisJobStore(url)
+    raise ValueError(f"Unsupported JOB_STORE_URL: {url}")
@@ -0,0 +1,223 @@
+"""
+Media probing service for MultiFetch v2.
+
+Reads duration, bitrate, sample rate and codec without decoding audio:
+MP3 files are parsed from their frame header (and Xing/Info/VBRI tag) in
+pure Python, anything else falls back to ffprobe. Results are cached per
+file (path, size and mtime), so repeat probes of the same download are
+free.
+"""
+
+import json
+import os
+import subprocess
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Optional, Tuple
+
+# Bytes scanned after the ID3 tag when looking for the first MP3 frame
+MP3_SYNC_SCAN_BYTES = 64 * 1024
+PROBE_CACHE_SIZE = 256
+
+# Layer III bitrates (kbps) by bitrate index, for MPEG-1 and MPEG-2/2.5
+_MP3_BITRATES = {
+    1: (0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320),
+    2: (0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160),
+}
+_MP3_SAMPLE_RATES = (44100, 48000, 32000)
+
+
+@dataclass(frozen=True)
+class MediaInfo:
+    """Container-level facts about an audio file."""
+
+    duration: float  # seconds
+    bit_rate: Optional[int] = None  # bits per second
+    sample_rate: Optional[int] = None
+    channels: Optional[int] = None
+    codec: Optional[str] = None
+    source: str = "header"  # "header", "yt-dlp" or "ffprobe"
+
+    @property
+    def duration_ms(self) -> int:
+        return int(self.duration * 1000)
+
+
+_cache: "OrderedDict[Tuple[str, int, int], MediaInfo]" = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+def probe_media(path: str, known_duration: Optional[float] = None) -> MediaInfo:
+    """
+    Probe an audio file's duration and format, caching the result.
+
+    Args:
+        path: Audio file to probe
+        known_duration: Duration in seconds already known from elsewhere
+            (e.g. yt-dlp's info["duration"]); used instead of running
+            ffprobe when the file isn't an MP3 we can parse directly
+
+    Returns:
+        MediaInfo for the file
+
+    Raises:
+        OSError: If the file can't be read
+        ValueError: If no probe method could determine the duration
+    """
+    stat = os.stat(path)
+    key = (os.path.realpath(path), stat.st_size, stat.st_mtime_ns)
+    with _cache_lock:
+        if key in _cache:
+            _cache.move_to_end(key)
+            return _cache[key]
+
+    info = _probe_mp3_header(path, stat.st_size)
+    if info is None and known_duration:
+        info = MediaInfo(
+            duration=float(known_duration),
+            bit_rate=int(stat.st_size * 8 / known_duration),
+            source="yt-dlp",
+        )
+    if info is None:
+        info = _probe_ffprobe(path)
+
+    with _cache_lock:
+        _cache[key] = info
+        while len(_cache) > PROBE_CACHE_SIZE:
+            _cache.popitem(last=False)
+    return info
+
+
+def _probe_mp3_header(path: str, file_size: int) -> Optional[MediaInfo]:
+    """Read MP3 duration from the first frame header, or None if not an MP3."""
+    with open(path, "rb") as f:
+        head = f.read(10)
+        audio_start = 0
+        if len(head) == 10 and head[:3] == b"ID3":
+            # ID3v2 size is a 28-bit synchsafe integer, plus an optional footer
+            size = (head[6] << 21) | (head[7] << 14) | (head[8] << 7) | head[9]
+            audio_start = 10 + size + (10 if head[5] & 0x10 else 0)
+
+        f.seek(audio_start)
+        data = f.read(MP3_SYNC_SCAN_BYTES)
+        f.seek(max(file_size - 128, 0))
+        has_id3v1 = f.read(3) == b"TAG"
+
+    offset = -1
+    while True:
+        offset = data.find(b"\xff", offset + 1)
+        if offset < 0 or offset + 4 > len(data):
+            return None
+        header = _parse_mp3_frame_header(data[offset : offset + 4])
+        if header is None:
+            continue
+
+        # Random 0xFFE bytes in other containers look like a sync word, so
+        # require the next frame to start where this one says it ends
+        mpeg1, bitrate, sample_rate, channels, frame_length = header
+        following = data[offset + frame_length : offset + frame_length + 4]
+        if len(following) == 4:
+            next_header = _parse_mp3_frame_header(following)
+            if next_header is None or next_header[:3:2] != header[:3:2]:
+                continue
+
+        samples_per_frame = 1152 if mpeg1 else 576
+        audio_bytes = file_size - audio_start - offset - (128 if has_id3v1 else 0)
+
+        # Xing/Info (LAME) or VBRI tags carry the exact frame count for VBR
+        frames = _mp3_frame_count(data[offset:], mpeg1, channels)
+        if frames:
+            duration = frames * samples_per_frame / sample_rate
+            bitrate = int(audio_bytes * 8 / duration) if duration else bitrate
+        else:
+            duration = audio_bytes * 8 / bitrate
+
+        return MediaInfo(
+            duration=duration,
+            bit_rate=bitrate,
+            sample_rate=sample_rate,
+            channels=channels,
+            codec="mp3",
+        )
+
+
+def _parse_mp3_frame_header(
+    header: bytes,
+) -> Optional[Tuple[bool, int, int, int, int]]:
+    """
+    Decode a Layer III frame header.
+
+    Returns:
+        (mpeg1, bitrate, sample_rate, channels, frame_length), or None if
+        the bytes aren't a valid Layer III header
+    """
+    if header[0] != 0xFF or header[1] & 0xE0 != 0xE0:
+        return None
+    version = (header[1] >> 3) & 0x3  # 3 = MPEG-1, 2 = MPEG-2, 0 = MPEG-2.5
+    layer = (header[1] >> 1) & 0x3  # 1 = Layer III
+    bitrate_index = header[2] >> 4
+    sample_rate_index = (header[2] >> 2) & 0x3
+    if version == 1 or layer != 1 or bitrate_index in (0, 15) or sample_rate_index == 3:
+        return None
+
+    mpeg1 = version == 3
+    bitrate = _MP3_BITRATES[1 if mpeg1 else 2][bitrate_index] * 1000
+    sample_rate = _MP3_SAMPLE_RATES[sample_rate_index] >> {3: 0, 2: 1, 0: 2}[version]
+    channels = 1 if header[3] >> 6 == 3 else 2
+    padding = (header[2] >> 1) & 0x1
+    frame_length = (144 if mpeg1 else 72) * bitrate // sample_rate + padding
+    return mpeg1, bitrate, sample_rate, channels, frame_length
+
+
+def _mp3_frame_count(frame: bytes, mpeg1: bool, channels: int) -> Optional[int]:
+    """Total frame count from a Xing/Info or VBRI tag in the first frame."""
+    side_info = (32 if channels == 2 else 17) if mpeg1 else (17 if channels == 2 else 9)
+    xing = 4 + side_info
+    if frame[xing : xing + 4] in (b"Xing", b"Info"):
+        flags = int.from_bytes(frame[xing + 4 : xing + 8], "big")
+        if flags & 0x1:
+            return int.from_bytes(frame[xing + 8 : xing + 12], "big") or None
+
+    if frame[36:40] == b"VBRI":
+        return int.from_bytes(frame[50:54], "big") or None
+    return None
+
+
+def _probe_ffprobe(path: str) -> MediaInfo:
+    """Probe any container with ffprobe (one process spawn)."""
+    try:
+        result = subprocess.run(
+            [
+                "ffprobe",
+                "-v",
+                "error",
+                "-select_streams",
+                "a:0",
+                "-show_entries",
+                "format=duration,bit_rate:stream=codec_name,sample_rate,channels",
+                "-of",
+                "json",
+                path,
+            ],
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+    except subprocess.CalledProcessError as e:
+        raise ValueError(f"ffprobe failed: {e.stderr.strip()[-200:]}") from e
+
+    data = json.loads(result.stdout)
+    fmt = data.get("format", {})
+    stream = (data.get("streams") or [{}])[0]
+    if "duration" not in fmt:
+        raise ValueError(f"ffprobe found no duration for {path}")
+
+    return MediaInfo(
+        duration=float(fmt["duration"]),
+        bit_rate=int(fmt["bit_rate"]) if fmt.get("bit_rate") else None,
+        sample_rate=int(stream["sample_rate"]) if stream.get("sample_rate") else None,
+        channels=stream.get("channels"),
+        codec=stream.get("codec_name"),
+        source="ffprobe",
+    )
@@ -7,8 +7,8 @@ from typing import Optional, Tuple
 import os
 
 import validators
-import yt_dlp
 
+from services.ydl_pool import ydl_pool
 from utils.constants import SUPPORTED_PLATFORMS, TIKTOK_COLLECTION_PATTERNS
 
 
@@ -77,7 +77,7 @@ def resolve_tiktok_short_url(
         ydl_opts["cookiefile"] = "cookies.txt"
 
     try:
-        with yt_dlp.YoutubeDL(ydl_opts) as ydl:
+        with ydl_pool.lease(ydl_opts) as ydl:
             info = ydl.extract_info(url, download=False)
             if info:
                 is_playlist = info.get("_type") == "playlist" or "entries" in info
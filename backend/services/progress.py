@@ -0,0 +1,170 @@
+"""
+Progress aggregation service for MultiFetch v2.
+
+yt-dlp progress hooks fire on every downloaded fragment, and chunk
+transcriptions report as each one lands. Rather than writing every value
+to the job store and publishing an SSE event per call, JobRunner reports
+item progress here. Every tick, each job's changed items are written in
+one store update and published as one batched "progress" event. An item
+is only included once it has moved by at least `min_delta` points and its
+previous update is at least `item_interval` seconds old.
+"""
+
+import threading
+import time
+from typing import Callable, Optional
+
+from services.job_manager import JobManager
+from utils.constants import (
+    PROGRESS_ITEM_INTERVAL,
+    PROGRESS_MIN_DELTA,
+    PROGRESS_TICK_SECONDS,
+)
+
+# (job_id, [{"index", "url", "progress", "status"}, ...], job_progress) -> None
+Publisher = Callable[[str, list[dict], int], None]
+
+
+class ProgressAggregator:
+    """
+    Buffers per-item progress and flushes it in per-job batches.
+
+    With tick=0 every report that moved by min_delta is written and
+    published as it arrives, which is how items were reported before
+    batching.
+    """
+
+    def __init__(
+        self,
+        manager: JobManager,
+        publish: Optional[Publisher] = None,
+        tick: float = PROGRESS_TICK_SECONDS,
+        item_interval: float = PROGRESS_ITEM_INTERVAL,
+        min_delta: int = PROGRESS_MIN_DELTA,
+    ):
+        if publish is None:
+            from api.sse import notify_items_progress as publish
+
+        self.manager = manager
+        self.publish = publish
+        self.tick = tick
+        self.item_interval = item_interval
+        self.min_delta = min_delta
+        # job_id -> index -> (url, latest unsent progress)
+        self._pending: dict[str, dict[int, tuple[str, int]]] = {}
+        # (job_id, index) -> (last progress sent, when it was sent)
+        self._sent: dict[tuple[str, int], tuple[int, float]] = {}
+        # Guards the dicts above; never held across store or SSE calls, so
+        # a slow store can't stall the download hooks calling report()
+        self._lock = threading.Lock()
+        # Held for a whole flush, so discard() never races a batch in flight
+        self._flush_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._counters = {"reports": 0, "events": 0, "items_sent": 0}
+
+    def report(self, job_id: str, index: int, url: str, progress: int):
+        """Record an item's latest progress (0-100)."""
+        with self._lock:
+            self._counters["reports"] += 1
+            self._pending.setdefault(job_id, {})[index] = (url, progress)
+            if self.tick and self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="progress-flush", daemon=True
+                )
+                self._thread.start()
+        if not self.tick:
+            self.flush()
+
+    def discard(self, job_id: str, index: int):
+        """
+        Drop an item's unsent progress.
+
+        Call before marking the item finished, so no batch flushed later can
+        carry older progress for it.
+        """
+        with self._flush_lock, self._lock:
+            pending = self._pending.get(job_id)
+            if pending:
+                pending.pop(index, None)
+                if not pending:
+                    del self._pending[job_id]
+            self._sent.pop((job_id, index), None)
+
+    def flush(self):
+        """Write and publish everything that is due now."""
+        with self._flush_lock:
+            with self._lock:
+                now = time.monotonic()
+                batches = self._take_due(now)
+            for job_id, due in batches.items():
+                self._send(job_id, due, now)
+
+    def stop(self):
+        """Stop the background flush thread after a final flush."""
+        self._stop.set()
+        if self._thread:
+            self._thread.join()
+        self.flush()
+
+    def stats(self) -> dict:
+        """Reports received vs. events and item updates sent."""
+        with self._lock:
+            return dict(self._counters)
+
+    def _run(self):
+        while not self._stop.wait(self.tick):
+            try:
+                self.flush()
+            except Exception as e:
+                print(f"Progress flush failed: {e}")
+
+    def _take_due(self, now: float) -> dict[str, dict[int, tuple[str, int]]]:
+        """Remove and return the items due to be sent, per job (lock held)."""
+        batches = {}
+        for job_id in list(self._pending):
+            pending = self._pending[job_id]
+            due = {}
+            for index, (url, progress) in pending.items():
+                sent = self._sent.get((job_id, index))
+                if sent and (
+                    abs(progress - sent[0]) < self.min_delta
+                    or (self.tick and now - sent[1] < self.item_interval)
+                ):
+                    continue
+                due[index] = (url, progress)
+            if not due:
+                continue
+
+            for index in due:
+                del pending[index]
+            if not pending:
+                del self._pending[job_id]
+            batches[job_id] = due
+        return batches
+
+    def _send(self, job_id: str, due: dict[int, tuple[str, int]], now: float):
+        """Write one job's due items in one store update and publish them."""
+        result = self.manager.update_items_progress(
+            job_id, {index: progress for index, (_, progress) in due.items()}
+        )
+        if result is None:
+            return
+        job_progress, applied = result
+        items = [
+            {
+                "index": index,
+                "url": due[index][0],
+                "progress": due[index][1],
+                "status": "running",
+            }
+            for index in applied
+        ]
+        with self._lock:
+            for index in applied:
+                self._sent[(job_id, index)] = (due[index][1], now)
+            if items:
+                self._counters["events"] += 1
+                self._counters["items_sent"] += len(items)
+        if items:
+            self.publish(job_id, items, job_progress)
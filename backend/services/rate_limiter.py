@@ -0,0 +1,297 @@
+"""
+Rate limiting for Groq API requests.
+Replaces the sliding-window limiter from original app.py lines 1187-1218.
+
+Each quota is a GCRA (generic cell rate algorithm) bucket: instead of a
+list of timestamps it keeps one "theoretical arrival time", which makes a
+reservation O(1). Callers reserve a send time under the lock and sleep
+outside it, so waiting threads never block each other.
+
+Only a small burst goes out back to back (a full period's burst would let
+GCRA send almost twice the quota in the first period: the burst, then the
+refill), and each gunicorn worker limits itself to its share of the
+account's quota (GROQ_PROCESSES), since every worker has its own limiter.
+
+The limiter also learns from Groq's responses: exhausted x-ratelimit-*
+headers and 429 retry-after values pause every caller until the quota
+resets, and AIMDConcurrency adapts how many requests are in flight to the
+observed throttling rate.
+"""
+
+import re
+import threading
+import time
+from contextlib import contextmanager
+from typing import Iterator, Mapping, Optional
+
+from utils.constants import (
+    GROQ_ASH,
+    GROQ_CONCURRENCY_MAX,
+    GROQ_CONCURRENCY_START,
+    GROQ_MIN_BILLED_SECONDS,
+    GROQ_PROCESSES,
+    GROQ_RPM,
+    GROQ_RPM_BURST,
+)
+
+_DURATION_UNITS = {"h": 3600.0, "m": 60.0, "s": 1.0, "ms": 0.001}
+_DURATION_PART = re.compile(r"(\d+(?:\.\d+)?)(ms|h|m|s)")
+
+
+def parse_duration(value: Optional[str]) -> Optional[float]:
+    """
+    Parse a retry-after or x-ratelimit-reset-* header value into seconds.
+
+    Accepts plain seconds ("30", "0.5") and Go-style durations ("2m59.56s",
+    "7.66s", "120ms"); returns None for anything else.
+    """
+    if value is None:
+        return None
+    value = value.strip()
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    parts = _DURATION_PART.findall(value)
+    if not parts:
+        return None
+    return sum(float(number) * _DURATION_UNITS[unit] for number, unit in parts)
+
+
+class GCRABucket:
+    """
+    One quota of `limit` units per `period` seconds.
+
+    Up to `burst` units may be spent at once (by default a full period's
+    worth, the same burst a rolling window allows), after which units
+    refill continuously.
+    """
+
+    def __init__(self, limit: float, period: float, burst: Optional[float] = None):
+        self.limit = limit
+        self.period = period
+        self.interval = period / limit  # seconds "paid" per unit
+        self.tolerance = (burst or limit) * self.interval
+        self.tat = 0.0  # theoretical arrival time
+
+    def ready_at(self, cost: float, now: float) -> float:
+        """Earliest time a request of `cost` units conforms."""
+        if cost * self.interval > self.tolerance:
+            # Larger than the whole burst: wait until the bucket is full
+            return max(now, self.tat)
+        return max(now, self.tat + cost * self.interval - self.tolerance)
+
+    def commit(self, cost: float, at: float):
+        """Charge `cost` units for a request sent at time `at`."""
+        self.tat = max(self.tat, at) + cost * self.interval
+
+
+class RateLimiter:
+    """
+    Thread-safe limiter for requests per minute and audio seconds per hour.
+
+    `burst` caps how many requests may go out back to back; None allows
+    the full RPM, 1 spaces every request evenly. Up to a minute's worth
+    of the audio quota may be spent at once.
+
+    acquire() books the earliest slot that satisfies every quota while
+    holding the lock, then sleeps until that slot with the lock released.
+    """
+
+    def __init__(
+        self,
+        rpm: float,
+        ash: Optional[float] = None,
+        burst: Optional[int] = GROQ_RPM_BURST,
+    ):
+        self.rpm = rpm
+        self.ash = ash
+        self._requests = GCRABucket(rpm, 60.0, burst)
+        self._audio = GCRABucket(ash, 3600.0, ash / 60) if ash else None
+        self._lock = threading.Lock()
+        self._paused_until = 0.0  # set from exhausted quotas and retry-after
+        self.total_wait = 0.0  # seconds callers have spent sleeping
+        self.throttled = 0  # 429 responses seen
+
+    def reserve(self, audio_seconds: float = 0.0) -> float:
+        """
+        Book a send slot without sleeping.
+
+        Args:
+            audio_seconds: Audio length of the request, for the ASH quota
+
+        Returns:
+            Seconds the caller must wait before sending
+        """
+        audio_cost = max(audio_seconds, GROQ_MIN_BILLED_SECONDS)
+        with self._lock:
+            now = time.monotonic()
+            send_at = max(self._requests.ready_at(1, now), self._paused_until)
+            if self._audio:
+                send_at = max(send_at, self._audio.ready_at(audio_cost, now))
+
+            self._requests.commit(1, send_at)
+            if self._audio:
+                self._audio.commit(audio_cost, send_at)
+            delay = send_at - now
+            self.total_wait += delay
+        return delay
+
+    def acquire(self, audio_seconds: float = 0.0) -> float:
+        """
+        Wait until a request may be sent.
+
+        Args:
+            audio_seconds: Audio length of the request, for the ASH quota
+
+        Returns:
+            Seconds spent waiting
+        """
+        delay = self.reserve(audio_seconds)
+        if delay > 0:
+            if delay >= 1:
+                print(f"Rate limit wait: {delay:.2f}s")
+            time.sleep(delay)
+        return delay
+
+    def pause(self, seconds: float):
+        """Hold every caller back for `seconds` from now."""
+        with self._lock:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+
+    def observe(self, headers: Mapping[str, str]):
+        """
+        Update from a response's x-ratelimit-* headers.
+
+        When Groq reports a quota (requests, tokens or audio) as exhausted,
+        callers are paused until its reset time rather than sending requests
+        that would be rejected.
+        """
+        for name, value in headers.items():
+            name = name.lower()
+            if not name.startswith("x-ratelimit-remaining-"):
+                continue
+            try:
+                remaining = float(value)
+            except ValueError:
+                continue
+            if remaining <= 0:
+                kind = name[len("x-ratelimit-remaining-") :]
+                reset = parse_duration(headers.get(f"x-ratelimit-reset-{kind}"))
+                if reset:
+                    self.pause(reset)
+
+    def on_throttle(self, headers: Mapping[str, str]) -> Optional[float]:
+        """
+        Record a 429 response and pause callers for its retry-after.
+
+        Args:
+            headers: Headers of the 429 response
+
+        Returns:
+            Seconds paused, or None if the response said nothing about when
+            to retry (callers should fall back to their own backoff)
+        """
+        with self._lock:
+            self.throttled += 1
+        retry_after = parse_duration(headers.get("retry-after"))
+        if retry_after is None:
+            resets = [
+                parse_duration(value)
+                for name, value in headers.items()
+                if name.lower().startswith("x-ratelimit-reset-")
+            ]
+            resets = [reset for reset in resets if reset]
+            retry_after = min(resets) if resets else None
+        if retry_after is not None:
+            self.pause(retry_after)
+        return retry_after
+
+    def stats(self) -> dict:
+        """Limiter counters for the health endpoint."""
+        with self._lock:
+            return {
+                "rpm": self.rpm,
+                "ash": self.ash,
+                "throttled": self.throttled,
+                "paused_for": round(max(self._paused_until - time.monotonic(), 0), 2),
+                "total_wait": round(self.total_wait, 2),
+            }
+
+
+class AIMDConcurrency:
+    """
+    Cap on in-flight requests that adapts to throttling (AIMD).
+
+    Every success raises the cap by 1/cap, about +1 per round of requests;
+    a throttled or overloaded response halves it. Requests that were sent
+    before the last decrease can't cut the cap again, so one burst of 429s
+    counts as a single congestion signal.
+    """
+
+    def __init__(self, initial: int, maximum: int, minimum: int = 1):
+        self.limit = float(initial)
+        self.minimum = minimum
+        self.maximum = maximum
+        self.decreases = 0
+        self._in_flight = 0
+        self._epoch = 0
+        self._cond = threading.Condition()
+
+    @contextmanager
+    def slot(self) -> Iterator[int]:
+        """
+        Hold one in-flight slot, waiting while the cap is reached.
+
+        Yields:
+            The current epoch, to pass to on_throttle()
+        """
+        with self._cond:
+            while self._in_flight >= int(self.limit):
+                self._cond.wait()
+            self._in_flight += 1
+            epoch = self._epoch
+        try:
+            yield epoch
+        finally:
+            with self._cond:
+                self._in_flight -= 1
+                self._cond.notify()
+
+    def on_success(self):
+        """Additive increase after a successful request."""
+        with self._cond:
+            before = int(self.limit)
+            self.limit = min(self.limit + 1 / self.limit, self.maximum)
+            if int(self.limit) > before:
+                self._cond.notify()
+
+    def on_throttle(self, epoch: int):
+        """Multiplicative decrease after a 429/503 for a request sent in `epoch`."""
+        with self._cond:
+            if epoch != self._epoch:
+                return
+            self._epoch += 1
+            self.decreases += 1
+            self.limit = max(self.limit / 2, self.minimum)
+
+    def stats(self) -> dict:
+        with self._cond:
+            return {
+                "limit": int(self.limit),
+                "in_flight": self._in_flight,
+                "decreases": self.decreases,
+            }
+
+
+# Global rate limiter instance (shared by every job in this process)
+groq_rate_limiter = RateLimiter(
+    rpm=GROQ_RPM / GROQ_PROCESSES,
+    ash=GROQ_ASH / GROQ_PROCESSES,
+    burst=max(1, GROQ_RPM_BURST // GROQ_PROCESSES),
+)
+
+# Global concurrency cap for Groq requests
+groq_concurrency = AIMDConcurrency(
+    initial=GROQ_CONCURRENCY_START, maximum=GROQ_CONCURRENCY_MAX
+)
@@ -0,0 +1,166 @@
+"""
+Download strategy scheduling for MultiFetch v2.
+
+download_audio tries the YouTube client strategies in turn until one
+works, and each failure costs a full yt-dlp extraction. When YouTube
+blocks one client it tends to block it for every video, so the scheduler
+remembers how each strategy did over a sliding window (the last
+`window` attempts, no older than `max_age` seconds) and orders the chain
+best-first: highest success rate, then lowest median time of its
+successful attempts, then the built-in order. Strategies that were
+demoted are still tried when the ones ahead of them fail, and their old
+failures age out of the window, so a client that starts working again
+climbs back up.
+
+It also tracks how long metadata extraction takes, which sets the delay
+before a hedged download starts its next strategy (see download_audio).
+
+State is per process, like the job runner that uses it.
+"""
+
+import statistics
+import threading
+import time
+from collections import deque
+from typing import Optional, Sequence, Tuple, TypeVar
+
+from utils.constants import (
+    HEDGE_DEFAULT_DELAY,
+    HEDGE_MIN_DELAY,
+    HEDGE_MIN_SAMPLES,
+    HEDGE_PERCENTILE,
+    STRATEGY_MAX_AGE_SECONDS,
+    STRATEGY_WINDOW,
+)
+
+T = TypeVar("T")
+
+
+class StrategyScheduler:
+    """Orders fallback strategies by their recent success rate and latency."""
+
+    def __init__(
+        self,
+        window: int = STRATEGY_WINDOW,
+        max_age: float = STRATEGY_MAX_AGE_SECONDS,
+        hedge_default_delay: float = HEDGE_DEFAULT_DELAY,
+        hedge_min_delay: float = HEDGE_MIN_DELAY,
+    ):
+        self.window = window
+        self.max_age = max_age
+        self.hedge_default_delay = hedge_default_delay
+        self.hedge_min_delay = hedge_min_delay
+        # name -> deque of (finished at, succeeded, seconds)
+        self._attempts: dict[str, deque] = {}
+        # Attempts each finished download took (including the one that worked)
+        self._downloads: deque = deque(maxlen=window)
+        # Successful metadata extraction times, any strategy
+        self._extractions: deque = deque(maxlen=window * 5)
+        self._hedge = {"hedged": 0, "hedge_wins": 0}
+        self._lock = threading.Lock()
+
+    def order(self, strategies: Sequence[Tuple[str, T]]) -> list[Tuple[str, T]]:
+        """Return (name, options) strategies best-first (stable for ties)."""
+        with self._lock:
+            now = time.monotonic()
+            scores = {name: self._score(name, now) for name, _ in strategies}
+        return sorted(strategies, key=lambda strategy: scores[strategy[0]])
+
+    def record(self, name: str, succeeded: bool, seconds: float):
+        """Record the outcome and duration of one strategy attempt."""
+        with self._lock:
+            attempts = self._attempts.get(name)
+            if attempts is None:
+                attempts = self._attempts[name] = deque(maxlen=self.window)
+            attempts.append((time.monotonic(), succeeded, seconds))
+
+    def record_download(self, attempts: int):
+        """Record how many strategies one download went through."""
+        with self._lock:
+            self._downloads.append(attempts)
+
+    def record_extraction(self, seconds: float):
+        """Record how long a successful metadata extraction took."""
+        with self._lock:
+            self._extractions.append(seconds)
+
+    def record_hedge(self, won: bool):
+        """Record a hedged download, and whether a hedge (not the primary) won."""
+        with self._lock:
+            self._hedge["hedged"] += 1
+            self._hedge["hedge_wins"] += won
+
+    def hedge_delay(self, percentile: float = HEDGE_PERCENTILE) -> float:
+        """Seconds to wait on an extraction before hedging it."""
+        with self._lock:
+            return self._hedge_delay(percentile)
+
+    def _hedge_delay(self, percentile: float) -> float:
+        if len(self._extractions) < HEDGE_MIN_SAMPLES:
+            return self.hedge_default_delay
+        times = sorted(self._extractions)
+        rank = min(len(times) - 1, int(len(times) * percentile / 100))
+        return max(self.hedge_min_delay, times[rank])
+
+    def stats(self) -> dict:
+        """Per-strategy window stats, in the order they would be tried now."""
+        with self._lock:
+            now = time.monotonic()
+            strategies = []
+            for name in sorted(self._attempts, key=lambda name: self._score(name, now)):
+                recent = self._recent(name, now)
+                latencies = [seconds for _, ok, seconds in recent if ok]
+                successes = len(latencies)
+                strategies.append(
+                    {
+                        "name": name,
+                        "attempts": len(recent),
+                        "successes": successes,
+                        "success_rate": (
+                            round(successes / len(recent), 3) if recent else None
+                        ),
+                        "median_seconds": (
+                            round(statistics.median(latencies), 2)
+                            if latencies
+                            else None
+                        ),
+                    }
+                )
+            downloads = list(self._downloads)
+            return {
+                "window": self.window,
+                "max_age_seconds": self.max_age,
+                "downloads": len(downloads),
+                "median_attempts": statistics.median(downloads) if downloads else None,
+                "mean_attempts": (
+                    round(statistics.mean(downloads), 2) if downloads else None
+                ),
+                "strategies": strategies,
+                "hedge": {
+                    **self._hedge,
+                    "delay_seconds": round(self._hedge_delay(HEDGE_PERCENTILE), 2),
+                },
+            }
+
+    def _recent(self, name: str, now: float) -> list[tuple]:
+        """Attempts of a strategy still inside the window (lock held)."""
+        attempts = self._attempts.get(name)
+        if not attempts:
+            return []
+        while attempts and now - attempts[0][0] > self.max_age:
+            attempts.popleft()
+        return list(attempts)
+
+    def _score(self, name: str, now: float) -> Tuple[float, float]:
+        """Sort key: smoothed success rate (descending), then latency (lock held)."""
+        recent = self._recent(name, now)
+        latencies = [seconds for _, ok, seconds in recent if ok]
+        # Laplace smoothing: an untried strategy scores 0.5, ahead of one
+        # that has only failed and behind one that has worked
+        rate = (len(latencies) + 1) / (len(recent) + 2)
+        latency: Optional[float] = statistics.median(latencies) if latencies else None
+        return -rate, latency if latency is not None else float("inf")
+
+
+# Global scheduler instance
+strategy_scheduler = StrategyScheduler()
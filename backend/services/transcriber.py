@@ -0,0 +1,175 @@
+"""
+Transcription service for MultiFetch v2.
+Ported from original app.py lines 1220-1573.
+"""
+
+import os
+import random
+import time
+from contextlib import nullcontext
+from typing import Optional
+
+from groq import APIStatusError, Groq, RateLimitError
+
+from services.groq_client import groq_clients
+from services.media_probe import probe_media
+from services.rate_limiter import (
+    AIMDConcurrency,
+    RateLimiter,
+    groq_concurrency,
+    groq_rate_limiter,
+)
+from utils.constants import (
+    GROQ_MODEL,
+    GROQ_PROMPT,
+    MAX_FILE_SIZE_DEV_MB,
+    MAX_FILE_SIZE_MB,
+)
+
+
+def _backoff(attempt: int, base_delay: float = 5, max_delay: float = 120) -> float:
+    """Exponential backoff with jitter, capped at two minutes."""
+    return min(base_delay * (2**attempt) + random.uniform(0, 5), max_delay)
+
+
+def transcribe_with_retry(
+    client: Groq,
+    audio_path: str,
+    language: str = "en",
+    max_retries: int = 5,
+    rate_limiter: Optional[RateLimiter] = None,
+    dev_tier: bool = False,
+    audio_seconds: Optional[float] = None,
+    concurrency: Optional[AIMDConcurrency] = None,
+) -> Optional[str]:
+    """
+    Transcribe a single audio file, retrying throttled and failed requests.
+
+    Rate-limit headers from every response are fed back into the limiter;
+    429s wait for Groq's retry-after (shared by all callers) instead of a
+    guessed backoff, and 429/503s shrink the adaptive concurrency cap.
+
+    Args:
+        client: Groq client
+        audio_path: Path to an audio file within the tier size limit
+        language: Language code for transcription
+        max_retries: Maximum number of attempts
+        rate_limiter: Optional limiter to call before each attempt
+        dev_tier: Whether the API key is on Groq's dev tier (100MB limit)
+        audio_seconds: Audio length for the limiter's ASH quota (probed
+            from the file if not given)
+        concurrency: Optional adaptive cap on in-flight requests
+
+    Returns:
+        Transcript text, or None if every attempt failed
+    """
+    file_size_mb = os.path.getsize(audio_path) / (1024 * 1024)
+    max_allowed = MAX_FILE_SIZE_DEV_MB if dev_tier else MAX_FILE_SIZE_MB
+    tier_name = "dev tier" if dev_tier else "free tier"
+
+    if file_size_mb > max_allowed:
+        raise ValueError(
+            f"File is {file_size_mb:.1f}MB, exceeds Groq's {tier_name} "
+            f"maximum of {max_allowed}MB"
+        )
+
+    if rate_limiter and audio_seconds is None:
+        try:
+            audio_seconds = probe_media(audio_path).duration
+        except (OSError, ValueError):
+            audio_seconds = 0.0
+
+    for attempt in range(max_retries):
+        is_last_attempt = attempt >= max_retries - 1
+        epoch = 0
+        try:
+            with concurrency.slot() if concurrency else nullcontext(0) as epoch:
+                if rate_limiter:
+                    rate_limiter.acquire(audio_seconds)
+
+                with open(audio_path, "rb") as audio_file:
+                    print(
+                        f"Sending {file_size_mb:.1f}MB file to Groq API "
+                        f"(attempt {attempt + 1}/{max_retries})..."
+                    )
+                    response = client.audio.transcriptions.with_raw_response.create(
+                        file=audio_file,
+                        model=GROQ_MODEL,
+                        response_format="text",
+                        language=language,
+                        temperature=0.0,
+                        prompt=GROQ_PROMPT,
+                    )
+
+            if rate_limiter:
+                rate_limiter.observe(response.headers)
+            if concurrency:
+                concurrency.on_success()
+            return response.parse().strip()
+
+        except RateLimitError as e:
+            if concurrency:
+                concurrency.on_throttle(epoch)
+            retry_after = None
+            if rate_limiter:
+                # Pauses every caller, so the next acquire() does the waiting
+                retry_after = rate_limiter.on_throttle(e.response.headers)
+            if is_last_attempt:
+                raise
+            if retry_after is None:
+                wait_time = _backoff(attempt)
+                print(f"Rate limited, waiting {wait_time:.1f}s...")
+                time.sleep(wait_time)
+            else:
+                print(f"Rate limited, retrying after {retry_after:.1f}s")
+
+        except APIStatusError as e:
+            if e.status_code == 413:
+                # File too large, don't retry
+                raise ValueError(
+                    f"File too large for Groq API {tier_name}: {file_size_mb:.1f}MB"
+                ) from e
+            if is_last_attempt:
+                raise
+            if e.status_code >= 500:
+                if concurrency:
+                    concurrency.on_throttle(epoch)
+                wait_time = _backoff(attempt)
+                print(f"Groq returned {e.status_code}, waiting {wait_time:.1f}s...")
+                time.sleep(wait_time)
+            else:
+                print(f"Attempt {attempt + 1} failed: {str(e)[:100]}...")
+                time.sleep(5)
+
+        except Exception as e:
+            if is_last_attempt:
+                raise
+            print(f"Attempt {attempt + 1} failed: {str(e)[:100]}...")
+            time.sleep(5)
+
+    return None
+
+
+def transcribe_file(
+    audio_path: str, api_key: str, language: str = "en"
+) -> Optional[str]:
+    """
+    Transcribe one audio file (or chunk) using the pooled client for the
+    API key and the shared rate limiter.
+
+    Args:
+        audio_path: Path to the audio file
+        api_key: Groq API key
+        language: Language code for transcription
+
+    Returns:
+        Transcript text, or None on failure
+    """
+    with groq_clients.lease(api_key) as client:
+        return transcribe_with_retry(
+            client,
+            audio_path,
+            language,
+            rate_limiter=groq_rate_limiter,
+            concurrency=groq_concurrency,
+        )
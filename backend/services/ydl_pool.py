@@ -0,0 +1,190 @@
+"""
+YoutubeDL instance pool for MultiFetch v2.
+
+Building a YoutubeDL per URL and per strategy repeats the same setup each
+time: parsing the cookies file into a cookie jar, opening a fresh HTTP
+session (so no keep-alive connections), and initializing extractors,
+including the YouTube extractor's cache of decoded player code. The pool
+keeps idle instances per option profile (every option except the
+per-download ones: output template and progress hooks) and hands them out
+one caller at a time, setting the per-download options on checkout.
+
+Instances idle past the timeout are closed, as are instances whose last
+use raised, since yt-dlp may have left them mid-operation.
+"""
+
+import json
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Iterator
+
+import yt_dlp
+
+from utils.constants import YDL_POOL_IDLE_SECONDS, YDL_POOL_MAX_IDLE
+
+# Options set per checkout rather than baked into a pooled instance
+PER_CALL_OPTIONS = ("outtmpl", "progress_hooks")
+
+
+@dataclass
+class _PooledYDL:
+    ydl: yt_dlp.YoutubeDL
+    profile: str
+    # Postprocessors the instance was built with (callers add their own)
+    pps: dict = field(default_factory=dict)
+    last_used: float = 0.0
+
+
+def profile_key(opts: dict) -> str:
+    """Key of the option profile an instance can be reused for."""
+    shared = {k: v for k, v in opts.items() if k not in PER_CALL_OPTIONS}
+    return json.dumps(shared, sort_keys=True, default=repr)
+
+
+class YoutubeDLPool:
+    """
+    Thread-safe pool of YoutubeDL instances keyed by option profile.
+
+    Use lease() for a scoped checkout, or checkout()/release() when the
+    instance outlives one function (a strategy's extraction and download
+    happen in separate steps).
+    """
+
+    def __init__(
+        self,
+        max_idle: int = YDL_POOL_MAX_IDLE,
+        idle_timeout: float = YDL_POOL_IDLE_SECONDS,
+    ):
+        self.max_idle = max_idle
+        self.idle_timeout = idle_timeout
+        self._idle: dict[str, list[_PooledYDL]] = {}
+        self._leased: dict[int, _PooledYDL] = {}
+        self._lock = threading.Lock()
+        self._counters = {"created": 0, "reused": 0, "closed": 0}
+
+    @contextmanager
+    def lease(self, opts: dict) -> Iterator[yt_dlp.YoutubeDL]:
+        """
+        Borrow an instance configured with `opts` for the duration of a block.
+
+        Args:
+            opts: yt-dlp options, as for YoutubeDL(opts)
+
+        Yields:
+            A YoutubeDL no other caller uses until the block exits
+        """
+        ydl = self.checkout(opts)
+        try:
+            yield ydl
+        except BaseException:
+            self.release(ydl, reuse=False)
+            raise
+        self.release(ydl)
+
+    def checkout(self, opts: dict) -> yt_dlp.YoutubeDL:
+        """Take an instance configured with `opts`; hand it back with release()."""
+        profile = profile_key(opts)
+        with self._lock:
+            stale = self._collect_idle(time.monotonic())
+            idle = self._idle.get(profile)
+            entry = idle.pop() if idle else None
+            if entry:
+                self._counters["reused"] += 1
+        self._close(stale)
+
+        if entry is None:
+            shared = {k: v for k, v in opts.items() if k not in PER_CALL_OPTIONS}
+            ydl = yt_dlp.YoutubeDL(shared)
+            entry = _PooledYDL(
+                ydl=ydl,
+                profile=profile,
+                pps={when: list(pps) for when, pps in ydl._pps.items()},
+            )
+            with self._lock:
+                self._counters["created"] += 1
+
+        ydl = entry.ydl
+        if "outtmpl" in opts:
+            ydl.params["outtmpl"] = opts["outtmpl"]
+            ydl._parse_outtmpl()
+        for hook in opts.get("progress_hooks", ()):
+            ydl.add_progress_hook(hook)
+        with self._lock:
+            self._leased[id(ydl)] = entry
+        return ydl
+
+    def release(self, ydl: yt_dlp.YoutubeDL, reuse: bool = True):
+        """
+        Return a checked-out instance.
+
+        Args:
+            ydl: Instance from checkout()
+            reuse: False to close it instead (e.g. its last call raised)
+        """
+        with self._lock:
+            entry = self._leased.pop(id(ydl), None)
+        if entry is None:
+            return
+
+        # Drop what this checkout added
+        ydl._progress_hooks = []
+        ydl._pps = {when: list(pps) for when, pps in entry.pps.items()}
+        ydl._download_retcode = 0
+
+        stale = [] if reuse else [ydl]
+        if reuse:
+            with self._lock:
+                idle = self._idle.setdefault(entry.profile, [])
+                if len(idle) < self.max_idle:
+                    entry.last_used = time.monotonic()
+                    idle.append(entry)
+                else:
+                    stale.append(ydl)
+        self._close(stale)
+
+    def close_idle(self) -> int:
+        """Close every idle instance; returns how many were closed."""
+        with self._lock:
+            stale = [entry.ydl for idle in self._idle.values() for entry in idle]
+            self._idle.clear()
+        self._close(stale)
+        return len(stale)
+
+    def stats(self) -> dict:
+        """Pool counters for the health endpoint."""
+        with self._lock:
+            return {
+                "profiles": len(self._idle),
+                "idle": sum(len(idle) for idle in self._idle.values()),
+                "leased": len(self._leased),
+                **self._counters,
+            }
+
+    def _collect_idle(self, now: float) -> list[yt_dlp.YoutubeDL]:
+        """Remove instances idle past the timeout (lock held)."""
+        stale = []
+        for profile in list(self._idle):
+            idle = self._idle[profile]
+            keep = [e for e in idle if now - e.last_used <= self.idle_timeout]
+            stale += [e.ydl for e in idle if now - e.last_used > self.idle_timeout]
+            if keep:
+                self._idle[profile] = keep
+            else:
+                del self._idle[profile]
+        return stale
+
+    def _close(self, instances: list[yt_dlp.YoutubeDL]):
+        for ydl in instances:
+            try:
+                ydl.close()
+            except Exception as e:
+                print(f"Error closing YoutubeDL: {e}")
+        if instances:
+            with self._lock:
+                self._counters["closed"] += len(instances)
+
+
+# Global YoutubeDL pool instance
+ydl_pool = YoutubeDLPool()
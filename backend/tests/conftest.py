@@ -0,0 +1,29 @@
+"""
+Shared fixtures for the backend tests.
+
+Run from backend/ with `make test` (or `python -m pytest`). Tests use the
+in-memory job store and stub backends, so they need no network, Groq key,
+ffmpeg or Redis.
+"""
+
+import pytest
+
+# services.job_store builds Job objects from services.job_manager, and
+# job_manager creates its store from job_store on import, so job_manager
+# has to be imported first
+from services.job_manager import JobManager
+from services.job_store import MemoryJobStore, SQLiteJobStore
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def store(request, tmp_path):
+    """Each local job store backend (Redis needs a server, so it's left out)."""
+    if request.param == "memory":
+        return MemoryJobStore()
+    return SQLiteJobStore(str(tmp_path / "jobs.db"))
+
+
+@pytest.fixture
+def manager(store):
+    """JobManager over a fresh store."""
+    return JobManager(store)
@@ -0,0 +1,175 @@
+"""Tests for the content-addressed artifact store and the video info cache."""
+
+import json
+import time
+
+import pytest
+
+from services.cache import ArtifactStore, VideoInfoCache, hash_file, video_key
+
+SETTINGS = ("whisper-large-v3-turbo", "en", "prompt")
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return ArtifactStore(tmp_path / "cache", max_bytes=10_000)
+
+
+@pytest.fixture
+def audio(tmp_path):
+    """Write an audio file of given bytes under tmp_path."""
+    count = iter(range(1000))
+
+    def write(data: bytes, ext: str = ".mp3") -> str:
+        path = tmp_path / f"audio{next(count)}{ext}"
+        path.write_bytes(data)
+        return str(path)
+
+    return write
+
+
+def test_audio_is_found_by_url_and_video_key(cache, audio):
+    path = audio(b"abc")
+    video = video_key("youtube", "dQw4w9WgXcQ")
+
+    audio_hash = cache.put_audio(
+        path, url="https://a.test/v", video=video, title="T", info={"duration": 3}
+    )
+
+    assert audio_hash == hash_file(path)
+    by_url = cache.get_audio(url="https://a.test/v")
+    by_video = cache.get_audio(url="https://other.test/v", video=video)
+    assert by_url["path"] == by_video["path"]
+    assert by_url["path"] != path  # a copy inside the store
+    assert by_url["title"] == "T"
+    assert by_url["info"]["duration"] == 3
+    assert cache.get_audio(url="https://a.test/unknown") is None
+
+
+def test_identical_audio_is_stored_once(cache, audio):
+    first = cache.put_audio(audio(b"same"), url="https://a.test/1")
+    second = cache.put_audio(audio(b"same"), url="https://a.test/2")
+
+    assert first == second
+    assert cache.stats()["audio_count"] == 1
+    assert cache.stats()["sources"] == 2
+
+
+def test_corrupt_audio_is_discarded(cache, audio):
+    audio_hash = cache.put_audio(audio(b"abc"), url="https://a.test/v")
+    blob = cache.get_audio(url="https://a.test/v")["path"]
+    with open(blob, "wb") as f:
+        f.write(b"xyz")
+
+    fresh = ArtifactStore(cache.root, cache.max_bytes)  # hasn't verified it yet
+    assert fresh.get_audio(url="https://a.test/v") is None
+    assert audio_hash not in json.loads(fresh._index_path.read_text())["blobs"]
+
+
+def test_transcripts_are_keyed_by_audio_and_settings(cache, audio):
+    audio_hash = cache.put_audio(audio(b"abc"), url="https://a.test/v")
+    cache.put_transcript(audio_hash, *SETTINGS, "hello")
+
+    assert cache.get_transcript(audio_hash, *SETTINGS) == "hello"
+    assert cache.get_transcript(audio_hash, "whisper-large-v3", "en", "prompt") is None
+    assert (
+        cache.get_transcript(audio_hash, "whisper-large-v3-turbo", "de", "prompt")
+        is None
+    )
+
+
+def test_find_transcript_by_source_then_content(cache, audio):
+    path = audio(b"abc")
+    video = video_key("youtube", "dQw4w9WgXcQ")
+    audio_hash = cache.put_audio(path, url="https://a.test/v", video=video)
+    cache.put_transcript(audio_hash, *SETTINGS, "hello")
+
+    # Same video under another URL: found without touching any audio
+    assert cache.find_transcript(*SETTINGS, url="https://youtu.be/x", video=video) == (
+        "hello",
+        None,
+    )
+    # Unknown source, same bytes downloaded again: found by content
+    assert cache.find_transcript(
+        *SETTINGS, url="https://b.test/v", audio_path=audio(b"abc")
+    ) == ("hello", audio_hash)
+    # Nothing cached: the hash comes back for put_transcript
+    other = audio(b"other")
+    assert cache.find_transcript(*SETTINGS, audio_path=other) == (
+        None,
+        hash_file(other),
+    )
+
+    assert cache.stats()["transcript_lookups"] == {
+        "source_hits": 1,
+        "audio_hits": 1,
+        "misses": 1,
+    }
+
+
+def test_least_recently_used_artifacts_are_evicted(tmp_path, audio):
+    cache = ArtifactStore(tmp_path / "cache", max_bytes=250)
+    first = cache.put_audio(audio(b"1" * 100), url="https://a.test/1")
+    time.sleep(0.01)
+    second = cache.put_audio(audio(b"2" * 100), url="https://a.test/2")
+    time.sleep(0.01)
+    assert cache.get_audio(url="https://a.test/1")  # now the most recent
+    time.sleep(0.01)
+
+    cache.put_audio(audio(b"3" * 100), url="https://a.test/3")
+
+    assert cache.get_audio(url="https://a.test/2") is None
+    assert cache.lookup(url="https://a.test/2") is None  # source forgotten too
+    assert cache.get_audio(url="https://a.test/1")["audio"] == first
+    assert cache.stats()["size_bytes"] == 200
+    assert second not in json.loads(cache._index_path.read_text())["blobs"]
+
+
+def test_cache_hits_do_not_rewrite_the_index(cache, audio):
+    audio_hash = cache.put_audio(audio(b"abc"), url="https://a.test/v")
+    cache.put_transcript(audio_hash, *SETTINGS, "hello")
+    written = cache._index_path.stat().st_mtime_ns
+
+    for _ in range(20):
+        assert cache.get_audio(url="https://a.test/v")
+        assert cache.get_transcript(audio_hash, *SETTINGS)
+
+    assert cache._index_path.stat().st_mtime_ns == written
+
+
+def test_clear_removes_everything(cache, audio):
+    audio_hash = cache.put_audio(audio(b"abc"), url="https://a.test/v")
+    cache.put_transcript(audio_hash, *SETTINGS, "hello")
+
+    cache.clear()
+
+    assert cache.get_audio(url="https://a.test/v") is None
+    assert cache.get_transcript(audio_hash, *SETTINGS) is None
+    assert cache.stats()["size_bytes"] == 0
+    assert not list((cache.root / "blobs").rglob("*.mp3"))
+
+
+def test_video_info_expires_and_is_copied():
+    infos = VideoInfoCache(ttl=0.05, max_entries=2)
+    info = {"id": "x", "formats": [{"url": "u"}], "thumbnails": [{}] * 50}
+
+    infos.put("youtube:x", info, "web")
+    cached, strategy = infos.get("youtube:x")
+    cached["formats"].append({})
+
+    assert strategy == "web"
+    assert "thumbnails" not in cached
+    assert len(infos.get("youtube:x")[0]["formats"]) == 1
+    time.sleep(0.1)
+    assert infos.get("youtube:x") is None
+
+
+def test_video_info_keeps_the_most_recent_entries():
+    infos = VideoInfoCache(ttl=60, max_entries=2)
+    for name in ("a", "b"):
+        infos.put(name, {"id": name})
+    infos.get("a")
+    infos.put("c", {"id": "c"})
+
+    assert infos.get("b") is None
+    assert infos.get("a") and infos.get("c")
@@ -0,0 +1,161 @@
+"""Tests for speech-quality format negotiation."""
+
+import pytest
+import yt_dlp
+
+from services.format_selector import (
+    FormatStats,
+    choose_format,
+    format_stats,
+    is_groq_ready,
+    select_audio_format,
+)
+
+
+def audio(format_id, abr, ext="webm", acodec="opus", **extra):
+    return {
+        "format_id": format_id,
+        "ext": ext,
+        "acodec": acodec,
+        "vcodec": "none",
+        "abr": abr,
+        **extra,
+    }
+
+
+def video(format_id, tbr, height, acodec="mp4a.40.2", vcodec="avc1"):
+    return {
+        "format_id": format_id,
+        "ext": "mp4",
+        "acodec": acodec,
+        "vcodec": vcodec,
+        "tbr": tbr,
+        "height": height,
+    }
+
+
+YOUTUBE = [
+    audio("599", 30.8, ext="m4a", acodec="mp4a.40.5"),
+    audio("600", 32.0),
+    audio("139", 48.8, ext="m4a", acodec="mp4a.40.5"),
+    audio("249", 50.0),
+    audio("251", 130.0),
+    video("18", 500, 360),
+    video("137", 4300, 1080, acodec="none"),
+]
+
+
+def format_id(formats):
+    fmt, kind = choose_format(formats)
+    return (fmt["format_id"] if fmt else None), kind
+
+
+def test_lowest_audio_bitrate_fit_for_speech():
+    assert format_id(YOUTUBE) == ("139", "audio")
+
+
+def test_highest_audio_bitrate_when_all_are_below_the_speech_minimum():
+    assert format_id(YOUTUBE[:2]) == ("600", "audio")
+
+
+def test_original_language_beats_a_cheaper_dub():
+    formats = [
+        audio("249-0", 50.0, language="es", language_preference=-1),
+        audio("251-1", 130.0, language="en", language_preference=10),
+        audio("249-1", 60.0, language="en", language_preference=10),
+    ]
+    assert format_id(formats) == ("249-1", "audio")
+
+
+def test_container_groq_accepts_beats_a_cheaper_one():
+    formats = [audio("a", 50.0, ext="aac", acodec="aac"), audio("b", 130.0)]
+    assert format_id(formats) == ("b", "audio")
+
+
+def test_smallest_combined_format_without_audio_only_formats():
+    formats = [
+        video("download", 1300, 1024),
+        video("h264_540p", 900, 540),
+        video("bytevc1_720p", 700, 720, vcodec="h265"),
+        video("video_only", 300, 360, acodec="none"),
+    ]
+    assert format_id(formats) == ("bytevc1_720p", "combined")
+
+
+def test_last_format_that_may_have_audio_when_codecs_are_unknown():
+    formats = [
+        {"format_id": "low", "ext": "mp4"},
+        {"format_id": "high", "ext": "mp4"},
+        {"format_id": "silent", "ext": "mp4", "acodec": "none"},
+    ]
+    assert format_id(formats) == ("high", "best")
+
+
+def test_nothing_when_no_format_has_audio():
+    assert format_id([video("137", 4300, 1080, acodec="none")]) == (None, "none")
+
+
+def test_selector_picks_through_yt_dlp():
+    info = {
+        "id": "abc",
+        "title": "t",
+        "extractor": "test",
+        "extractor_key": "Test",
+        "webpage_url": "https://example.com/abc",
+        "formats": [
+            {**f, "url": f"https://example.com/{f['format_id']}"} for f in YOUTUBE
+        ],
+    }
+    with yt_dlp.YoutubeDL(
+        {"format": select_audio_format, "quiet": True, "simulate": True}
+    ) as ydl:
+        result = ydl.process_ie_result(info, download=False)
+
+    assert result["format_id"] == "139"
+
+
+@pytest.mark.parametrize(
+    "info, size, ready",
+    [
+        (audio("249", 50.0), 0, True),
+        (audio("251", 130.0), 0, False),
+        (audio("a", 50.0, ext="aac", acodec="aac"), 0, False),
+        (video("18", 60, 360), 0, False),
+        # No bitrate reported: estimated from the size and duration
+        (audio("x", None, duration=100), 100 * 64 * 1000 // 8, True),
+        (audio("x", None, duration=100), 100 * 96 * 1000 // 8, False),
+        (audio("x", None), 1000, False),
+    ],
+)
+def test_is_groq_ready(info, size, ready):
+    assert is_groq_ready(info, size) is ready
+
+
+def test_format_stats():
+    stats = FormatStats()
+    stats.record_selection("audio")
+    stats.record_selection("combined")
+    stats.record_output(1000, 1000, 0.0, passthrough=True)
+    stats.record_output(3000, 500, 1.5, passthrough=False)
+
+    result = stats.stats()
+
+    assert result["selections"] == {"audio": 1, "combined": 1, "best": 0, "none": 0}
+    assert result["downloads"] == 2
+    assert result["passthrough"] == result["transcoded"] == 1
+    assert result["bytes_downloaded"] == 4000
+    assert result["bytes_uploaded"] == 1500
+    assert result["mean_bytes_downloaded"] == 2000
+    assert result["mean_transcode_seconds"] == 0.75
+
+
+def test_format_stats_means_are_none_before_any_download():
+    result = FormatStats().stats()
+    assert result["mean_bytes_downloaded"] is None
+    assert result["mean_transcode_seconds"] is None
+
+
+def test_selector_records_the_selection():
+    before = format_stats.stats()["selections"]["audio"]
+    list(select_audio_format({"formats": YOUTUBE}))
+    assert format_stats.stats()["selections"]["audio"] == before + 1
@@ -0,0 +1,277 @@
+"""Tests for the JobRunner download -> chunk -> transcribe pipeline."""
+
+import os
+import tempfile
+import threading
+import time
+
+import pytest
+
+from services.cache import ArtifactStore
+from services.job_manager import JobStatus, JobType, job_manager
+from services.job_runner import JobRunner
+from utils.constants import GROQ_MODEL, GROQ_PROMPT
+
+
+def write(path: str, text: str) -> str:
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(text)
+    return path
+
+
+def downloader(url, output_dir, cookies_path=None, progress_callback=None):
+    """Writes the URL's chunk texts ("a|b|c" after the last slash) as the audio."""
+    if progress_callback:
+        progress_callback(1.0)
+    path = write(os.path.join(output_dir, "audio.mp3"), url.rsplit("/", 1)[1])
+    return path, f"Title {url}", {"duration": 60}
+
+
+def chunker(audio_path):
+    """One chunk file per "|"-separated text in the downloaded audio."""
+    with open(audio_path, encoding="utf-8") as f:
+        texts = f.read().split("|")
+    for index, text in enumerate(texts):
+        path = f"{audio_path}.{index}"
+        yield {"path": write(path, text), "index": index, "count": len(texts)}
+
+
+def transcriber(audio_path, api_key, language):
+    """A chunk's text, None for "FAIL", and an exception for "RAISE"."""
+    with open(audio_path, encoding="utf-8") as f:
+        text = f.read()
+    if text == "RAISE":
+        raise RuntimeError("Groq is down")
+    return None if text == "FAIL" else text
+
+
+def make_runner(**backends) -> JobRunner:
+    return JobRunner(
+        downloader=backends.get("downloader", downloader),
+        chunker=backends.get("chunker", chunker),
+        transcriber=backends.get("transcriber", transcriber),
+        store=backends.get("store"),
+        warmup=None,
+        download_workers=2,
+        chunk_workers=2,
+        transcribe_workers=4,
+        progress_tick=0,
+    )
+
+
+def wait_for(runner: JobRunner, job_id: str, timeout: float = 5.0):
+    deadline = time.monotonic() + timeout
+    while runner.is_active(job_id):
+        assert time.monotonic() < deadline, "job did not finish"
+        time.sleep(0.01)
+
+
+@pytest.fixture(autouse=True)
+def work_dirs(tmp_path, monkeypatch):
+    """Keep the runner's per-item work directories under tmp_path."""
+    monkeypatch.setattr(tempfile, "tempdir", str(tmp_path))
+
+
+@pytest.fixture
+def runner():
+    runner = make_runner()
+    yield runner
+    runner.shutdown()
+
+
+def run_job(runner: JobRunner, urls: list[str], **kwargs):
+    job = job_manager.create_job(urls=urls, **kwargs)
+    assert runner.start_job(job.id, api_key="gsk_test")
+    wait_for(runner, job.id)
+    return job_manager.get_job(job.id)
+
+
+def test_items_flow_through_every_stage(runner):
+    job = run_job(runner, ["https://a.test/one|two|three", "https://a.test/solo"])
+
+    assert job.status == JobStatus.COMPLETED
+    assert [item.status for item in job.items] == [JobStatus.COMPLETED] * 2
+    assert [item.transcript for item in job.items] == ["one two three", "solo"]
+    assert all(item.progress == 100 for item in job.items)
+    assert job.items[0].title == "Title https://a.test/one|two|three"
+
+
+def test_chunk_files_are_removed_and_audio_kept(runner):
+    job = run_job(runner, ["https://a.test/x|y"])
+
+    audio_path = job.items[0].audio_path
+    assert os.path.exists(audio_path)
+    assert not os.path.exists(f"{audio_path}.0")
+    assert not os.path.exists(f"{audio_path}.1")
+
+
+def test_silent_chunk_is_not_a_failure(runner):
+    job = run_job(runner, ["https://a.test/before||after"])
+
+    assert job.items[0].status == JobStatus.COMPLETED
+    assert job.items[0].transcript == "before after"
+
+
+@pytest.mark.parametrize("failure", ["FAIL", "RAISE"])
+def test_failed_chunk_fails_the_item(runner, failure):
+    job = run_job(runner, [f"https://a.test/ok|{failure}|ok", "https://a.test/fine"])
+
+    failed, fine = job.items
+    assert failed.status == JobStatus.FAILED
+    assert failed.transcript is None
+    assert failed.error == "Transcription failed for chunk(s) 2 of 3"
+    assert fine.status == JobStatus.COMPLETED
+    assert job.status == JobStatus.COMPLETED  # not every item failed
+
+
+def test_every_item_failing_fails_the_job(runner):
+    job = run_job(runner, ["https://a.test/FAIL", "https://a.test/FAIL|FAIL"])
+
+    assert job.status == JobStatus.FAILED
+    assert job.items[1].error == "Transcription failed for chunk(s) 1, 2 of 2"
+
+
+def test_download_failure_fails_the_item():
+    def broken(url, output_dir, cookies_path=None, progress_callback=None):
+        return None, None, {"error": "HTTP Error 403"}
+
+    runner = make_runner(downloader=broken)
+    try:
+        job = run_job(runner, ["https://a.test/x"])
+    finally:
+        runner.shutdown()
+
+    assert job.items[0].status == JobStatus.FAILED
+    assert job.items[0].error == "Download failed: HTTP Error 403"
+
+
+def test_chunking_error_fails_the_item():
+    def broken(audio_path):
+        yield {"path": write(f"{audio_path}.0", "partial"), "index": 0, "count": 2}
+        raise RuntimeError("ffmpeg could not cut")
+
+    runner = make_runner(chunker=broken)
+    try:
+        job = run_job(runner, ["https://a.test/x"])
+    finally:
+        runner.shutdown()
+
+    assert job.items[0].status == JobStatus.FAILED
+    assert job.items[0].error == "Chunking failed: ffmpeg could not cut"
+
+
+def test_error_after_transcription_still_finishes_the_job():
+    class BrokenStore:
+        """Misses every lookup, then fails to save the transcript."""
+
+        def find_transcript(self, *args, **kwargs):
+            return None, "hash"
+
+        def put_transcript(self, *args):
+            raise OSError("disk full")
+
+    runner = make_runner(store=BrokenStore())
+    try:
+        job = run_job(runner, ["https://a.test/one|two"])
+    finally:
+        runner.shutdown()
+
+    assert job.items[0].status == JobStatus.FAILED
+    assert job.items[0].error == "disk full"
+    assert job.status == JobStatus.FAILED
+
+
+@pytest.fixture
+def cached(tmp_path):
+    """An artifact store holding audio and a transcript for a URL."""
+    store = ArtifactStore(tmp_path / "cache", max_bytes=10_000)
+    audio = write(str(tmp_path / "cached.ogg"), "cached audio")
+    audio_hash = store.put_audio(audio, url="https://a.test/cached", title="Cached")
+    store.put_transcript(audio_hash, GROQ_MODEL, "en", GROQ_PROMPT, "from cache")
+    return store
+
+
+def work_dirs_left(tmp_path) -> list[str]:
+    return [name for name in os.listdir(tmp_path) if name.startswith("multifetch_")]
+
+
+def test_cache_hit_links_audio_into_the_work_dir(tmp_path, cached):
+    runner = make_runner(store=cached)
+    try:
+        job = run_job(runner, ["https://a.test/cached"])
+    finally:
+        runner.shutdown()
+
+    item = job.items[0]
+    assert item.status == JobStatus.COMPLETED
+    assert item.transcript == "from cache"
+    assert item.title == "Cached"
+    assert os.path.dirname(item.audio_path).startswith(str(tmp_path / "multifetch_"))
+    # Evicting the blob doesn't take the job's audio with it
+    os.unlink(cached.get_audio(url="https://a.test/cached")["path"])
+    with open(item.audio_path, encoding="utf-8") as f:
+        assert f.read() == "cached audio"
+
+
+def test_cache_hit_without_kept_audio_removes_the_work_dir(tmp_path, cached):
+    runner = make_runner(store=cached)
+    try:
+        job = run_job(runner, ["https://a.test/cached"], job_type=JobType.TRANSCRIBE)
+    finally:
+        runner.shutdown()
+
+    assert job.items[0].transcript == "from cache"
+    assert job.items[0].audio_path is None
+    assert work_dirs_left(tmp_path) == []
+
+
+def test_download_job_skips_transcription():
+    def never(audio_path, api_key, language):
+        raise AssertionError("download jobs are not transcribed")
+
+    runner = make_runner(transcriber=never)
+    try:
+        job = run_job(runner, ["https://a.test/x"], job_type=JobType.DOWNLOAD)
+    finally:
+        runner.shutdown()
+
+    assert job.items[0].status == JobStatus.COMPLETED
+    assert job.items[0].transcript is None
+    assert os.path.exists(job.items[0].audio_path)
+
+
+def test_job_starts_only_once(runner):
+    job = job_manager.create_job(urls=["https://a.test/x"])
+
+    assert runner.start_job(job.id, api_key="gsk_test")
+    assert not runner.start_job(job.id, api_key="gsk_test")
+    wait_for(runner, job.id)
+    assert not runner.start_job("missing", api_key="gsk_test")
+
+
+def test_cancelled_job_abandons_its_items():
+    release = threading.Event()
+    transcribed = []
+
+    def blocking(url, output_dir, cookies_path=None, progress_callback=None):
+        release.wait(5)
+        return downloader(url, output_dir, cookies_path, progress_callback)
+
+    def recording(audio_path, api_key, language):
+        transcribed.append(audio_path)
+        return "text"
+
+    runner = make_runner(downloader=blocking, transcriber=recording)
+    try:
+        job = job_manager.create_job(urls=[f"https://a.test/{i}" for i in range(4)])
+        assert runner.start_job(job.id, api_key="gsk_test")
+        assert job_manager.cancel_job(job.id)
+        release.set()
+        wait_for(runner, job.id)
+    finally:
+        runner.shutdown()
+
+    job = job_manager.get_job(job.id)
+    assert job.status == JobStatus.CANCELLED
+    assert transcribed == []
+    assert all(item.status != JobStatus.COMPLETED for item in job.items)
@@ -0,0 +1,212 @@
+"""Tests for the job stores: atomic updates, pagination, event logs, leases."""
+
+import threading
+import time
+from datetime import datetime, timedelta
+
+import pytest
+
+from services.job_manager import Job, JobItem, JobStatus, JobType
+from services.job_store import make_cursor, read_cursor
+from utils.constants import SSE_REPLAY_EVENTS
+
+EPOCH = datetime(2026, 1, 1)
+
+
+def make_job(job_id: str, minutes: int = 0, status=JobStatus.PENDING) -> Job:
+    return Job(
+        id=job_id,
+        job_type=JobType.FULL,
+        status=status,
+        items=[JobItem(url=f"https://a.test/{job_id}/{i}") for i in range(2)],
+        created_at=EPOCH + timedelta(minutes=minutes),
+    )
+
+
+def run_threads(target, count: int = 8) -> list:
+    results = [None] * count
+
+    def run(i):
+        results[i] = target()
+
+    threads = [threading.Thread(target=run, args=(i,)) for i in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+
+def test_put_get_round_trip(store):
+    job = make_job("a")
+    job.update_item(job.items[0], transcript="héllo")
+    store.put(job)
+
+    loaded = store.get("a")
+    assert loaded.items[0].transcript == "héllo"
+    assert loaded.created_at == job.created_at
+    assert loaded.transcript_bytes == len("héllo".encode("utf-8"))
+    assert store.get("missing") is None
+
+
+def test_concurrent_updates_are_not_lost(store):
+    store.put(make_job("a"))
+
+    def bump(job: Job):
+        item = job.items[0]
+        job.update_item(item, progress=item.progress + 1)
+
+    run_threads(lambda: [store.update("a", bump) for _ in range(25)])
+
+    assert store.get("a").items[0].progress == 8 * 25
+    assert store.update("missing", bump) is None
+
+
+def test_transition_is_a_compare_and_set(store):
+    store.put(make_job("a"))
+
+    results = run_threads(
+        lambda: store.transition("a", JobStatus.PENDING, JobStatus.RUNNING)
+    )
+
+    assert results.count(True) == 1
+    assert store.get("a").status == JobStatus.RUNNING
+    assert not store.transition("a", JobStatus.PENDING, JobStatus.RUNNING)
+    assert not store.transition("missing", JobStatus.PENDING, JobStatus.RUNNING)
+
+
+def test_claim_job_starts_a_job_once(manager):
+    job = manager.create_job(urls=["https://a.test/x"])
+
+    results = run_threads(lambda: manager.claim_job(job.id))
+
+    assert results.count(True) == 1
+    claimed = manager.get_job(job.id)
+    assert claimed.status == JobStatus.RUNNING
+    assert claimed.started_at is not None
+
+
+def test_listing_pages_newest_first(manager):
+    for i in range(7):
+        manager.store.put(make_job(f"job{i}", minutes=i))
+
+    pages, cursor = [], None
+    while True:
+        page, cursor = manager.list_job_page(limit=3, cursor=cursor)
+        pages.append([job["id"] for job in page])
+        if cursor is None:
+            break
+
+    assert pages == [["job6", "job5", "job4"], ["job3", "job2", "job1"], ["job0"]]
+
+
+def test_listing_filters_by_status(manager):
+    for i in range(6):
+        status = JobStatus.COMPLETED if i % 2 else JobStatus.RUNNING
+        manager.store.put(make_job(f"job{i}", minutes=i, status=status))
+
+    page, cursor = manager.list_job_page(limit=2, statuses={JobStatus.COMPLETED})
+    assert [job["id"] for job in page] == ["job5", "job3"]
+    page, cursor = manager.list_job_page(
+        limit=2, cursor=cursor, statuses={JobStatus.COMPLETED}
+    )
+    assert [job["id"] for job in page] == ["job1"]
+    assert cursor is None
+
+
+def test_summaries_leave_out_items(manager):
+    manager.store.put(make_job("a"))
+
+    (summary,), _ = manager.list_job_page()
+    (full,), _ = manager.list_job_page(full=True)
+
+    assert "items" not in summary
+    assert summary["item_count"] == 2
+    assert len(full["items"]) == 2
+
+
+def test_jobs_created_in_the_same_instant_page_by_id(store):
+    for job_id in ("c", "a", "b"):
+        store.put(make_job(job_id))
+
+    first = store.list(limit=2)
+    rest = store.list(limit=2, cursor=make_cursor(EPOCH, first[-1].id))
+
+    assert [job.id for job in first + rest] == ["c", "b", "a"]
+
+
+def test_cursor_round_trip_and_validation():
+    assert read_cursor(make_cursor(EPOCH, "abc")) == (
+        "2026-01-01T00:00:00.000000",
+        "abc",
+    )
+    with pytest.raises(ValueError):
+        read_cursor("not-a-cursor")
+
+
+def test_delete_removes_the_job_and_its_events(store):
+    store.put(make_job("a"))
+    store.append_event("a", "update", "{}")
+
+    assert store.delete("a")
+    assert store.get("a") is None
+    assert store.list() == []
+    assert store.last_event_seq("a") == 0
+    assert not store.delete("a")
+
+
+def test_events_for_a_deleted_job_are_dropped(store):
+    store.put(make_job("a"))
+    store.delete("a")
+
+    assert store.append_event("a", "item_update", "{}") == 0
+    assert store.last_event_seq("a") == 0
+    assert store.events_after("a", 0) == []
+
+
+def test_event_log_numbers_and_replays(store):
+    store.put(make_job("a"))
+    assert store.last_event_seq("a") == 0
+    assert store.events_after("a", 0) == []
+
+    seqs = [store.append_event("a", "item_update", f'{{"n":{n}}}') for n in range(3)]
+
+    assert seqs == [1, 2, 3]
+    assert store.last_event_seq("a") == 3
+    assert store.events_after("a", 1) == [
+        (2, "item_update", '{"n":1}'),
+        (3, "item_update", '{"n":2}'),
+    ]
+    assert store.events_after("a", 3) == []
+    assert store.last_event_seq("b") == 0
+
+
+def test_event_log_numbers_concurrent_appends_uniquely(store):
+    store.put(make_job("a"))
+    results = run_threads(
+        lambda: [store.append_event("a", "progress", "{}") for _ in range(10)]
+    )
+
+    assert sorted(seq for seqs in results for seq in seqs) == list(range(1, 81))
+
+
+def test_trimmed_events_report_a_gap(store):
+    store.put(make_job("a"))
+    for _ in range(SSE_REPLAY_EVENTS + 5):
+        store.append_event("a", "progress", "{}")
+
+    assert store.events_after("a", 1) is None
+    kept = store.events_after("a", 5)
+    assert len(kept) == SSE_REPLAY_EVENTS
+    assert kept[0][0] == 6
+
+
+def test_lease_has_one_holder_until_it_expires(store):
+    assert store.acquire_lease("sweep", "worker-1", ttl=0.2)
+    assert not store.acquire_lease("sweep", "worker-2", ttl=0.2)
+    assert store.acquire_lease("sweep", "worker-1", ttl=0.2)  # renewal
+    assert store.acquire_lease("other", "worker-2", ttl=0.2)
+
+    time.sleep(0.3)
+    assert store.acquire_lease("sweep", "worker-2", ttl=0.2)
+    assert not store.acquire_lease("sweep", "worker-1", ttl=0.2)
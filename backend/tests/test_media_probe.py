@@ -0,0 +1,108 @@
+"""Tests for media probing from MP3 frame headers (no ffmpeg needed)."""
+
+import pytest
+
+from services.media_probe import MediaInfo, probe_media
+
+# MPEG-1 Layer III, 128 kbps, 44.1 kHz, stereo: 417-byte frames
+MPEG1_HEADER = bytes([0xFF, 0xFB, 0x90, 0x00])
+MPEG1_FRAME = 144 * 128000 // 44100
+# MPEG-2 Layer III, 64 kbps, 22.05 kHz, mono: 208-byte frames
+MPEG2_HEADER = bytes([0xFF, 0xF3, 0x80, 0xC0])
+MPEG2_FRAME = 72 * 64000 // 22050
+
+
+def frames(header: bytes, length: int, count: int) -> bytes:
+    return (header + bytes(length - 4)) * count
+
+
+def xing_frame(frame_count: int) -> bytes:
+    """First frame of a LAME VBR file: a Xing tag after the side info."""
+    tag = b"Xing" + (1).to_bytes(4, "big") + frame_count.to_bytes(4, "big")
+    frame = MPEG1_HEADER + bytes(32) + tag
+    return frame + bytes(MPEG1_FRAME - len(frame))
+
+
+def id3v2(size: int) -> bytes:
+    """ID3v2 header announcing `size` tag bytes (synchsafe), plus the tag."""
+    synchsafe = bytes((size >> shift) & 0x7F for shift in (21, 14, 7, 0))
+    return b"ID3\x04\x00\x00" + synchsafe + bytes(size)
+
+
+@pytest.fixture
+def write(tmp_path):
+    count = iter(range(1000))
+
+    def write(data: bytes, ext: str = ".mp3") -> str:
+        path = tmp_path / f"fixture{next(count)}{ext}"
+        path.write_bytes(data)
+        return str(path)
+
+    return write
+
+
+def test_cbr_duration_from_the_first_frame(write):
+    info = probe_media(write(frames(MPEG1_HEADER, MPEG1_FRAME, 300)))
+
+    assert info.duration == pytest.approx(300 * MPEG1_FRAME * 8 / 128000)
+    assert info.bit_rate == 128000
+    assert info.sample_rate == 44100
+    assert info.channels == 2
+    assert info.codec == "mp3"
+    assert info.source == "header"
+    assert info.duration_ms == int(info.duration * 1000)
+
+
+def test_mpeg2_mono(write):
+    info = probe_media(write(frames(MPEG2_HEADER, MPEG2_FRAME, 100)))
+
+    assert info.duration == pytest.approx(100 * MPEG2_FRAME * 8 / 64000)
+    assert (info.bit_rate, info.sample_rate, info.channels) == (64000, 22050, 1)
+
+
+def test_id3_tags_are_skipped(write):
+    audio = frames(MPEG1_HEADER, MPEG1_FRAME, 300)
+    tagged = id3v2(2048) + audio + b"TAG" + bytes(125)  # v2 header, v1 trailer
+
+    assert probe_media(write(tagged)).duration == pytest.approx(
+        probe_media(write(audio)).duration
+    )
+
+
+def test_vbr_duration_from_the_xing_frame_count(write):
+    data = xing_frame(1000) + frames(MPEG1_HEADER, MPEG1_FRAME, 50)
+
+    info = probe_media(write(data))
+
+    assert info.duration == pytest.approx(1000 * 1152 / 44100)
+    assert info.bit_rate == int(len(data) * 8 / info.duration)
+
+
+def test_stray_sync_bytes_are_not_taken_for_mp3(write):
+    # One header-like word followed by junk, as can occur inside an MP4
+    data = bytes(100) + MPEG1_HEADER + b"\x01" * 5000
+
+    info = probe_media(write(data, ".m4a"), known_duration=12.5)
+
+    assert info.source == "yt-dlp"
+    assert info.duration == 12.5
+    assert info.bit_rate == int(len(data) * 8 / 12.5)
+
+
+def test_results_are_cached_per_file_version(write):
+    path = write(frames(MPEG1_HEADER, MPEG1_FRAME, 100))
+    first = probe_media(path)
+
+    assert probe_media(path) is first
+
+    with open(path, "ab") as f:
+        f.write(frames(MPEG1_HEADER, MPEG1_FRAME, 100))
+    assert probe_media(path).duration == pytest.approx(2 * first.duration)
+
+
+def test_media_info_defaults():
+    info = MediaInfo(duration=1.5)
+
+    assert info.duration_ms == 1500
+    assert info.bit_rate is None
+    assert info.source == "header"
@@ -0,0 +1,75 @@
+"""Tests for batched item progress."""
+
+import threading
+
+from services.job_manager import JobType
+from services.progress import ProgressAggregator
+
+
+class SlowManager:
+    """Forwards to a JobManager once `release` is set."""
+
+    def __init__(self, manager):
+        self.manager = manager
+        self.entered = threading.Event()
+        self.release = threading.Event()
+
+    def update_items_progress(self, job_id, progress):
+        self.entered.set()
+        assert self.release.wait(5)
+        return self.manager.update_items_progress(job_id, progress)
+
+
+def test_batches_items_per_job(manager):
+    job = manager.create_job(["a", "b"], JobType.DOWNLOAD)
+    events = []
+    aggregator = ProgressAggregator(
+        manager, publish=lambda *event: events.append(event), tick=60
+    )
+
+    aggregator.report(job.id, 0, "a", 10)
+    aggregator.report(job.id, 1, "b", 30)
+    aggregator.report(job.id, 0, "a", 20)
+    aggregator.flush()
+
+    [(job_id, items, job_progress)] = events
+    assert job_id == job.id
+    assert [(i["index"], i["progress"]) for i in items] == [(0, 20), (1, 30)]
+    assert job_progress == 25
+    assert [i.progress for i in manager.get_job(job.id).items] == [20, 30]
+
+
+def test_small_moves_wait_for_the_minimum_delta(manager):
+    job = manager.create_job(["a"], JobType.DOWNLOAD)
+    events = []
+    aggregator = ProgressAggregator(
+        manager, publish=lambda *event: events.append(event), tick=0, min_delta=5
+    )
+
+    for progress in (10, 12, 14, 15):
+        aggregator.report(job.id, 0, "a", progress)
+
+    assert [items[0]["progress"] for _, items, _ in events] == [10, 15]
+
+
+def test_slow_store_does_not_block_reports(manager):
+    job = manager.create_job(["a"], JobType.DOWNLOAD)
+    slow = SlowManager(manager)
+    events = []
+    aggregator = ProgressAggregator(
+        slow, publish=lambda *event: events.append(event), tick=60, item_interval=0
+    )
+    aggregator.report(job.id, 0, "a", 10)
+    flusher = threading.Thread(target=aggregator.flush)
+    flusher.start()
+    assert slow.entered.wait(5)
+
+    reported = threading.Thread(target=aggregator.report, args=(job.id, 0, "a", 50))
+    reported.start()
+    reported.join(1)
+    assert not reported.is_alive()
+
+    slow.release.set()
+    flusher.join(5)
+    aggregator.flush()
+    assert [items[0]["progress"] for _, items, _ in events] == [10, 50]
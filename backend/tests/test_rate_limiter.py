@@ -0,0 +1,194 @@
+"""Tests for the GCRA rate limiter and AIMD concurrency cap."""
+
+import threading
+import time
+
+import pytest
+
+from services.rate_limiter import (
+    AIMDConcurrency,
+    GCRABucket,
+    RateLimiter,
+    groq_rate_limiter,
+    parse_duration,
+)
+from utils.constants import (
+    GROQ_MIN_BILLED_SECONDS,
+    GROQ_PROCESSES,
+    GROQ_RPM,
+    GROQ_RPM_BURST,
+)
+
+
+def test_bucket_spends_the_burst_then_spaces_requests():
+    bucket = GCRABucket(limit=60, period=60.0, burst=3)
+    send_times = []
+    for _ in range(5):
+        at = bucket.ready_at(1, now=100.0)
+        bucket.commit(1, at)
+        send_times.append(at)
+
+    assert send_times == [100.0, 100.0, 100.0, 101.0, 102.0]
+
+
+def test_bucket_refills_while_idle():
+    bucket = GCRABucket(limit=60, period=60.0, burst=2)
+    for _ in range(2):
+        bucket.commit(1, bucket.ready_at(1, now=0.0))
+
+    assert bucket.ready_at(1, now=0.0) == 1.0
+    assert bucket.ready_at(1, now=5.0) == 5.0
+
+
+def test_limiter_reserves_without_sleeping():
+    limiter = RateLimiter(rpm=60, burst=2)
+
+    delays = [limiter.reserve() for _ in range(4)]
+
+    assert delays[:2] == pytest.approx([0, 0], abs=0.01)
+    assert delays[2:] == pytest.approx([1, 2], abs=0.05)
+    assert limiter.total_wait == pytest.approx(3, abs=0.1)
+
+
+def test_default_burst_is_small():
+    limiter = RateLimiter(rpm=400)
+
+    delays = [limiter.reserve() for _ in range(GROQ_RPM_BURST + 2)]
+
+    assert max(delays[:GROQ_RPM_BURST]) < 0.01
+    assert delays[GROQ_RPM_BURST:] == pytest.approx([60 / 400, 120 / 400], abs=0.01)
+
+
+def test_audio_quota_bills_at_least_the_minimum():
+    # 3600 audio seconds an hour: a minute's worth (60s) may go at once
+    limiter = RateLimiter(rpm=6000, ash=3600, burst=None)
+
+    assert limiter.reserve(audio_seconds=30) == pytest.approx(0, abs=0.01)
+    assert limiter.reserve(audio_seconds=30) == pytest.approx(0, abs=0.01)
+    assert limiter.reserve(audio_seconds=1) == pytest.approx(
+        GROQ_MIN_BILLED_SECONDS, abs=0.05
+    )
+
+
+def test_acquire_sleeps_outside_the_lock():
+    limiter = RateLimiter(rpm=600, burst=1)  # one request per 0.1s
+    limiter.reserve()
+    waits = []
+
+    threads = [
+        threading.Thread(target=lambda: waits.append(limiter.acquire()))
+        for _ in range(3)
+    ]
+    started = time.monotonic()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.monotonic() - started
+
+    # Each thread sleeps only until its own slot, so they finish by 0.3s
+    assert sorted(waits) == pytest.approx([0.1, 0.2, 0.3], abs=0.05)
+    assert elapsed == pytest.approx(0.3, abs=0.1)
+
+
+def test_retry_after_pauses_every_caller():
+    limiter = RateLimiter(rpm=6000, burst=None)
+
+    assert limiter.on_throttle({"retry-after": "2"}) == 2.0
+    assert limiter.reserve() == pytest.approx(2, abs=0.05)
+    assert limiter.stats()["throttled"] == 1
+
+
+def test_throttle_falls_back_to_the_earliest_reset():
+    limiter = RateLimiter(rpm=6000, burst=None)
+
+    paused = limiter.on_throttle(
+        {"x-ratelimit-reset-requests": "3s", "x-ratelimit-reset-audio": "1.5s"}
+    )
+
+    assert paused == 1.5
+    assert limiter.on_throttle({}) is None
+
+
+def test_exhausted_quota_header_pauses_until_reset():
+    limiter = RateLimiter(rpm=6000, burst=None)
+
+    limiter.observe(
+        {"x-ratelimit-remaining-requests": "5", "x-ratelimit-reset-requests": "9s"}
+    )
+    assert limiter.reserve() == pytest.approx(0, abs=0.01)
+
+    limiter.observe(
+        {
+            "X-RateLimit-Remaining-Audio": "0",
+            "x-ratelimit-reset-audio": "1m0.5s",
+        }
+    )
+    assert limiter.reserve() == pytest.approx(60.5, abs=0.05)
+
+
+@pytest.mark.parametrize(
+    "value, seconds",
+    [
+        ("30", 30.0),
+        ("0.5", 0.5),
+        ("2m59.56s", 179.56),
+        ("1h", 3600.0),
+        ("120ms", 0.12),
+        (None, None),
+        ("soon", None),
+    ],
+)
+def test_parse_duration(value, seconds):
+    assert parse_duration(value) == pytest.approx(seconds)
+
+
+def test_global_limiter_takes_this_process_share():
+    assert groq_rate_limiter.rpm == GROQ_RPM / GROQ_PROCESSES
+
+
+def test_aimd_grows_about_one_per_round():
+    cap = AIMDConcurrency(initial=4, maximum=6)
+
+    for _ in range(4):
+        cap.on_success()
+    assert int(cap.limit) == 4
+    cap.on_success()
+    assert int(cap.limit) == 5
+
+    for _ in range(100):
+        cap.on_success()
+    assert cap.limit == 6
+
+
+def test_aimd_halves_once_per_burst_of_throttles():
+    cap = AIMDConcurrency(initial=8, maximum=16, minimum=2)
+    with cap.slot() as first, cap.slot() as second:
+        cap.on_throttle(first)
+        cap.on_throttle(second)  # sent before the decrease: same signal
+
+    assert cap.limit == 4
+    assert cap.decreases == 1
+
+    for _ in range(3):
+        with cap.slot() as epoch:
+            cap.on_throttle(epoch)
+    assert cap.limit == 2  # never below the minimum
+
+
+def test_aimd_slot_waits_while_the_cap_is_reached():
+    cap = AIMDConcurrency(initial=1, maximum=1)
+    entered = threading.Event()
+
+    def second():
+        with cap.slot():
+            entered.set()
+
+    with cap.slot():
+        thread = threading.Thread(target=second)
+        thread.start()
+        assert not entered.wait(0.1)
+        assert cap.stats()["in_flight"] == 1
+    assert entered.wait(1)
+    thread.join()
+    assert cap.stats()["in_flight"] == 0
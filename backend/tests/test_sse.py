@@ -0,0 +1,207 @@
+"""Tests for SSE event numbering, delivery and Last-Event-ID replay."""
+
+import json
+import queue
+
+import pytest
+from flask import Flask
+
+from api.sse import (
+    RESYNC,
+    SubscriberQueue,
+    _format_event,
+    current_seq,
+    notify_item_complete,
+    publish_job_update,
+    sse_bp,
+    subscribe_to_job,
+    unsubscribe_from_job,
+)
+from services.job_manager import JobStatus, job_manager
+from utils.constants import SSE_REPLAY_EVENTS
+
+
+def parse_stream(body: str) -> list[dict]:
+    """SSE messages as dicts of their id / event / data fields."""
+    messages = []
+    for block in body.strip().split("\n\n"):
+        fields = dict(line.split(": ", 1) for line in block.splitlines())
+        if "data" in fields:
+            fields["data"] = json.loads(fields["data"])
+            messages.append(fields)
+    return messages
+
+
+@pytest.fixture
+def job():
+    return job_manager.create_job(urls=["https://a.test/0", "https://a.test/1"])
+
+
+@pytest.fixture
+def client():
+    app = Flask(__name__)
+    app.register_blueprint(sse_bp, url_prefix="/api/sse")
+    return app.test_client()
+
+
+def test_events_are_numbered_per_job(job):
+    other = job_manager.create_job(urls=["https://a.test/x"])
+
+    for n in range(3):
+        publish_job_update(job.id, "progress", {"n": n})
+    publish_job_update(other.id, "progress", {})
+
+    assert current_seq(job.id) == 3
+    assert current_seq(other.id) == 1
+
+
+def test_subscribe_replays_events_after_last_event_id(job):
+    for n in range(4):
+        publish_job_update(job.id, "item_update", {"index": 0, "n": n})
+
+    q, seq, missed = subscribe_to_job(job.id, last_event_id=2)
+    unsubscribe_from_job(job.id, q)
+
+    assert seq == 4
+    assert [event for event, _ in missed] == ["item_update", "item_update"]
+    assert [parse_stream(msg)[0]["id"] for _, msg in missed] == ["3", "4"]
+    assert parse_stream(missed[0][1])[0]["data"] == {"index": 0, "n": 2, "seq": 3}
+
+
+def test_subscribe_without_last_event_id_needs_a_snapshot(job):
+    publish_job_update(job.id, "progress", {})
+
+    q, seq, missed = subscribe_to_job(job.id)
+    unsubscribe_from_job(job.id, q)
+
+    assert (seq, missed) == (1, None)
+
+
+def test_replay_past_the_kept_events_needs_a_snapshot(job):
+    for _ in range(SSE_REPLAY_EVENTS + 2):
+        publish_job_update(job.id, "progress", {})
+
+    q, _, missed = subscribe_to_job(job.id, last_event_id=1)
+    unsubscribe_from_job(job.id, q)
+
+    assert missed is None
+
+
+def test_live_events_reach_subscribers(job):
+    publish_job_update(job.id, "progress", {})
+    q, seq, _ = subscribe_to_job(job.id)
+    try:
+        publish_job_update(job.id, "item_update", {"index": 1, "progress": 40})
+        event, msg = q.get(timeout=5)
+    finally:
+        unsubscribe_from_job(job.id, q)
+
+    (message,) = parse_stream(msg)
+    assert event == "item_update"
+    assert message["id"] == str(seq + 1)
+    assert message["data"] == {"index": 1, "progress": 40, "seq": seq + 1}
+
+
+def test_item_deltas_leave_out_transcripts(job):
+    notify_item_complete(job.id, "https://a.test/0", "Title", "a long transcript", 0)
+
+    q, _, missed = subscribe_to_job(job.id, last_event_id=0)
+    unsubscribe_from_job(job.id, q)
+
+    data = parse_stream(missed[0][1])[0]["data"]
+    assert data["has_transcript"] is True
+    assert "transcript" not in data
+    assert data["index"] == 0
+
+
+def test_queue_coalesces_updates_for_the_same_item():
+    q = SubscriberQueue(maxsize=8)
+
+    assert q.put(("item", 0), "item_update", "first") == 0
+    assert q.put(("item", 1), "item_update", "other") == 0
+    assert q.put(("item", 0), "item_update", "second") == -1
+
+    assert q.get(timeout=1) == ("item_update", "other")
+    assert q.get(timeout=1) == ("item_update", "second")
+    with pytest.raises(queue.Empty):
+        q.get(timeout=0.01)
+
+
+def test_queue_merges_progress_batches_in_place():
+    q = SubscriberQueue(maxsize=8)
+
+    def batch(seq, *items):
+        data = {"items": [{"index": i, "progress": p} for i, p in items]}
+        return _format_event(seq, "progress", json.dumps(data))
+
+    key, data, msg = batch(1, (0, 10), (1, 10))
+    assert q.put(key, "progress", msg, data) == 0
+    assert q.put(("item", 2), "item_update", "done") == 0
+    key, data, msg = batch(3, (1, 20), (3, 5))
+    assert q.put(key, "progress", msg, data) == -1
+
+    event, msg = q.get(timeout=1)
+    [message] = parse_stream(msg)
+    assert event == "progress"
+    assert message["id"] == "1"  # resuming from it replays what came after
+    assert [(i["index"], i["progress"]) for i in message["data"]["items"]] == [
+        (0, 10),
+        (1, 20),
+        (3, 5),
+    ]
+    assert q.get(timeout=1) == ("item_update", "done")
+
+
+def test_queue_overflow_resyncs_but_keeps_terminal_events():
+    q = SubscriberQueue(maxsize=2)
+    q.put(("item", 0), "item_update", "a")
+    q.put(("complete", 9), "complete", "done")
+    q.put(("item", 1), "item_update", "b")
+
+    assert q.put(("item", 2), "item_update", "c") == 3
+
+    assert q.get(timeout=1) == (RESYNC, None)
+    assert q.get(timeout=1) == ("complete", "done")
+
+
+def test_stream_of_finished_job_sends_snapshot_then_complete(job, client):
+    publish_job_update(job.id, "progress", {})
+    job_manager.update_job_status(job.id, JobStatus.COMPLETED)
+
+    response = client.get(f"/api/sse/jobs/{job.id}/stream")
+    update, complete = parse_stream(response.get_data(as_text=True))
+
+    assert update["event"] == "update"
+    assert update["id"] == "1"
+    assert update["data"]["seq"] == 1
+    assert [item["url"] for item in update["data"]["items"]] == [
+        "https://a.test/0",
+        "https://a.test/1",
+    ]
+    assert complete["event"] == "complete"
+    assert complete["data"]["status"] == "completed"
+
+
+def test_stream_resumes_from_last_event_id(job, client):
+    for index in range(3):
+        publish_job_update(job.id, "item_update", {"index": index % 2})
+    publish_job_update(job.id, "complete", {"status": "completed"})
+
+    response = client.get(
+        f"/api/sse/jobs/{job.id}/stream", headers={"Last-Event-ID": "2"}
+    )
+    messages = parse_stream(response.get_data(as_text=True))
+
+    assert [(m["id"], m["event"]) for m in messages] == [
+        ("3", "item_update"),
+        ("4", "complete"),
+    ]
+
+
+def test_stream_of_unknown_job_is_404(client):
+    response = client.get("/api/sse/jobs/missing/stream")
+
+    assert response.status_code == 404
+    assert parse_stream(response.get_data(as_text=True))[0]["data"] == {
+        "error": "Job not found"
+    }
@@ -0,0 +1,95 @@
+"""Tests for best-first ordering of download strategies and hedge delays."""
+
+import time
+
+import pytest
+
+from services.strategy_scheduler import StrategyScheduler
+from utils.constants import HEDGE_MIN_SAMPLES
+
+STRATEGIES = [("web", {}), ("ios", {}), ("android", {}), ("tv", {})]
+
+
+def names(scheduler: StrategyScheduler) -> list[str]:
+    return [name for name, _ in scheduler.order(STRATEGIES)]
+
+
+def test_untried_strategies_keep_their_built_in_order():
+    assert names(StrategyScheduler()) == ["web", "ios", "android", "tv"]
+
+
+def test_failing_strategy_drops_behind_untried_ones():
+    scheduler = StrategyScheduler()
+    scheduler.record("web", False, 5.0)
+
+    assert names(scheduler) == ["ios", "android", "tv", "web"]
+
+
+def test_working_strategy_moves_to_the_front():
+    scheduler = StrategyScheduler()
+    scheduler.record("web", False, 5.0)
+    scheduler.record("android", True, 2.0)
+
+    assert names(scheduler) == ["android", "ios", "tv", "web"]
+
+
+def test_equal_success_rates_prefer_the_faster_strategy():
+    scheduler = StrategyScheduler()
+    for seconds in (4.0, 5.0, 6.0):
+        scheduler.record("ios", True, seconds)
+        scheduler.record("tv", True, seconds / 2)
+
+    assert names(scheduler)[:2] == ["tv", "ios"]
+
+
+def test_only_the_last_window_of_attempts_counts():
+    scheduler = StrategyScheduler(window=3)
+    for _ in range(3):
+        scheduler.record("web", False, 1.0)
+    assert names(scheduler)[-1] == "web"
+
+    for _ in range(3):
+        scheduler.record("web", True, 1.0)
+    assert names(scheduler)[0] == "web"
+
+
+def test_old_failures_age_out():
+    scheduler = StrategyScheduler(max_age=0.05)
+    scheduler.record("web", False, 1.0)
+    assert names(scheduler)[-1] == "web"
+
+    time.sleep(0.1)
+    assert names(scheduler) == ["web", "ios", "android", "tv"]
+
+
+def test_hedge_delay_uses_the_percentile_once_there_are_enough_samples():
+    scheduler = StrategyScheduler(hedge_default_delay=10.0, hedge_min_delay=2.0)
+    for _ in range(HEDGE_MIN_SAMPLES - 1):
+        scheduler.record_extraction(3.0)
+    assert scheduler.hedge_delay() == 10.0
+
+    scheduler.record_extraction(3.0)
+    assert scheduler.hedge_delay() == 3.0
+
+    for seconds in range(1, 101):
+        scheduler.record_extraction(seconds / 10)
+    assert scheduler.hedge_delay(percentile=50) == pytest.approx(5.1)
+    assert scheduler.hedge_delay(percentile=10) == 2.0  # the floor
+
+
+def test_stats_list_strategies_in_try_order():
+    scheduler = StrategyScheduler()
+    scheduler.record("web", False, 5.0)
+    scheduler.record("ios", True, 2.0)
+    scheduler.record("ios", True, 4.0)
+    scheduler.record_download(2)
+    scheduler.record_hedge(won=True)
+
+    stats = scheduler.stats()
+
+    assert [s["name"] for s in stats["strategies"]] == ["ios", "web"]
+    assert stats["strategies"][0]["success_rate"] == 1.0
+    assert stats["strategies"][0]["median_seconds"] == 3.0
+    assert stats["strategies"][1]["success_rate"] == 0.0
+    assert stats["median_attempts"] == 2
+    assert stats["hedge"]["hedged"] == stats["hedge"]["hedge_wins"] == 1
@@ -3,7 +3,10 @@ Platform patterns and constants for MultiFetch v2.
 Ported from original app.py lines 83-122.
 """
 
+import os
 import re
+import tempfile
+from pathlib import Path
 
 # Supported platforms for single video URLs
 SUPPORTED_PLATFORMS = {
@@ -51,3 +54,122 @@ MAX_FILE_SIZE_MB = 25  # Groq free tier limit
 MAX_FILE_SIZE_DEV_MB = 100  # Groq dev tier limit
 CHUNK_LENGTH_MS = 600000  # 10 minutes
 OVERLAP_MS = 10000  # 10 seconds
+
+# Download encodings. Whisper resamples everything to 16 kHz mono, so
+# uploading anything richer only costs bytes (and chunks). Each format maps
+# to its file extension and ffmpeg codec arguments.
+AUDIO_FORMATS = {
+    "opus": ("ogg", ["-c:a", "libopus", "-b:a", "32k", "-application", "voip"]),
+    "flac": ("flac", ["-c:a", "flac", "-sample_fmt", "s16"]),  # lossless
+    "mp3": ("mp3", ["-c:a", "libmp3lame", "-b:a", "48k"]),
+}
+AUDIO_FORMAT = os.getenv("AUDIO_FORMAT", "opus")
+AUDIO_SAMPLE_RATE = 16000
+# Format negotiation (see services/format_selector.py): the lowest-bitrate
+# audio-only format at or above SPEECH_MIN_ABR (kbps) is downloaded, and
+# uploaded without transcoding when Groq accepts its container and it is
+# no richer than AUDIO_PASSTHROUGH_MAX_KBPS
+GROQ_AUDIO_EXTENSIONS = (
+    "flac",
+    "m4a",
+    "mp3",
+    "mp4",
+    "mpeg",
+    "mpga",
+    "ogg",
+    "wav",
+    "webm",
+)
+SPEECH_MIN_ABR = 48
+AUDIO_PASSTHROUGH = os.getenv("AUDIO_PASSTHROUGH", "1").lower() in ("1", "true", "yes")
+AUDIO_PASSTHROUGH_MAX_KBPS = 80
+
+# Transcription
+GROQ_MODEL = "whisper-large-v3-turbo"
+GROQ_PROMPT = "Transcribe this audio accurately, including any technical terms."
+GROQ_RPM = 400  # whisper-large-v3-turbo requests per minute
+GROQ_ASH = 200000  # audio seconds per hour (see console.groq.com/settings/limits)
+GROQ_MIN_BILLED_SECONDS = 10  # Groq bills (and counts) short requests as 10s
+# Requests sent back to back before the limiter spaces them 60/RPM apart
+GROQ_RPM_BURST = 8
+# Processes sharing the account's quota; each limits itself to its share.
+# gunicorn.conf.py sets this to its worker count
+GROQ_PROCESSES = max(1, int(os.getenv("GROQ_PROCESSES", "1")))
+# In-flight Groq requests: starts here and adapts (AIMD) up to the max
+GROQ_CONCURRENCY_START = 4
+GROQ_CONCURRENCY_MAX = 16
+# Pooled Groq clients (one per API key) are closed after this long unused
+GROQ_CLIENT_IDLE_SECONDS = 300
+GROQ_CLIENT_POOL_SIZE = 32
+
+# Job execution (worker threads per pipeline stage)
+DOWNLOAD_WORKERS = 4
+CHUNK_WORKERS = 2
+TRANSCRIBE_WORKERS = GROQ_CONCURRENCY_MAX  # actual concurrency is adaptive
+
+# YouTube download strategies are tried best-first by their record over
+# the last STRATEGY_WINDOW attempts each (no older than the max age)
+STRATEGY_WINDOW = 20
+STRATEGY_MAX_AGE_SECONDS = 30 * 60
+# Hedged downloads (off by default): when a strategy's metadata extraction
+# runs past the HEDGE_PERCENTILE of recent extraction times, the next
+# strategy starts in parallel and the first to return metadata downloads
+DOWNLOAD_HEDGE = os.getenv("DOWNLOAD_HEDGE", "").lower() in ("1", "true", "yes")
+HEDGE_PERCENTILE = 95
+HEDGE_MIN_SAMPLES = 10  # until then the default delay is used
+HEDGE_DEFAULT_DELAY = 10.0  # seconds
+HEDGE_MIN_DELAY = 2.0
+HEDGE_MAX_PARALLEL = 2  # extractions in flight per download
+# Pooled YoutubeDL instances: idle ones kept per option profile, and how
+# long an idle one lives
+YDL_POOL_MAX_IDLE = DOWNLOAD_WORKERS
+YDL_POOL_IDLE_SECONDS = 300
+
+# Item progress is flushed once per tick as one batched SSE event per job;
+# each item is sent at most once per interval, and only after it has moved
+PROGRESS_TICK_SECONDS = 0.25
+PROGRESS_ITEM_INTERVAL = 0.5
+PROGRESS_MIN_DELTA = 1  # percentage points
+
+# What a process serves: "all" (the API, running jobs) or "sse" (only the
+# SSE streams, following jobs run elsewhere through the job store; see
+# gunicorn.conf.py)
+APP_ROLE = os.getenv("APP_ROLE", "all")
+
+# Job store: memory:// (per process), sqlite:///path/jobs.db (shared by
+# workers on one host) or redis://host:6379/0 (shared across hosts)
+JOB_STORE_URL = os.getenv("JOB_STORE_URL", "memory://")
+
+# Job retention: finished jobs (and their downloaded audio) are dropped
+# after the TTL; past the byte budget, the oldest jobs' transcripts are
+# moved out of the job store into the spill directory
+JOB_TTL_SECONDS = int(os.getenv("JOB_TTL_SECONDS", "86400"))
+JOB_TRANSCRIPT_MAX_BYTES = int(os.getenv("JOB_TRANSCRIPT_MAX_BYTES", "67108864"))
+JOB_SPILL_DIR = Path(
+    os.getenv(
+        "JOB_SPILL_DIR", os.path.join(tempfile.gettempdir(), "multifetch_transcripts")
+    )
+)
+JOB_RETENTION_INTERVAL = 60  # seconds between retention sweeps
+
+# SSE replay: recent events the job store keeps per job (for as long as
+# the job exists) for clients resuming with Last-Event-ID
+SSE_REPLAY_EVENTS = 256
+# Each process relays events to its SSE streams from the job store, whichever
+# worker published them; it checks the logs of the jobs it streams this
+# often (and right away after publishing one itself)
+SSE_POLL_SECONDS = 0.5
+# Pending events per SSE subscriber before a slow client is resynced with
+# a snapshot (item updates for the same item coalesce, so this is rarely hit)
+SSE_SUBSCRIBER_QUEUE = 128
+
+# Artifact cache (shared with the legacy app's cache directory)
+CACHE_DIR = Path.home() / ".media_transcriber_cache"
+CACHE_MAX_BYTES = 5 * 1024**3  # 5 GB of audio + transcripts
+# Cache hits update last-access times in memory; they are written to the
+# index with the next change to it, or at most this often
+CACHE_TOUCH_FLUSH_SECONDS = 60
+# Extracted yt-dlp metadata, reused to download without extracting again
+# (short TTL: the format URLs in it expire)
+VIDEO_INFO_TTL_SECONDS = 10 * 60
+VIDEO_INFO_CACHE_SIZE = 128
@@ -3,7 +3,7 @@
 import { useState, useEffect, useCallback, useMemo } from 'react';
 import { useConfigStore, SUPPORTED_LANGUAGES } from '@/stores/configStore';
 import { useJobStore, type JobItem, type Platform } from '@/stores/jobStore';
-import { validateUrls, createJob, startJob, validateApiKey, ApiError } from '@/lib/api';
+import { validateUrls, createJob, startJob, validateApiKey, getItemTranscript, ApiError } from '@/lib/api';
 import { useJobSSE } from '@/hooks/useSSE';
 
 // Icons as inline SVGs for simplicity
@@ -290,8 +290,8 @@ function UrlInput() {
     setIsValidating,
   } = useJobStore();
 
-  const { isApiKeyValid, language } = useConfigStore();
-  const { setCurrentJob, setProcessing, updateJobItem } = useJobStore();
+  const { apiKey, isApiKeyValid, language } = useConfigStore();
+  const { setCurrentJob, applyJobSummary, setProcessing, updateJobItem } = useJobStore();
 
   // Parse URLs from input
   const urlLines = useMemo(() =>
@@ -337,12 +337,12 @@ function UrlInput() {
         progress: data.progress,
         status: data.status as JobItem['status'],
         title: data.title ?? undefined,
-        transcript: data.transcript ?? undefined,
+        has_transcript: data.has_transcript ?? undefined,
         error: data.error ?? undefined,
       });
     },
-    onComplete: (job) => {
-      setCurrentJob(job);
+    onComplete: (summary) => {
+      applyJobSummary(summary);
       setProcessing(false);
     },
     onError: (error) => {
@@ -365,12 +365,12 @@ function UrlInput() {
       setCurrentJob(job);
 
       // Start processing
-      await startJob(job.id);
+      await startJob(job.id, apiKey);
     } catch (error) {
       console.error('Failed to create job:', error);
       setProcessing(false, error instanceof Error ? error.message : 'Failed to create job');
     }
-  }, [isApiKeyValid, validUrls, language, setCurrentJob, setProcessing]);
+  }, [apiKey, isApiKeyValid, validUrls, language, setCurrentJob, setProcessing]);
 
   return (
     <div className="card p-5 space-y-4">
@@ -467,8 +467,17 @@ function UrlInput() {
 }
 
 // Result Card Component
-function ResultCard({ item }: { item: JobItem }) {
+function ResultCard({ jobId, index, item }: { jobId: string; index: number; item: JobItem }) {
   const [expanded, setExpanded] = useState(false);
+  const { updateJobItem } = useJobStore();
+
+  // Transcripts aren't pushed over SSE; load this one once it exists
+  useEffect(() => {
+    if (!item.has_transcript || item.transcript !== null) return;
+    getItemTranscript(jobId, index)
+      .then((transcript) => updateJobItem(item.url, { transcript }))
+      .catch((error) => console.error('Failed to load transcript:', error));
+  }, [jobId, index, item.url, item.has_transcript, item.transcript, updateJobItem]);
 
   const statusClass = item.status === 'completed' ? 'status-success' :
                       item.status === 'failed' ? 'status-error' :
@@ -630,8 +639,8 @@ export default function Home() {
               )}
 
               <div className="space-y-3">
-                {results.map((item, i) => (
-                  <ResultCard key={item.url || i} item={item} />
+                {currentJob && results.map((item, i) => (
+                  <ResultCard key={item.url || i} jobId={currentJob.id} index={i} item={item} />
                 ))}
               </div>
             </div>
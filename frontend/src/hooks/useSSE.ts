@@ -4,21 +4,31 @@
 
 import { useEffect, useRef, useCallback, useState } from 'react';
 import { getJobStreamUrl } from '@/lib/api';
-import type { Job } from '@/stores/jobStore';
+import type { Job, JobSummary } from '@/stores/jobStore';
 
-// SSE item update data structure
+// SSE item update: only the fields that changed (transcripts are fetched
+// separately once has_transcript is set)
 export interface SSEItemUpdateData {
+  seq: number;
+  index: number;
   url: string;
   progress: number;
   status: string;
   title?: string;
-  transcript?: string;
+  has_transcript?: boolean;
   error?: string;
   job_progress: number;
   completed_count?: number;
   failed_count?: number;
 }
 
+// SSE progress batch: running items' progress, sent once per server tick
+interface SSEProgressData {
+  seq: number;
+  items: Array<Pick<SSEItemUpdateData, 'index' | 'url' | 'progress' | 'status'>>;
+  job_progress: number;
+}
+
 // SSE error data structure
 interface SSEErrorData {
   error: string;
@@ -27,7 +37,7 @@ interface SSEErrorData {
 interface UseSSEOptions {
   onUpdate?: (job: Job) => void;
   onItemUpdate?: (data: SSEItemUpdateData) => void;
-  onComplete?: (job: Job) => void;
+  onComplete?: (job: JobSummary) => void;
   onError?: (error: string) => void;
   onConnectionError?: (error: Event) => void;
 }
@@ -47,7 +57,7 @@ interface UseSSEReturn {
  * ```tsx
  * const { connect, disconnect, isConnected } = useSSE({
  *   onItemUpdate: (data) => updateJobItem(data.url, { progress: data.progress }),
- *   onComplete: (job) => setCurrentJob(job),
+ *   onComplete: (summary) => applyJobSummary(summary),
  * });
  *
  * // Connect when job starts
@@ -63,6 +73,8 @@ export function useSSE(options: UseSSEOptions = {}): UseSSEReturn {
   const { onUpdate, onItemUpdate, onComplete, onError, onConnectionError } = options;
 
   const eventSourceRef = useRef<EventSource | null>(null);
+  // seq of the last applied event; older deltas are already in the snapshot
+  const lastSeqRef = useRef(0);
   const [isConnected, setIsConnected] = useState(false);
   const [isConnecting, setIsConnecting] = useState(false);
   const [error, setError] = useState<string | null>(null);
@@ -90,6 +102,7 @@ export function useSSE(options: UseSSEOptions = {}): UseSSEReturn {
 
     setIsConnecting(true);
     setError(null);
+    lastSeqRef.current = 0;
 
     const url = getJobStreamUrl(jobId);
     const eventSource = new EventSource(url);
@@ -107,7 +120,8 @@ export function useSSE(options: UseSSEOptions = {}): UseSSEReturn {
       setIsConnecting(false);
       callbacksRef.current.onConnectionError?.(event);
 
-      // Auto-reconnect is handled by browser, but we track state
+      // Auto-reconnect is handled by browser (sending Last-Event-ID, so the
+      // server replays missed events), but we track state
       if (eventSource.readyState === EventSource.CLOSED) {
         eventSourceRef.current = null;
       }
@@ -116,7 +130,8 @@ export function useSSE(options: UseSSEOptions = {}): UseSSEReturn {
     // Handle 'update' events (general job status)
     eventSource.addEventListener('update', (event: MessageEvent) => {
       try {
-        const data = JSON.parse(event.data) as Job;
+        const data = JSON.parse(event.data) as Job & { seq: number };
+        lastSeqRef.current = data.seq;
         callbacksRef.current.onUpdate?.(data);
       } catch (e) {
         console.error('Failed to parse SSE update event:', e);
@@ -127,16 +142,32 @@ export function useSSE(options: UseSSEOptions = {}): UseSSEReturn {
     eventSource.addEventListener('item_update', (event: MessageEvent) => {
       try {
         const data = JSON.parse(event.data) as SSEItemUpdateData;
+        if (data.seq <= lastSeqRef.current) return;
+        lastSeqRef.current = data.seq;
         callbacksRef.current.onItemUpdate?.(data);
       } catch (err) {
         console.error('Failed to parse SSE item_update event:', err);
       }
     });
 
+    // Handle 'progress' events (batched progress for running items)
+    eventSource.addEventListener('progress', (event: MessageEvent) => {
+      try {
+        const data = JSON.parse(event.data) as SSEProgressData;
+        if (data.seq <= lastSeqRef.current) return;
+        lastSeqRef.current = data.seq;
+        for (const item of data.items) {
+          callbacksRef.current.onItemUpdate?.({ ...item, seq: data.seq, job_progress: data.job_progress });
+        }
+      } catch (err) {
+        console.error('Failed to parse SSE progress event:', err);
+      }
+    });
+
     // Handle 'complete' events (job finished)
     eventSource.addEventListener('complete', (event: MessageEvent) => {
       try {
-        const data = JSON.parse(event.data) as Job;
+        const data = JSON.parse(event.data) as JobSummary;
         callbacksRef.current.onComplete?.(data);
         // Close connection on complete
         disconnect();
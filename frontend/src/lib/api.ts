@@ -3,7 +3,7 @@
  * Provides typed fetch wrappers for all API endpoints.
  */
 
-import type { Job, UrlValidationResult, JobType } from '@/stores/jobStore';
+import type { Job, JobStatus, JobSummary, UrlValidationResult, JobType } from '@/stores/jobStore';
 
 // API base URL from environment variable, defaulting to localhost
 const API_BASE_URL = process.env.NEXT_PUBLIC_API_URL || 'http://localhost:5000';
@@ -141,8 +141,15 @@ interface CreateJobResponse extends Job {
   invalid_urls?: Array<{ url: string; error: string }>;
 }
 
-interface ListJobsResponse {
-  jobs: Job[];
+export interface ListJobsResponse {
+  jobs: JobSummary[];
+  next_cursor: string | null;
+}
+
+export interface ListJobsOptions {
+  limit?: number;
+  cursor?: string | null;
+  status?: JobStatus[];
 }
 
 /**
@@ -171,11 +178,32 @@ export async function getJob(jobId: string): Promise<Job> {
 }
 
 /**
- * List recent jobs.
+ * Get the transcript of one job item (SSE events only carry has_transcript).
  */
-export async function listJobs(limit: number = 50): Promise<Job[]> {
-  const response = await fetchApi<ListJobsResponse>(`/api/jobs?limit=${limit}`);
-  return response.jobs;
+export async function getItemTranscript(jobId: string, index: number): Promise<string> {
+  const response = await fetchApi<{ transcript: string }>(
+    `/api/jobs/${jobId}/items/${index}/transcript`
+  );
+  return response.transcript;
+}
+
+/**
+ * List one page of recent job summaries.
+ * Pass the returned next_cursor back as `cursor` to get the following page.
+ */
+export async function listJobs({
+  limit = 50,
+  cursor,
+  status,
+}: ListJobsOptions = {}): Promise<ListJobsResponse> {
+  const params = new URLSearchParams({ limit: String(limit) });
+  if (cursor) {
+    params.set('cursor', cursor);
+  }
+  if (status?.length) {
+    params.set('status', status.join(','));
+  }
+  return fetchApi<ListJobsResponse>(`/api/jobs?${params}`);
 }
 
 /**
@@ -200,9 +228,10 @@ export async function cancelJob(jobId: string): Promise<Job> {
 /**
  * Start processing a pending job.
  */
-export async function startJob(jobId: string): Promise<Job> {
+export async function startJob(jobId: string, apiKey?: string): Promise<Job> {
   return fetchApi<Job>(`/api/jobs/${jobId}/start`, {
     method: 'POST',
+    body: JSON.stringify({ api_key: apiKey }),
   });
 }
 
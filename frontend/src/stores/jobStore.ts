@@ -27,7 +27,8 @@ export interface JobItem {
   status: JobStatus;
   progress: number;
   title: string | null;
-  transcript: string | null;
+  transcript: string | null; // null in SSE updates; fetch via getItemTranscript
+  has_transcript?: boolean;
   error: string | null;
 }
 
@@ -47,6 +48,9 @@ export interface Job {
   items: JobItem[];
 }
 
+// Job list entries (GET /api/jobs default view) omit items and transcripts
+export type JobSummary = Omit<Job, 'items'>;
+
 interface JobState {
   // URL Input
   urlInput: string;
@@ -69,6 +73,7 @@ interface JobState {
 
   // Actions - Job Management
   setCurrentJob: (job: Job | null) => void;
+  applyJobSummary: (summary: JobSummary) => void;
   updateJobItem: (url: string, updates: Partial<JobItem>) => void;
   updateJobProgress: (progress: number) => void;
   updateJobStatus: (status: JobStatus, error?: string | null) => void;
@@ -113,6 +118,13 @@ export const useJobStore = create<JobState>()((set) => ({
   setCurrentJob: (job: Job | null) =>
     set({ currentJob: job }),
 
+  applyJobSummary: (summary: JobSummary) =>
+    set((state) => ({
+      currentJob: state.currentJob?.id === summary.id
+        ? { ...state.currentJob, ...summary }
+        : state.currentJob,
+    })),
+
   updateJobItem: (url: string, updates: Partial<JobItem>) =>
     set((state) => {
       if (!state.currentJob) return state;